@@ -1,19 +1,182 @@
 """자동 채우기(자동 할당) 유틸리티
 
-여기에 컴포넌트 슬롯을 자동으로 채우는 알고리즘을 구현하세요.
-현재는 호출 스텁만 제공합니다 (TODO).
+hash.json의 컴포넌트 해시(ib, position_vb, blend_vb, texcoord_vb)와
+모드 INI에서 뽑은 (컴포넌트, 해시, 파일) 행을 사전 조회로 맞춰
+비어 있는 슬롯을 한 번에 채웁니다.
+- 해시가 같은 파일이 하나뿐이면 할당
+- 여러 개면 IB는 match_first_index(hash.json의 object_indexes)로 좁혀 보고,
+  그래도 하나로 정해지지 않으면 추측하지 않고 모호한 슬롯으로 보고
+- 해시로 채우지 못한 슬롯은 크기 기반 제안(size_matcher)이 있으면 사용
+  (모호한 슬롯은 제안이 해시 후보 안에 있을 때만)
 """
 
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 
 
-def auto_fill_components(controller: Any) -> None:
-    """컨트롤러를 받아 자동 채우기 작업을 수행합니다.
+@dataclass
+class SlotRef:
+    comp_index: int
+    key: str
+    variant: Optional[str]
+    hash: str
+
+    def describe(self, components):
+        name = components[self.comp_index]["name"]
+        label = self.variant if self.variant is not None else "공통"
+        return f"{name} ({label}) - {self.key}"
+
+
+@dataclass
+class AutoFillPlan:
+    assignments: List[Tuple[SlotRef, str]] = field(default_factory=list)
+    ambiguous: List[Tuple[SlotRef, List[str]]] = field(default_factory=list)
+    unmatched: List[SlotRef] = field(default_factory=list)
+    already_filled: int = 0
+    by_size: int = 0
+
+
+def _norm_hash(value):
+    return str(value or "").strip().lower()
+
+
+def build_hash_index(rows) -> Dict[Tuple[str, str], List[str]]:
+    """(컴포넌트, 해시) -> 파일 목록 (행 순서 유지, 중복 제거)"""
+    index = {}
+    for comp, hval, file_rel in rows:
+        files = index.setdefault((comp, _norm_hash(hval)), [])
+        if file_rel not in files:
+            files.append(file_rel)
+    return index
 
-    TODO: 실제 구현 필요
+
+def iter_slots(components):
+    """hash.json 컴포넌트의 모든 슬롯 (공통 슬롯 먼저, 그다음 파트별 IB)"""
+    for comp_index, comp in enumerate(components):
+        for key, hval in comp.get("shared", {}).items():
+            yield SlotRef(comp_index, key, None, _norm_hash(hval))
+        for label, variant_data in comp.get("variants", {}).items():
+            for key, hval in variant_data.items():
+                yield SlotRef(comp_index, key, label, _norm_hash(hval))
+
+
+def _narrow_by_first_index(slot, candidates, components, first_indexes):
+    """IB 후보를 파트 시작 인덱스(match_first_index)로 좁힌다"""
+    expected = components[slot.comp_index].get("first_indexes", {}).get(slot.variant)
+    if expected is None:
+        return candidates
+    expected = str(expected).strip()
+    return [
+        file_rel
+        for file_rel in candidates
+        if expected in first_indexes.get(file_rel, {}).get(slot.key, ())
+    ]
+
+
+def plan_auto_fill(components, rows, first_indexes=None, current=None) -> AutoFillPlan:
+    """슬롯별 할당 계획
+
+    components: 매처의 컴포넌트 목록 (hash.json)
+    rows: load_tree_from_mod 결과 [(컴포넌트, 해시, 파일)]
+    first_indexes: 파일 -> {컴포넌트: {match_first_index}} (IB 구분용, 선택)
+    current: (comp_index, key, variant) -> 현재 값; 값이 있는 슬롯은 건드리지 않음
     """
-    try:
-        controller.log("자동 채우기: 아직 구현되지 않았습니다. TODO")
-    except Exception:
-        # UI가 초기화되지 않은 경우 안전하게 무시
-        pass
+    index = build_hash_index(rows)
+    first_indexes = first_indexes or {}
+    current = current or {}
+    plan = AutoFillPlan()
+
+    for slot in iter_slots(components):
+        if current.get((slot.comp_index, slot.key, slot.variant)):
+            plan.already_filled += 1
+            continue
+        candidates = index.get((slot.key, slot.hash), []) if slot.hash else []
+        if len(candidates) > 1:
+            narrowed = _narrow_by_first_index(slot, candidates, components, first_indexes)
+            if narrowed:
+                candidates = narrowed
+
+        if not candidates:
+            plan.unmatched.append(slot)
+        elif len(candidates) == 1:
+            plan.assignments.append((slot, candidates[0]))
+        else:
+            plan.ambiguous.append((slot, candidates))
+
+    return plan
+
+
+def apply_size_proposals(plan, proposals):
+    """해시로 채우지 못한 슬롯에 크기 기반 제안 반영 (계획을 직접 수정)"""
+    if not proposals:
+        return plan
+    used = {file_rel for _slot, file_rel in plan.assignments}
+
+    def _take(slot, allowed=None):
+        file_rel = proposals.get((slot.comp_index, slot.key, slot.variant))
+        if not file_rel or file_rel in used or (allowed and file_rel not in allowed):
+            return False
+        used.add(file_rel)
+        plan.assignments.append((slot, file_rel))
+        plan.by_size += 1
+        return True
+
+    plan.unmatched = [slot for slot in plan.unmatched if not _take(slot)]
+    plan.ambiguous = [
+        (slot, candidates)
+        for slot, candidates in plan.ambiguous
+        if not _take(slot, candidates)
+    ]
+    return plan
+
+
+def current_slot_values(slot_panel):
+    """슬롯 패널의 현재 값: (comp_index, key, variant) -> 값"""
+    slot_table = getattr(slot_panel, "slot_table", None)
+    if slot_table is not None:
+        return slot_table.values()
+    values = {}
+    for comp_index, widgets in enumerate(slot_panel.get_component_values()):
+        for key, var in widgets["shared"].items():
+            values[(comp_index, key, None)] = var.get()
+        for label, variant_widgets in widgets["variants"].items():
+            for key, var in variant_widgets.items():
+                values[(comp_index, key, label)] = var.get()
+    return values
+
+
+def auto_fill_components(controller: Any) -> None:
+    """컨트롤러(MainLayout)를 받아 해시가 일치하는 빈 슬롯을 한 번에 채웁니다."""
+    matcher = getattr(controller, "matcher", None)
+    components = getattr(matcher, "components", None) or []
+    if not components:
+        controller.log("자동 채우기: 불러온 컴포넌트(hash.json)가 없습니다.")
+        return
+    rows = getattr(matcher, "mod_rows", None) or []
+    if not rows and not getattr(matcher, "size_proposals", None):
+        controller.log("자동 채우기: 모드에서 찾은 리소스가 없습니다.")
+        return
+
+    slot_panel = controller.slot_panel
+    plan = plan_auto_fill(
+        components,
+        rows,
+        matcher.resource_first_indexes(),
+        current_slot_values(slot_panel),
+    )
+    apply_size_proposals(plan, getattr(matcher, "size_proposals", None))
+
+    slot_panel.set_slot_values(
+        [(slot.comp_index, slot.key, file_rel, slot.variant) for slot, file_rel in plan.assignments]
+    )
+
+    controller.log(
+        f"[자동 채우기] 할당 {len(plan.assignments)}개, 모호 {len(plan.ambiguous)}개, "
+        f"일치 없음 {len(plan.unmatched)}개, 이미 채워짐 {plan.already_filled}개"
+        + (f" (크기 기반 {plan.by_size}개 포함)" if plan.by_size else "")
+    )
+    for slot, candidates in plan.ambiguous:
+        controller.log(
+            f"  [모호] {slot.describe(components)}: 후보 {len(candidates)}개 -> "
+            + ", ".join(candidates)
+        )
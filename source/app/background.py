@@ -0,0 +1,117 @@
+"""백그라운드 불러오기 작업자
+
+Tk 메인 루프를 막지 않도록 스캔/INI 읽기/매칭을 작업 스레드에서 실행합니다.
+- 종류(에셋/모드)마다 작업 스레드는 하나이며, 마지막 요청만 실행합니다.
+- 새 요청이 들어오면 실행 중인 작업에 취소를 알리고 대기 중인 요청을 교체합니다.
+- 결과/진행 상황은 `post`로 UI 스레드에 넘겨 처리합니다.
+"""
+
+import threading
+import time
+
+
+class LoadCancelled(Exception):
+    """새 요청으로 인해 취소된 작업"""
+
+
+class CancelToken:
+    # 진행 상황 전달 최소 간격(초)
+    PROGRESS_INTERVAL = 0.2
+
+    def __init__(self, post=None, on_progress=None):
+        self._event = threading.Event()
+        self._post = post
+        self._on_progress = on_progress
+        self._last_progress = 0.0
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        self._event.set()
+
+    def check(self):
+        """취소되었으면 LoadCancelled를 발생시킨다 (작업 중간중간 호출)"""
+        if self._event.is_set():
+            raise LoadCancelled()
+
+    def post(self, fn, *args):
+        """취소되지 않은 경우에만 UI 스레드로 호출을 넘긴다"""
+        if self._event.is_set():
+            return
+        if self._post:
+            self._post(fn, *args)
+        else:
+            fn(*args)
+
+    def progress(self, text, force=False):
+        """진행 상황 전달 (너무 잦은 갱신은 건너뜀)"""
+        if not self._on_progress:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_progress < self.PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        self.post(self._on_progress, text)
+
+
+class LatestTaskRunner:
+    def __init__(self, name, post, on_progress=None):
+        self.name = name
+        self._post = post
+        self._on_progress = on_progress
+        self._cond = threading.Condition()
+        self._pending = None
+        self._current = None
+        self._thread = None
+
+    def submit(self, work, on_done, on_error=None):
+        """work(token)을 작업 스레드에서 실행하고 결과를 on_done(result)로 전달
+
+        실행 중이거나 대기 중인 이전 요청은 취소된다.
+        이미 끝났지만 아직 UI에 반영되지 않은 결과도 버려진다.
+        """
+        with self._cond:
+            if self._current is not None:
+                self._current.cancel()
+            self._pending = (work, on_done, on_error)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name=f"loader-{self.name}", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def cancel(self):
+        with self._cond:
+            self._pending = None
+            if self._current is not None:
+                self._current.cancel()
+
+    @staticmethod
+    def _deliver(token, fn, value):
+        # UI 스레드에서 실제로 처리되기 직전에 다시 확인 (그 사이 새 요청이 왔을 수 있음)
+        if not token.cancelled:
+            fn(value)
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                work, on_done, on_error = self._pending
+                self._pending = None
+                token = CancelToken(self._post, self._on_progress)
+                self._current = token
+
+            try:
+                result = work(token)
+                token.check()
+            except LoadCancelled:
+                pass
+            except Exception as e:
+                if on_error:
+                    token.post(self._deliver, token, on_error, e)
+            else:
+                token.post(self._deliver, token, on_done, result)
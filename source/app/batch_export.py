@@ -0,0 +1,223 @@
+"""여러 에셋/모드를 한 번에 내보내기 (main.py --batch)
+
+작업 목록 파일 형식 (경로는 작업 목록 파일 위치 기준):
+[
+  {"asset": "assets/Keqing", "mod": "mods/KeqingMod", "mapping": "maps/keqing.json"},
+  {"name": "Ayaka", "asset": "...", "mod": "...", "mapping": "...", "export_vb": "D:/export_vb"}
+]
+- 작업마다 output/<이름> 폴더에 내보내고 모든 레벨의 로그를 output/<이름>.log에 기록
+  (이름을 생략하면 모드 폴더 이름, 겹치면 _1, _2 ...)
+- generate_ini 작업은 프로세스 풀에서 동시에 실행 (작업 안의 INI 변환은 순차)
+- export_vb 작업은 같은 export_vb 폴더끼리 한 프로세스에서 차례로 실행하고 (mods/output을 함께 쓰므로),
+  export_vb 폴더가 다르면 서로 동시에 실행
+- 작업이 끝날 때마다 상태와 걸린 시간을 출력하고, 끝나면 요약과 output/batch_report.json을 남김
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app import ini_modifier
+from app.export_to_export_vb import run_export_vb
+from app.pipeline_log import PipelineLogger
+from app.slot_mapping import SlotMapping
+from app.staging import DEFAULT_STAGING_MODE, STAGING_MODES
+from config import load_config
+
+REPORT_FILE = "batch_report.json"
+
+
+def load_jobs(jobs_path):
+    """작업 목록 파일 -> [작업 dict] (경로는 절대 경로로, 이름은 겹치지 않게)"""
+    with open(jobs_path, encoding="utf-8") as f:
+        jobs = json.load(f)
+    if not isinstance(jobs, list):
+        raise ValueError("작업 목록은 [{asset, mod, mapping}, ...] 형식이어야 합니다.")
+
+    base = os.path.dirname(os.path.abspath(jobs_path))
+    names = set()
+    result = []
+    for idx, job in enumerate(jobs):
+        if not isinstance(job, dict):
+            raise ValueError(f"{idx + 1}번째 작업은 {{asset, mod, mapping}} 형식이어야 합니다.")
+        missing = [key for key in ("asset", "mod", "mapping") if not job.get(key)]
+        if missing:
+            raise ValueError(f"{idx + 1}번째 작업에 {', '.join(missing)} 값이 없습니다.")
+        job = dict(job)
+        for key in ("asset", "mod", "mapping", "export_vb"):
+            if job.get(key):
+                if not isinstance(job[key], str):
+                    raise ValueError(f"{idx + 1}번째 작업의 {key} 값은 경로 문자열이어야 합니다.")
+                job[key] = os.path.normpath(os.path.join(base, job[key]))
+        name = job.get("name") or os.path.basename(os.path.normpath(job["mod"]))
+        unique = name
+        counter = 1
+        while unique.lower() in names:
+            unique = f"{name}_{counter}"
+            counter += 1
+        names.add(unique.lower())
+        job["name"] = unique
+        result.append(job)
+    return result
+
+
+def _run_job(job, options):
+    """작업 프로세스: 작업 하나 실행 -> 결과 dict (name, status, seconds, output, log_file, error)"""
+    started = time.perf_counter()
+    output_root = os.path.join(options["output_root"], job["name"])
+    log_file = os.path.join(options["output_root"], f"{job['name']}.log")
+    result = {"name": job["name"], "status": "ok", "output": None, "log_file": log_file, "error": None}
+    logger = PipelineLogger(lambda msg: None, level="warning", log_file=log_file, stage_limit=0)
+    with logger:
+        try:
+            for label, key in (("에셋", "asset"), ("모드", "mod")):
+                if not os.path.isdir(job[key]):
+                    raise FileNotFoundError(f"{label} 폴더가 없습니다: {job[key]}")
+            panel = SlotMapping.from_files(job["mapping"], job["asset"])
+            if job.get("export_vb"):
+                ret = run_export_vb(
+                    job["export_vb"],
+                    job["asset"],
+                    job["mod"],
+                    slot_panel=panel,
+                    output_root_cfg=output_root,
+                    staging_mode=options["staging_mode"],
+                    staging_rules=options["staging_rules"],
+                    logger=logger,
+                    open_output=False,
+                    hardlinks=options["export_vb_hardlinks"],
+                )
+                if ret != 0:
+                    result["status"] = "failed"
+                    result["error"] = f"export_vb 종료 코드: {ret}"
+            else:
+                result["output"] = ini_modifier.generate_ini(
+                    job["asset"],
+                    job["mod"],
+                    panel,
+                    output_root,
+                    logger,
+                    staging_mode=options["staging_mode"],
+                    staging_rules=options["staging_rules"],
+                    staging_hardlinks=options["staging_hardlinks"],
+                    incremental=options["incremental"],
+                )
+        except Exception as e:
+            logger.warning(f"작업 실패: {e}")
+            result["status"] = "failed"
+            result["error"] = str(e)
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def _run_serial(jobs, options):
+    """작업 프로세스: 같은 export_vb 폴더를 쓰는 작업들을 차례로 실행"""
+    return [_run_job(job, options) for job in jobs]
+
+
+def _shards(jobs):
+    """[[작업]]: generate_ini 작업은 하나씩, export_vb 작업은 export_vb 폴더별로 묶음"""
+    shards = []
+    by_root = {}
+    for job in jobs:
+        root = job.get("export_vb")
+        if not root:
+            shards.append([job])
+            continue
+        key = os.path.normcase(os.path.abspath(root))
+        if key not in by_root:
+            by_root[key] = []
+            shards.append(by_root[key])
+        by_root[key].append(job)
+    return shards
+
+
+def run_batch(jobs, options, log=print, workers=0):
+    """작업 목록 실행 -> [결과 dict] (작업 목록 순서)
+
+    options: output_root, staging_mode, staging_rules, staging_hardlinks, export_vb_hardlinks, incremental
+    workers: 동시에 실행할 프로세스 수 (0이면 CPU 수)
+    log: 작업마다 상태/요약 한 줄씩 받을 함수
+    """
+    os.makedirs(options["output_root"], exist_ok=True)
+    shards = _shards(jobs)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(shards) or 1))
+    log(f"[일괄 내보내기] 작업 {len(jobs)}개 (동시 실행 묶음 {len(shards)}개, 프로세스 {workers}개)")
+
+    started = time.perf_counter()
+    results = {}
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_run_serial, shard, options): shard for shard in shards}
+        for future in as_completed(futures):
+            try:
+                shard_results = future.result()
+            except Exception as e:
+                # 작업 프로세스가 비정상 종료한 경우
+                shard_results = [
+                    {"name": job["name"], "status": "failed", "output": None, "log_file": None,
+                     "error": f"작업 프로세스 오류: {e}", "seconds": 0.0}
+                    for job in futures[future]
+                ]
+            for result in shard_results:
+                done += 1
+                results[result["name"]] = result
+                if result["status"] == "ok":
+                    log(f"  [{done}/{len(jobs)}] 완료 {result['name']} ({result['seconds']:.2f}s)")
+                else:
+                    log(f"  [{done}/{len(jobs)}] 실패 {result['name']} ({result['seconds']:.2f}s): {result['error']}")
+    elapsed = time.perf_counter() - started
+
+    ordered = [results[job["name"]] for job in jobs]
+    failed = [result for result in ordered if result["status"] != "ok"]
+    busy = sum(result["seconds"] for result in ordered)
+    log(
+        f"[일괄 내보내기] 완료 {len(ordered) - len(failed)}개, 실패 {len(failed)}개, "
+        f"걸린 시간 {elapsed:.2f}s (작업 시간 합계 {busy:.2f}s)"
+    )
+    for result in failed:
+        log(f"  실패: {result['name']} -> {result['error']} (로그: {result['log_file']})")
+
+    report_path = os.path.join(options["output_root"], REPORT_FILE)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump({"seconds": round(elapsed, 3), "jobs": ordered}, f, ensure_ascii=False, indent=2)
+    return ordered
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py --batch",
+        description="작업 목록(JSON)의 에셋/모드를 한 번에 내보냅니다.",
+    )
+    parser.add_argument("--batch", required=True, metavar="JOBS", help="작업 목록 JSON 파일")
+    parser.add_argument("--output", help="output 폴더 (기본: 설정의 output_root)")
+    parser.add_argument("--jobs", type=int, default=0, help="동시에 실행할 프로세스 수 (0: CPU 수)")
+    parser.add_argument("--staging-mode", choices=STAGING_MODES, help="1단계 복사 범위")
+    parser.add_argument("--incremental", action="store_true", default=None, help="지난 출력 폴더를 재사용")
+    parser.add_argument("--full", dest="incremental", action="store_false", help="출력 폴더를 새로 만듦")
+    return parser
+
+
+def main(argv=None):
+    """종료 코드: 0 모두 성공, 1 실패한 작업이 있음, 2 인자/작업 목록 오류"""
+    parser = build_parser()
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    try:
+        jobs = load_jobs(args.batch)
+    except (OSError, ValueError) as e:
+        parser.error(f"작업 목록을 읽을 수 없습니다: {e}")
+
+    config = load_config(create=False)
+    options = {
+        "output_root": os.path.abspath(args.output or config.get("output_root", "output")),
+        "staging_mode": args.staging_mode or config.get("staging_mode", DEFAULT_STAGING_MODE),
+        "staging_rules": config.get("staging_rules"),
+        "staging_hardlinks": config.get("staging_hardlinks", False),
+        "export_vb_hardlinks": config.get("export_vb_hardlinks", False),
+        "incremental": config.get("incremental_export", False) if args.incremental is None else args.incremental,
+    }
+    results = run_batch(jobs, options, workers=args.jobs)
+    return 1 if any(result["status"] != "ok" for result in results) else 0
@@ -0,0 +1,176 @@
+"""조건식 치환 (4-3-1, 4-3-3단계)
+
+!=, >=, <= 비교를 각각 (A > B || A < B), (A > B || A == B), (A < B || A == B)로 바꿉니다.
+INI 전체가 아니라 조건식이 들어가는 곳만 봅니다.
+- 'if', 'elif', 'else if' 줄의 조건
+- 'condition = ' 값
+줄마다 조건식을 토큰으로 나눠 연산자 우선순위대로 해석하므로
+'($a != 1)', '$a + 1 >= $b' 처럼 괄호나 산술식이 붙은 비교도 피연산자 전체를 씁니다.
+바꾸지 않는 부분은 원문(공백 포함)을 그대로 둡니다. !==, ===는 건드리지 않습니다.
+"""
+
+import re
+
+from app.pipeline_log import log_detail
+
+# 우선순위 낮은 것부터 (3DMigoto 식 문법과 같은 순서)
+_BINARY_LEVELS = (
+    ("||",),
+    ("&&",),
+    ("==", "!=", "===", "!=="),
+    ("<", "<=", ">", ">="),
+    ("+", "-"),
+    ("*", "/", "//", "%"),
+)
+_UNARY_OPS = ("!", "-", "+")
+
+# 바꿀 비교 연산자 -> (비교1, 비교2)
+_REWRITES = {
+    "!=": (">", "<"),
+    ">=": (">", "=="),
+    "<=": ("<", "=="),
+}
+
+_TOKEN = re.compile(
+    r'\s*(?:(===|!==|==|!=|>=|<=|&&|\|\||//|[<>!+\-*/%()])|([^\s<>!=&|+\-*/%()]+))'
+)
+_CONDITION_LINE = re.compile(
+    r'^(\s*(?:if|elif|else\s+if)(?=[\s(]))(.*)$|^(\s*condition\s*=)(.*)$',
+    flags=re.IGNORECASE,
+)
+
+
+class _ParseError(Exception):
+    pass
+
+
+def _tokenize(text):
+    """[(종류, 값, 시작, 끝)] (종류: 'op' 또는 'operand')"""
+    tokens = []
+    pos = 0
+    text_len = len(text.rstrip())
+    while pos < text_len:
+        m = _TOKEN.match(text, pos)
+        if not m or m.end() == pos:
+            raise _ParseError(text[pos:])
+        if m.group(1):
+            tokens.append(("op", m.group(1), m.start(1), m.end(1)))
+        else:
+            tokens.append(("operand", m.group(2), m.start(2), m.end(2)))
+        pos = m.end()
+    return tokens
+
+
+class _ConditionParser:
+    """식 하나를 해석하면서 바꿀 비교만 새 문자열로 만든다
+
+    각 해석 함수는 (시작, 끝, 결과 문자열)을 돌려주며, 결과 문자열은
+    원문 text[시작:끝]에서 바꿀 비교만 바꾼 것이다.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.pos = 0
+        self.counts = {}
+        self.messages = []  # 해석이 끝까지 성공했을 때만 로그로 남김
+
+    def parse(self):
+        if not self.tokens:
+            raise _ParseError(self.text)
+        node = self._binary(0)
+        if self.pos != len(self.tokens):
+            raise _ParseError(self.text[self.tokens[self.pos][2]:])
+        return node
+
+    def _peek_op(self):
+        if self.pos < len(self.tokens) and self.tokens[self.pos][0] == "op":
+            return self.tokens[self.pos][1]
+        return None
+
+    def _binary(self, level):
+        if level == len(_BINARY_LEVELS):
+            return self._unary()
+        left = self._binary(level + 1)
+        while self._peek_op() in _BINARY_LEVELS[level]:
+            op = self.tokens[self.pos][1]
+            self.pos += 1
+            right = self._binary(level + 1)
+            left = self._combine(left, op, right)
+        return left
+
+    def _combine(self, left, op, right):
+        l_start, l_end, l_text = left
+        r_start, r_end, r_text = right
+        if op in _REWRITES:
+            first, second = _REWRITES[op]
+            l_text = l_text.strip()
+            r_text = r_text.strip()
+            text = f"({l_text} {first} {r_text} || {l_text} {second} {r_text})"
+            self.counts[op] = self.counts.get(op, 0) + 1
+            self.messages.append(f"    교체: {self.text[l_start:r_end].strip()} -> {text}")
+        else:
+            text = l_text + self.text[l_end:r_start] + r_text
+        return l_start, r_end, text
+
+    def _unary(self):
+        if self.pos >= len(self.tokens):
+            raise _ParseError(self.text)
+        kind, value, start, end = self.tokens[self.pos]
+        if kind == "op" and value in _UNARY_OPS:
+            self.pos += 1
+            o_start, o_end, o_text = self._unary()
+            return start, o_end, self.text[start:o_start] + o_text
+        if kind == "op" and value == "(":
+            self.pos += 1
+            i_start, i_end, i_text = self._binary(0)
+            if self._peek_op() != ")":
+                raise _ParseError(self.text[start:])
+            close_start, close_end = self.tokens[self.pos][2:]
+            self.pos += 1
+            return start, close_end, (
+                self.text[start:i_start] + i_text + self.text[i_end:close_end]
+            )
+        if kind == "operand":
+            self.pos += 1
+            return start, end, value
+        raise _ParseError(self.text[start:])
+
+
+def _rewrite_expression(expr, counts, logger):
+    """조건식 하나의 치환 결과 (바꿀 비교가 없으면 원문 그대로)"""
+    if not any(op in expr for op in _REWRITES):
+        return expr
+    try:
+        parser = _ConditionParser(expr)
+        start, end, text = parser.parse()
+    except _ParseError:
+        logger.log(f"    조건식 해석 실패, 그대로 둠: {expr.strip()}")
+        return expr
+    for message in parser.messages:
+        log_detail(logger, message)
+    for op, n in parser.counts.items():
+        counts[op] = counts.get(op, 0) + n
+    return expr[:start] + text + expr[end:]
+
+
+def rewrite_conditions(ini_content, logger):
+    """if/elif/else if 줄과 condition 값의 !=, >=, <= 비교를 한 번에 치환
+
+    반환: (ini_content, {연산자: 교체 수})
+    """
+    counts = {}
+    lines = ini_content.split('\n')
+    for i, line in enumerate(lines):
+        m = _CONDITION_LINE.match(line)
+        if not m:
+            continue
+        prefix, expr = (m.group(1), m.group(2)) if m.group(1) is not None else (m.group(3), m.group(4))
+        new_expr = _rewrite_expression(expr, counts, logger)
+        if new_expr is not expr:
+            lines[i] = prefix + new_expr
+
+    for op in _REWRITES:
+        if counts.get(op):
+            logger.log(f"    {op} 조건문 {counts[op]}개 교체 완료")
+    return '\n'.join(lines), counts
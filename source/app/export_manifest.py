@@ -0,0 +1,68 @@
+"""증분 내보내기용 출력 목록 (output 폴더마다 JSON 하나)
+
+지난 내보내기의 다음 정보를 저장합니다.
+- options: 모드/에셋 폴더, 스테이징 설정 (하나라도 다르면 처음부터 다시 만듦)
+- slots: 슬롯 -> 할당한 파일
+- files: 출력 파일 -> 원본 파일과 그 크기/수정 시각, 출력 파일의 크기/수정 시각
+- inis: 출력 INI -> 내용 digest, 크기/수정 시각
+다음 내보내기 때 원본과 출력이 그대로인 파일은 다시 복사하지 않고,
+내용이 같은 INI는 다시 쓰지 않습니다.
+"""
+
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 1
+MANIFEST_DIR = ".export_manifests"
+
+
+def manifest_path(output_root, mod_folder_name):
+    return os.path.join(output_root, MANIFEST_DIR, f"{mod_folder_name}.json")
+
+
+def text_digest(text):
+    return hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def file_stat(path):
+    """[크기, 수정 시각(ns)] (없으면 None)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def load_manifest(output_root, mod_folder_name, options):
+    """저장된 출력 목록 (없거나 설정이 다르면 None)"""
+    try:
+        with open(manifest_path(output_root, mod_folder_name), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return None
+    if data.get("options") != options:
+        return None
+    return data
+
+
+def save_manifest(output_root, mod_folder_name, data):
+    """임시 파일에 쓴 뒤 교체하여 저장"""
+    path = manifest_path(output_root, mod_folder_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = dict(data)
+    payload["version"] = MANIFEST_VERSION
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def discard_manifest(output_root, mod_folder_name):
+    """전체 내보내기로 출력 폴더를 새로 만들면 지난 목록은 맞지 않으므로 삭제"""
+    try:
+        os.remove(manifest_path(output_root, mod_folder_name))
+    except OSError:
+        pass
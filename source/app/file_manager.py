@@ -1,11 +1,206 @@
 import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
 
 
-def scan_folder(folder_path):
-    file_list = []
-    for root, dirs, files in os.walk(folder_path):
-        for filename in files:
-            full_path = os.path.join(root, filename)
-            rel_path = os.path.relpath(full_path, folder_path).replace("\\", "/")
-            file_list.append(rel_path)
-    return file_list
+# 확장자 -> 스캔 결과 분류
+BUCKET_EXTENSIONS = {
+    ".ini": "ini",
+    ".ib": "ib",
+    ".buf": "buf",
+    ".assets": "assets",
+    ".dds": "textures",
+    ".png": "textures",
+    ".jpg": "textures",
+    ".jpeg": "textures",
+    ".tga": "textures",
+    ".bmp": "textures",
+    ".json": "json",
+}
+BUCKETS = ("ini", "ib", "buf", "assets", "json", "textures", "other")
+
+# 폴더가 바뀌지 않았어도 파일 크기/수정 시각을 다시 확인하는 분류
+# (텍스처 등 대량 파일은 폴더가 바뀐 경우에만 다시 확인)
+RESTAT_BUCKETS = ("ini", "ib", "buf", "assets", "json")
+
+
+def bucket_of(filename):
+    return BUCKET_EXTENSIONS.get(os.path.splitext(filename)[1].lower(), "other")
+
+
+@dataclass
+class ScanResult:
+    files: List[str] = field(default_factory=list)
+    buckets: Dict[str, List[str]] = field(default_factory=dict)
+    stats: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    manifest: dict = field(default_factory=dict)
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+def scan_directory(folder_path, manifest=None, check_cancelled=None):
+    """os.scandir 기반 폴더 스캔
+
+    - 파일을 확장자별 분류(ini/ib/buf/assets/json/textures/other)로 나눠 반환
+    - manifest: 이전 스캔의 폴더별 (수정 시각, 하위 폴더, 파일 크기/수정 시각)
+      폴더 수정 시각이 그대로면 그 폴더는 다시 나열하지 않고 이전 목록을 사용하며,
+      RESTAT_BUCKETS 파일만 크기/수정 시각을 다시 확인한다.
+    - 이전 manifest와 비교한 추가/삭제/변경 파일 목록도 함께 반환
+    check_cancelled: 폴더마다 호출되는 취소 확인 함수 (선택)
+    """
+    prev_dirs = (manifest or {}).get("dirs", {})
+    dirs = {}
+    stats = {}
+    stack = [""]
+
+    while stack:
+        if check_cancelled:
+            check_cancelled()
+        rel_dir = stack.pop()
+        dir_path = os.path.join(folder_path, rel_dir) if rel_dir else folder_path
+        try:
+            dir_mtime = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            continue
+
+        prev = prev_dirs.get(rel_dir)
+        if prev and prev.get("mtime") == dir_mtime:
+            subdirs = list(prev["dirs"])
+            files = {}
+            for name, (size, mtime) in prev["files"].items():
+                if bucket_of(name) in RESTAT_BUCKETS:
+                    try:
+                        st = os.stat(os.path.join(dir_path, name))
+                    except OSError:
+                        continue
+                    size, mtime = st.st_size, st.st_mtime_ns
+                files[name] = [size, mtime]
+        else:
+            subdirs = []
+            files = {}
+            try:
+                with os.scandir(dir_path) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir():
+                                # os.walk와 같이 심볼릭 링크 폴더는 따라가지 않음
+                                if not entry.is_symlink():
+                                    subdirs.append(entry.name)
+                                continue
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        files[entry.name] = [st.st_size, st.st_mtime_ns]
+            except OSError:
+                continue
+
+        dirs[rel_dir] = {"mtime": dir_mtime, "dirs": subdirs, "files": files}
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        for name, (size, mtime) in files.items():
+            stats[prefix + name] = (size, mtime)
+        for name in subdirs:
+            stack.append(prefix + name)
+
+    result = ScanResult(manifest={"dirs": dirs}, stats=stats)
+    result.files = sorted(stats)
+    result.buckets = {bucket: [] for bucket in BUCKETS}
+    for rel_path in result.files:
+        result.buckets[bucket_of(rel_path)].append(rel_path)
+
+    if manifest is not None:
+        prev_stats = manifest_stats(manifest)
+        for rel_path, stat in stats.items():
+            old = prev_stats.get(rel_path)
+            if old is None:
+                result.added.append(rel_path)
+            elif old != stat:
+                result.changed.append(rel_path)
+        result.removed = [rel for rel in prev_stats if rel not in stats]
+        result.added.sort()
+        result.changed.sort()
+        result.removed.sort()
+
+    return result
+
+
+def manifest_stats(manifest):
+    """manifest -> {상대 경로: (크기, 수정 시각)}"""
+    stats = {}
+    for rel_dir, info in (manifest or {}).get("dirs", {}).items():
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        for name, (size, mtime) in info["files"].items():
+            stats[prefix + name] = (size, mtime)
+    return stats
+
+
+def scan_folder(folder_path, check_cancelled=None):
+    """폴더 아래 모든 파일의 상대 경로('/' 구분) 목록"""
+    return scan_directory(folder_path, check_cancelled=check_cancelled).files
+
+
+def path_key(rel_path):
+    """모드 기준 상대 경로의 비교용 키 (윈도우는 대소문자 구분하지 않으므로 normcase)"""
+    return os.path.normcase(os.path.normpath(rel_path))
+
+
+def build_path_table(file_list):
+    """정규화된 상대 경로 키 -> 스캔된 파일 항목 표 (스캔당 한 번 생성)"""
+    return {path_key(rel_path): rel_path for rel_path in file_list}
+
+
+def resolve_declared_path(folder_path, ini_rel, declared):
+    """INI의 filename 선언을 INI 위치 기준으로 풀어 모드 기준 상대 경로 키로 반환
+
+    모드 폴더 밖을 가리키면 None
+    """
+    try:
+        if os.path.isabs(declared):
+            rel_path = os.path.relpath(declared, folder_path)
+        else:
+            rel_path = os.path.join(os.path.dirname(ini_rel), declared)
+    except ValueError:
+        # 윈도우에서 다른 드라이브의 절대 경로
+        return None
+
+    key = path_key(rel_path)
+    if key == os.pardir or key.startswith(os.pardir + os.sep):
+        return None
+    return key
+
+
+# INI 인코딩 감지 순서 (BOM이 없을 때). 마지막 latin-1은 항상 성공하며 바이트를 그대로 보존한다.
+INI_ENCODINGS = ("utf-8", "cp949", "shift_jis", "latin-1")
+
+
+def decode_text(data):
+    """바이트를 감지한 인코딩으로 디코딩하여 (텍스트, 인코딩) 반환
+
+    줄바꿈은 텍스트 모드로 읽을 때처럼 '\\n'으로 통일한다.
+    """
+    if data.startswith(b"\xef\xbb\xbf"):
+        encoding = "utf-8-sig"
+        text = data.decode(encoding)
+    elif data.startswith((b"\xff\xfe", b"\xfe\xff")):
+        encoding = "utf-16"
+        text = data.decode(encoding)
+    else:
+        for encoding in INI_ENCODINGS:
+            try:
+                text = data.decode(encoding)
+                break
+            except UnicodeDecodeError:
+                continue
+    return text.replace("\r\n", "\n").replace("\r", "\n"), encoding
+
+
+def read_text(path):
+    """파일을 바이트로 읽어 (텍스트, 인코딩, 원본 바이트) 반환"""
+    with open(path, "rb") as f:
+        data = f.read()
+    text, encoding = decode_text(data)
+    return text, encoding, data
@@ -0,0 +1,83 @@
+"""폴더 감시 (폴링)
+
+선택된 에셋/모드 폴더를 일정 간격으로 증분 스캔(`scan_directory`)하여
+바뀐 내용이 있으면 스캔 결과를 UI 스레드로 넘깁니다.
+- 스캔 기준(manifest)은 폴더를 불러올 때 매처가 `watch`로 넘겨 준 것을 사용
+- 감시 대상이 바뀌면 이전 대상의 스캔 결과는 버림
+"""
+
+import threading
+
+from app.file_manager import scan_directory
+
+# 기본 폴링 간격(초)
+DEFAULT_INTERVAL = 1.0
+
+
+class FolderWatcher:
+    def __init__(self, post, on_change, interval=DEFAULT_INTERVAL, on_error=None):
+        """
+        post: 어느 스레드에서든 호출 가능한 UI 스레드 전달 함수 (fn, *args)
+        on_change: UI 스레드에서 on_change(kind, folder, scan) 호출
+        """
+        self._post = post
+        self._on_change = on_change
+        self._on_error = on_error
+        self.interval = max(0.2, float(interval or DEFAULT_INTERVAL))
+        self._lock = threading.Lock()
+        self._targets = {}
+        self._generation = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def watch(self, kind, folder, manifest):
+        """kind('asset'/'mod') 감시 대상을 folder로 교체 (manifest: 마지막 스캔 기준)"""
+        with self._lock:
+            self._generation += 1
+            self._targets[kind] = (folder, manifest, self._generation)
+
+    def unwatch(self, kind):
+        with self._lock:
+            self._targets.pop(kind, None)
+
+    def start(self):
+        if self.running:
+            return
+        # 멈춘 이전 스레드가 다시 깨어나지 않도록 시작할 때마다 새 이벤트 사용
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._loop, args=(self._stop,), name="folder-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _loop(self, stop):
+        while not stop.wait(self.interval):
+            with self._lock:
+                targets = list(self._targets.items())
+            for kind, (folder, manifest, generation) in targets:
+                if stop.is_set() or manifest is None:
+                    continue
+                try:
+                    scan = scan_directory(folder, manifest)
+                except Exception as e:
+                    if self._on_error:
+                        self._post(self._on_error, kind, folder, e)
+                    continue
+                if not scan.has_changes:
+                    continue
+
+                with self._lock:
+                    current = self._targets.get(kind)
+                    if not current or current[2] != generation:
+                        # 그 사이 대상이 바뀜: 이 결과는 버림
+                        continue
+                    self._targets[kind] = (folder, scan.manifest, generation)
+                self._post(self._on_change, kind, folder, scan)
@@ -0,0 +1,121 @@
+"""화면 없이 내보내기 (main.py --headless)
+
+tkinter를 불러오지 않고 에셋 폴더, 모드 폴더, JSON 슬롯 매핑(app.slot_mapping)으로
+generate_ini 전체 과정을 실행하며, --export-vb를 주면 run_export_vb까지 실행합니다.
+기본값은 config.json(없으면 기본 설정)을 따르고 설정 파일은 만들지 않습니다.
+
+예) python main.py --headless --asset assets/Keqing --mod mods/KeqingMod --mapping slots.json
+종료 코드: 0 성공, 1 실패(export_vb는 그 종료 코드), 2 인자 오류
+"""
+
+import argparse
+import os
+import sys
+
+from app import ini_modifier
+from app.export_to_export_vb import run_export_vb
+from app.pipeline_log import PipelineLogger
+from app.slot_mapping import SlotMapping
+from app.staging import DEFAULT_STAGING_MODE, STAGING_MODES
+from config import load_config
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py --headless",
+        description="화면 없이 슬롯 매핑(JSON)으로 모드를 내보냅니다.",
+    )
+    parser.add_argument("--headless", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--asset", required=True, help="에셋 폴더 (hash.json이 있는 폴더)")
+    parser.add_argument("--mod", required=True, help="모드 폴더")
+    parser.add_argument("--mapping", required=True, help="슬롯 매핑 JSON 파일")
+    parser.add_argument("--output", help="output 폴더 (기본: 설정의 output_root)")
+    parser.add_argument("--export-vb", metavar="EXPORT_ROOT", help="export_vb.py가 있는 폴더 (주면 export_vb까지 실행)")
+    parser.add_argument("--staging-mode", choices=STAGING_MODES, help="1단계 복사 범위")
+    parser.add_argument("--incremental", action="store_true", default=None, help="지난 출력 폴더를 재사용")
+    parser.add_argument("--full", dest="incremental", action="store_false", help="출력 폴더를 새로 만듦")
+    parser.add_argument("--dry-run", action="store_true", help="파일을 쓰지 않고 바뀔 내용만 표시")
+    parser.add_argument("--workers", type=int, help="4단계 INI 변환 프로세스 수 (0: CPU 수)")
+    parser.add_argument("--log-level", choices=("detail", "info", "warning"), help="화면에 표시할 최소 로그 레벨")
+    parser.add_argument("--log-file", help="모든 레벨의 로그를 기록할 파일")
+    return parser
+
+
+def _print_plan(plan, logger):
+    # --dry-run은 바뀔 내용을 보려고 주는 옵션이므로 diff도 info 레벨로 출력
+    for line in ini_modifier.preview_lines(plan):
+        logger.log(line)
+
+
+def run(args):
+    config = load_config(create=False)
+    logger = PipelineLogger(
+        print,
+        level=args.log_level or config.get("log_level", "info"),
+        log_file=args.log_file or config.get("log_file"),
+        stage_limit=0,
+    )
+    with logger:
+        for label, path in (("에셋", args.asset), ("모드", args.mod)):
+            if not os.path.isdir(path):
+                logger.warning(f"{label} 폴더가 없습니다: {path}")
+                return 1
+        try:
+            panel = SlotMapping.from_files(args.mapping, args.asset)
+        except (OSError, ValueError) as e:
+            logger.warning(f"슬롯 매핑을 읽을 수 없습니다: {e}")
+            return 1
+        for rel_path in panel.assigned_files():
+            if not os.path.isfile(os.path.join(args.mod, rel_path)):
+                logger.warning(f"매핑한 파일이 모드 폴더에 없습니다: {rel_path}")
+
+        output_root = args.output or config.get("output_root", "output")
+        staging_mode = args.staging_mode or config.get("staging_mode", DEFAULT_STAGING_MODE)
+        staging_rules = config.get("staging_rules")
+        workers = config.get("ini_workers", 1) if args.workers is None else args.workers
+
+        if args.export_vb:
+            ret = run_export_vb(
+                args.export_vb,
+                args.asset,
+                args.mod,
+                slot_panel=panel,
+                output_root_cfg=output_root,
+                staging_mode=staging_mode,
+                staging_rules=staging_rules,
+                logger=logger,
+                ini_workers=workers,
+                open_output=False,
+                hardlinks=config.get("export_vb_hardlinks", False),
+            )
+            return 1 if ret is None else ret
+
+        incremental = config.get("incremental_export", False) if args.incremental is None else args.incremental
+        try:
+            result = ini_modifier.generate_ini(
+                args.asset,
+                args.mod,
+                panel,
+                output_root,
+                logger,
+                staging_mode=staging_mode,
+                staging_rules=staging_rules,
+                staging_hardlinks=config.get("staging_hardlinks", False),
+                dry_run=args.dry_run,
+                incremental=incremental,
+                ini_workers=workers,
+            )
+        except Exception as e:
+            logger.warning(f"내보내기 실패: {e}")
+            return 1
+        if args.dry_run:
+            _print_plan(result, logger)
+        return 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    if args.dry_run and args.export_vb:
+        parser.error("--dry-run은 --export-vb와 함께 쓸 수 없습니다.")
+    return run(args)
@@ -0,0 +1,131 @@
+"""INI 인덱스
+
+모드 INI를 한 번만 파싱하여 매칭에 필요한 정보를 모아 둡니다.
+- declarations: filename 선언 목록 (선언 경로, 선언이 속한 섹션 번호)
+- references: 섹션명 -> 해당 섹션을 값으로 참조하는 (키, 섹션 번호) 목록
+- section_hashes: 섹션 번호 -> 섹션 안의 첫 hash 값
+- section_first_indexes: 섹션 번호 -> 섹션 안의 첫 match_first_index 값
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Tuple
+
+SECTION_PATTERN = re.compile(r"^\s*\[(?P<section>[^\]]+)\]")
+KV_PATTERN = re.compile(
+    r'^\s*(?P<key>[^=;\s]+)\s*=\s*(?:"(?P<dq>[^\"]+)"|\'(?P<sq>[^\']+)\'|(?P<noq>\S+))'
+)
+
+# 참조 키 -> 컴포넌트 슬롯 이름
+COMPONENT_KEYS = {
+    "ib": "IB",
+    "vb0": "Position",
+    "vb2": "Blend",
+    "vb1": "Texcoord",
+}
+
+# 섹션 밖(첫 헤더 이전)을 나타내는 섹션 번호
+NO_SECTION = -1
+
+
+@dataclass
+class IniIndex:
+    sections: List[str] = field(default_factory=list)
+    section_hashes: List[str] = field(default_factory=list)
+    section_first_indexes: List[str] = field(default_factory=list)
+    first_hash: str = ""
+    declarations: List[Tuple[str, int]] = field(default_factory=list)
+    references: Dict[str, List[Tuple[str, int]]] = field(default_factory=dict)
+
+    def hash_of(self, section_idx: int) -> str:
+        """섹션의 hash 값 (섹션 밖이면 INI 전체에서 첫 hash)"""
+        if section_idx == NO_SECTION:
+            return self.first_hash
+        return self.section_hashes[section_idx]
+
+    def components_for(self, section_idx: int) -> Iterator[Tuple[str, str]]:
+        """Resource 섹션을 참조하는 (컴포넌트, hash)를 INI 순서대로 반환"""
+        if section_idx == NO_SECTION:
+            return
+        target = self.sections[section_idx].strip()
+        for key, ref_idx in self.references.get(target, ()):
+            comp = COMPONENT_KEYS.get(key)
+            if comp:
+                yield comp, self.hash_of(ref_idx)
+
+    def first_indexes_for(self, section_idx: int) -> Iterator[Tuple[str, str]]:
+        """Resource 섹션을 참조하는 (컴포넌트, match_first_index)를 INI 순서대로 반환"""
+        if section_idx == NO_SECTION:
+            return
+        target = self.sections[section_idx].strip()
+        for key, ref_idx in self.references.get(target, ()):
+            comp = COMPONENT_KEYS.get(key)
+            if comp and ref_idx != NO_SECTION and self.section_first_indexes[ref_idx]:
+                yield comp, self.section_first_indexes[ref_idx]
+
+
+def build_ini_index(text: str) -> IniIndex:
+    """INI 텍스트를 줄 단위로 한 번 훑어 인덱스를 만듭니다."""
+    index = IniIndex()
+    current = NO_SECTION
+
+    for line in text.splitlines():
+        m = SECTION_PATTERN.match(line)
+        if m:
+            index.sections.append(m.group("section"))
+            index.section_hashes.append("")
+            index.section_first_indexes.append("")
+            current = len(index.sections) - 1
+            continue
+
+        kv = KV_PATTERN.match(line)
+        if not kv:
+            continue
+
+        key = kv.group("key").lower()
+        value = kv.group("dq") or kv.group("sq") or kv.group("noq") or ""
+
+        if key == "hash":
+            if current != NO_SECTION and not index.section_hashes[current]:
+                index.section_hashes[current] = value
+            if not index.first_hash:
+                index.first_hash = value
+        elif key == "match_first_index":
+            if current != NO_SECTION and not index.section_first_indexes[current]:
+                index.section_first_indexes[current] = value
+        elif key == "filename":
+            index.declarations.append((value, current))
+
+        if key in COMPONENT_KEYS:
+            index.references.setdefault(value.strip(), []).append((key, current))
+
+    return index
+
+
+def index_to_dict(index: IniIndex) -> dict:
+    """디스크 캐시(JSON) 저장용 dict 변환"""
+    return {
+        "sections": index.sections,
+        "section_hashes": index.section_hashes,
+        "section_first_indexes": index.section_first_indexes,
+        "first_hash": index.first_hash,
+        "declarations": [list(d) for d in index.declarations],
+        "references": {
+            name: [list(r) for r in refs] for name, refs in index.references.items()
+        },
+    }
+
+
+def index_from_dict(data: dict) -> IniIndex:
+    """`index_to_dict` 결과를 IniIndex로 복원"""
+    return IniIndex(
+        sections=list(data["sections"]),
+        section_hashes=list(data["section_hashes"]),
+        section_first_indexes=list(data["section_first_indexes"]),
+        first_hash=data.get("first_hash", ""),
+        declarations=[(d[0], d[1]) for d in data["declarations"]],
+        references={
+            name: [(r[0], r[1]) for r in refs]
+            for name, refs in data["references"].items()
+        },
+    )
@@ -1,34 +1,95 @@
+import difflib
 import os
-import shutil
 import re
-import uuid
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.export_manifest import discard_manifest, file_stat, load_manifest, save_manifest, text_digest
+from app.file_manager import ScanResult, bucket_of, decode_text, path_key, resolve_declared_path, scan_directory
+from app.ini_rewriter import IniRewriter
+from app.pipeline_log import DETAIL, INFO, PipelineLogger, log_detail, log_stage
+from app.condition_rewriter import rewrite_conditions
+from app.rename_plan import DirectoryView, apply_plan, plan_renames
+from app.section_filter import filter_sections, strip_references
+from app.staging import DEFAULT_STAGING_MODE, StagingReport, break_link, plan_staging, require_folder, stage_file, stage_mod_folder
+
+
+# INI가 이보다 적으면 프로세스를 띄우는 비용이 더 커서 순차 처리
+PARALLEL_MIN_INIS = 4
 
 
-def _copy_mod_folder(mod_folder_path, output_root, logger):
-    """1단계: 원본 모드파일을 output 폴더로 복사"""
-    logger.log("[1단계] 원본 모드파일을 output 폴더로 복사 중...")
+def _read_ini(ini_path, encoding=None):
+    """INI 읽기: 매처가 감지한 인코딩이 있으면 그대로 사용, 없거나 맞지 않으면 다시 감지
+
+    반환: (텍스트, 인코딩)
+    """
+    with open(ini_path, "rb") as f:
+        data = f.read()
+    if encoding:
+        try:
+            text = data.decode(encoding)
+            return text.replace("\r\n", "\n").replace("\r", "\n"), encoding
+        except (UnicodeDecodeError, LookupError):
+            pass
+    return decode_text(data)
+
+
+def _write_ini(ini_path, ini_content, encoding, logger):
+    """INI 쓰기: 원본 인코딩을 유지하고, 표현할 수 없는 문자가 생기면 UTF-8로 저장"""
+    encoding = encoding or "utf-8"
+    try:
+        ini_content.encode(encoding)
+    except (UnicodeEncodeError, LookupError):
+        logger.log(f"    {encoding}로 저장할 수 없어 UTF-8로 저장: {os.path.basename(ini_path)}")
+        encoding = "utf-8"
+    # 하드링크로 스테이징된 파일이면 원본 모드가 바뀌지 않도록 먼저 링크를 끊음
+    break_link(ini_path)
+    with open(ini_path, "w", encoding=encoding) as f:
+        f.write(ini_content)
+
+
+def _copy_mod_folder(mod_folder_path, output_root, logger, required=(), staging_mode=DEFAULT_STAGING_MODE, staging_rules=None, staging_hardlinks=False):
+    """1단계: 원본 모드파일을 output 폴더로 복사
+
+    staging_mode가 'referenced'이면 INI, 매칭 파일(required), INI가 참조하는 파일만 복사하고
+    나머지는 staging_rules에 따라 건너뛰거나 링크한다 (app.staging 참고)
+    staging_hardlinks: 고치지 않는 파일을 하드링크로 둘지 (출력 폴더를 곧 지울 때)
+    """
+    log_stage(logger, "[1단계] 원본 모드파일을 output 폴더로 복사 중...")
     if not os.path.exists(output_root):
         os.makedirs(output_root)
     
     mod_folder_name = os.path.basename(os.path.normpath(mod_folder_path))
     output_mod_path = os.path.join(output_root, mod_folder_name)
     
-    if os.path.exists(output_mod_path):
-        shutil.rmtree(output_mod_path)
-    
-    shutil.copytree(mod_folder_path, output_mod_path)
+    report = stage_mod_folder(
+        mod_folder_path, output_mod_path, required, staging_mode, staging_rules, staging_hardlinks
+    )
     logger.log(f"모드 폴더 복사 완료: {output_mod_path}")
+    if staging_mode == "referenced":
+        logger.log(f"    참조 파일만 복사: {report.summary()}")
+    else:
+        logger.log(f"    {report.summary()}")
     
     return output_mod_path
 
 
 def _collect_matched_pairs(asset_folder_path, component_slot_panel, logger):
-    """2단계: 매칭된 파일 수집"""
-    logger.log("[2단계] 매칭된 파일 수집 중...")
+    """2단계: 매칭된 파일 수집
+
+    패널에 슬롯 표(model.slot_table.SlotTable)가 있으면 위젯 대신 표를 바로 읽는다.
+    """
+    log_stage(logger, "[2단계] 매칭된 파일 수집 중...")
+    asset_name = os.path.basename(os.path.normpath(asset_folder_path))
+    slot_table = getattr(component_slot_panel, "slot_table", None)
+    if slot_table is not None:
+        matched_pairs, ib_slots = slot_table.matched_pairs(asset_name)
+        logger.log(f"매칭된 파일 수: {len(matched_pairs)}개")
+        return matched_pairs, ib_slots
+
     component_values = component_slot_panel.get_component_values()
     components = component_slot_panel.controller.matcher.components
-    
-    asset_name = os.path.basename(os.path.normpath(asset_folder_path))
     matched_pairs = []
     ib_slots = set()
     
@@ -66,548 +127,241 @@ def _collect_matched_pairs(asset_folder_path, component_slot_panel, logger):
     return matched_pairs, ib_slots
 
 
-def _move_files_to_top(output_mod_path, matched_pairs, ib_slots, logger):
-    """2-1단계: 매칭된 파일들과 ini 파일들을 최상위 폴더로 이동
-    (단순화된 구현)
-    - ini 파일 목록 수집
-    - 각 매칭 파일을 처리: 서브폴더에서 이동하거나 최상위에서 확장자(.ib) 변경
+def _ini_encodings_for(ini_files, ini_origins, ini_encodings):
+    """이동 후 INI 파일명 -> 매처가 원본 INI에서 감지한 인코딩"""
+    by_origin = {
+        os.path.normcase(os.path.normpath(rel)): enc
+        for rel, enc in (ini_encodings or {}).items()
+    }
+    return {
+        new_name: by_origin.get(os.path.normcase(os.path.normpath(origin)))
+        for new_name, origin in zip(ini_files, ini_origins)
+    }
+
+
+# filename = 줄 (키, 값, 값 뒤 공백)
+_FILENAME_ASSIGN = re.compile(r'(?i)^([ \t]*filename[ \t]*=[ \t]*)(.*?)([ \t]*)$')
+
+
+def _build_path_lookup(matched_pairs, original_paths):
+    """원래 경로 표기 -> 새 파일명 조회표 (내보내기당 한 번 생성)
+
+    반환: (by_path, by_spelling)
+    - by_path: 모드 기준 경로 키 -> 새 파일명 (INI 위치 기준으로 풀어 조회)
+    - by_spelling: 원래 경로(슬래시 변형 포함), 그다음 파일 이름 -> 새 파일명
+    키는 모두 소문자이며, 같은 키가 겹치면 먼저 나온 매칭이 우선
     """
-    logger.log("[2-1단계] 매칭된 파일과 ini 파일을 최상위 폴더로 이동 중...")
-
-    def _collect_ini_files(root_path):
-        files = []
-        for r, d, fs in os.walk(root_path):
-            for f in fs:
-                if f.lower().endswith('.ini'):
-                    full = os.path.join(r, f)
-                    files.append(os.path.relpath(full, root_path))
-        return files
-
-    def _generate_unique_name(root_path, base, ext):
-        name = f"{base}{ext}"
-        dst = os.path.join(root_path, name)
-        counter = 1
-        while os.path.exists(dst):
-            name = f"{base}_{counter}{ext}"
-            dst = os.path.join(root_path, name)
-            counter += 1
-        return name
-
-    def _process_matched_file(root_path, slot_name, matched_file):
-        src = os.path.join(root_path, matched_file)
-
-        # 경우1: 서브폴더에 있던 파일을 최상위로 이동
-        if os.path.exists(src) and ('/' in matched_file or '\\' in matched_file):
-            orig = os.path.basename(matched_file)
-            base, ext = os.path.splitext(orig)
-            desired_ext = '.ib' if slot_name in ib_slots else ext
-            filename = _generate_unique_name(root_path, base, desired_ext)
-            dst = os.path.join(root_path, filename)
-            shutil.move(src, dst)
-            if slot_name in ib_slots and ext.lower() != '.ib':
-                logger.log(f"이동 및 확장자 변경(IB): {matched_file} -> {filename}")
-            else:
-                logger.log(f"이동: {matched_file} -> {filename}")
-            return filename
-
-        # 경우2: 이미 최상위에 있는 파일
-        moved = os.path.basename(matched_file)
-        base, ext = os.path.splitext(moved)
-        if slot_name in ib_slots and ext.lower() != '.ib':
-            filename = _generate_unique_name(root_path, base, '.ib')
-            src_top = os.path.join(root_path, moved)
-            if os.path.exists(src_top):
-                os.rename(src_top, os.path.join(root_path, filename))
-                logger.log(f"확장자 변경(IB): {moved} -> {filename}")
-                return filename
-            else:
-                return moved
-        return moved
-
-    # ini 파일 목록
-    ini_files = _collect_ini_files(output_mod_path)
-
-    # 원본 경로 저장
-    original_paths = [matched_file for _, matched_file in matched_pairs]
-
-    # 매칭된 파일 처리
-    for idx, (slot_name, matched_file) in enumerate(matched_pairs):
-        new_name = _process_matched_file(output_mod_path, slot_name, matched_file)
-        matched_pairs[idx] = (slot_name, new_name)
-
-    # 매칭된 파일 처리 후 .assets 전처리 (예: .assets -> .buf 등)
-    # .assets로 잘못 설정된 파일의 확장자를 교체하고 matched_pairs에 반영
-    try:
-        matched_pairs = _preprocess_assets_files(output_mod_path, matched_pairs, ini_files, ib_slots, logger)
-    except Exception:
-        logger.log("    .assets 전처리 중 예외 발생 (무시합니다)")
-
-    # ini 파일 이동 (기존 동작 유지)
-    for idx, ini_file in enumerate(ini_files):
-        src_path = os.path.join(output_mod_path, ini_file)
-        if '/' in ini_file or '\\' in ini_file:
-            filename = os.path.basename(ini_file)
-            dst_path = os.path.join(output_mod_path, filename)
-
-            counter = 1
-            base_name, ext = os.path.splitext(filename)
-            while os.path.exists(dst_path):
-                filename = f"{base_name}_{counter}{ext}"
-                dst_path = os.path.join(output_mod_path, filename)
-                counter += 1
-
-            shutil.move(src_path, dst_path)
-            ini_files[idx] = filename
-            logger.log(f"이동: {ini_file} -> {filename}")
-        else:
-            ini_files[idx] = ini_file
+    by_path = {}
+    by_spelling = {}
+    for idx, original_path in enumerate(original_paths):
+        new_filename = matched_pairs[idx][1]
+        by_path.setdefault(path_key(original_path).lower(), new_filename)
+        for spelling in (
+            original_path,
+            original_path.replace('/', '\\'),
+            original_path.replace('\\', '/'),
+        ):
+            by_spelling.setdefault(spelling.lower(), new_filename)
+    for idx, original_path in enumerate(original_paths):
+        by_spelling.setdefault(os.path.basename(original_path).lower(), matched_pairs[idx][1])
+    return by_path, by_spelling
+
+
+def _rewrite_ini_paths(ini_content, output_mod_path, ini_origin, lookup):
+    """2-2단계 (텍스트만): filename = 값을 조회표의 새 파일명으로 -> (ini_content, 변경 수)"""
+    by_path, by_spelling = lookup
+    lines = ini_content.split('\n')
+    changed = 0
+    for i, line in enumerate(lines):
+        m = _FILENAME_ASSIGN.match(line)
+        if not m:
+            continue
+        prefix, value, trail = m.groups()
+        quote = ''
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+            quote = value[0]
+            value = value[1:-1]
+        if not value:
+            continue
 
-    return matched_pairs, ini_files, original_paths
+        # INI 경로 표기는 윈도우 기준이므로 역슬래시도 구분자로 취급
+        key = resolve_declared_path(output_mod_path, ini_origin, value.replace('\\', '/'))
+        new_filename = by_path.get(key.lower()) if key else None
+        if new_filename is None:
+            new_filename = by_spelling.get(value.lower())
+        if new_filename is None or new_filename == value:
+            continue
+        lines[i] = f"{prefix}{quote}{new_filename}{quote}{trail}"
+        changed += 1
 
+    if changed:
+        ini_content = '\n'.join(lines)
+    return ini_content, changed
 
-def _update_ini_file_paths(output_mod_path, ini_files, matched_pairs, original_paths, logger):
+
+def _update_ini_file_paths(output_mod_path, ini_files, matched_pairs, original_paths, logger, encodings=None, ini_origins=None):
     """2-2단계: ini 파일의 filename = 경로 수정
     (확장자가 .ib로 변경된 파일은 matched_pairs에 반영되어 있으므로
     대체 시 해당 .ib 이름으로 적용된다.)
-    """
-    logger.log("[2-2단계] ini 파일의 경로 수정 중...")
-    
-    for new_ini_filename in ini_files:
-        ini_path = os.path.join(output_mod_path, new_ini_filename)
-        
-        with open(ini_path, 'r', encoding='utf-8', errors='ignore') as f:
-            ini_content = f.read()
-        
-        for idx, original_path in enumerate(original_paths):
-            new_filename = matched_pairs[idx][1]
-
-            # 후보 패턴: 원본 경로(슬래시 변형 포함) 및 basename
-            patterns = [
-                original_path,
-                original_path.replace('/', '\\'),
-                original_path.replace('\\', '/'),
-                os.path.basename(original_path),
-            ]
-
-            for pattern in patterns:
-                # filename = 값에서 패턴을 찾을 때 값이 따옴표로 둘러싸여 있을 수 있으므로
-                # 따옴표를 포함하거나 포함하지 않는 경우 모두 매치하도록 그룹을 구성한다.
-                # 치환 시 기존 따옴표(있다면)를 보존하도록 처리한다.
-                pat = re.compile(r'(filename\s*=\s*)(["\']?%s["\']?)' % re.escape(pattern), flags=re.IGNORECASE)
-
-                def _repl(m, nf=new_filename):
-                    val = m.group(2)
-                    if len(val) >= 2 and ((val[0] == '"' and val[-1] == '"') or (val[0] == "'" and val[-1] == "'")):
-                        return m.group(1) + val[0] + nf + val[-1]
-                    return m.group(1) + nf
-
-                ini_content = pat.sub(_repl, ini_content)
-        
-        with open(ini_path, 'w', encoding='utf-8') as f:
-            f.write(ini_content)
-        
-        logger.log(f"ini 파일 경로 수정 완료: {new_ini_filename}")
-
 
-def _preprocess_assets_files(output_mod_path, matched_pairs, ini_files, ib_slots, logger):
-    """3-0단계: .assets 파일을 슬롯 유형에 맞게 확장자 교체
-
-    - IB 슬롯이면 .assets -> .ib
-    - Blend/Position/Texcoord이면 .assets -> .buf
-    주의: 이 함수는 INI 파일을 직접 수정하지 않습니다. 매칭 리스트(`matched_pairs`)의
-    파일명을 변경된 이름(basename)으로 갱신하여 반환합니다. INI 수정은 이후 단계가 담당합니다.
-    반환: 업데이트된 matched_pairs
+    filename = 줄마다 값을 한 번 읽어 조회표에서 찾는다.
+    - 원래 INI 위치(ini_origins) 기준으로 풀어 본 경로가 매칭 파일이면 그 파일
+    - 아니면 값의 표기(경로 또는 파일 이름)로 조회
+    값의 따옴표는 그대로 유지한다.
     """
-    updated = []
+    log_stage(logger, "[2-2단계] ini 파일의 경로 수정 중...")
+    encodings = encodings if encodings is not None else {}
+    ini_origins = ini_origins or ini_files
+    lookup = _build_path_lookup(matched_pairs, original_paths)
 
-    for slot_name, filename in matched_pairs:
-        if not filename or not filename.lower().endswith('.assets'):
-            updated.append((slot_name, filename))
-            continue
+    for new_ini_filename, ini_origin in zip(ini_files, ini_origins):
+        ini_path = os.path.join(output_mod_path, new_ini_filename)
 
-        base = os.path.splitext(filename)[0]
+        ini_content, encoding = _read_ini(ini_path, encodings.get(new_ini_filename))
+        encodings[new_ini_filename] = encoding
 
-        # IB 슬롯이면 .ib, 특정 서브파일이면 .buf
-        if slot_name in ib_slots:
-            new_ext = '.ib'
-        elif any(x in slot_name for x in ("Blend", "Position", "Texcoord")):
-            new_ext = '.buf'
-        else:
-            logger.log(f"    .assets 보류 (슬롯 미확인): {slot_name} -> {filename}")
-            updated.append((slot_name, filename))
-            continue
+        ini_content, changed = _rewrite_ini_paths(ini_content, output_mod_path, ini_origin, lookup)
+        _write_ini(ini_path, ini_content, encoding, logger)
 
-        new_name = f"{base}{new_ext}"
-        src = os.path.join(output_mod_path, filename)
-        dst = os.path.join(output_mod_path, new_name)
-
-        if os.path.exists(src):
-            counter = 1
-            final_dst = dst
-            final_name = new_name
-            while os.path.exists(final_dst):
-                final_name = f"{base}_{counter}{new_ext}"
-                final_dst = os.path.join(output_mod_path, final_name)
-                counter += 1
-
-            os.rename(src, final_dst)
-            logger.log(f"    .assets -> {new_ext} 교체: {filename} -> {os.path.basename(final_dst)}")
-            updated.append((slot_name, os.path.basename(final_dst)))
-        else:
-            logger.log(f"    파일 없음(.assets 처리 건너뜀): {filename}")
-            updated.append((slot_name, filename))
+        logger.log(f"ini 파일 경로 수정 완료: {new_ini_filename} ({changed}개 변경)")
 
-    return updated
 
+def _transform_ini(ini_content, rewriter, logger, report=None):
+    """4-1 ~ 4-3단계 (텍스트만)
 
-def _rename_to_temp_files(output_mod_path, matched_pairs, logger):
-    """3-1단계: 매칭할 파일명을 임시 문자열로 변경"""
-    logger.log("[3-1단계] 파일명을 임시 문자열로 변경 중...")
-    
-    # ini 수정을 위해 이동 후 파일명 저장
-    moved_filenames = [moved_filename for _, moved_filename in matched_pairs]
+    report: dict를 주면 Resource 섹션 매핑(resource_sections)과
+    삭제한 섹션(dropped_sections: [(섹션명, 이유)])을 기록
+    """
+    # 4-1단계: 매칭한 파일명/Resource 섹션명 -> 최종 이름 (한 번에 치환)
+    ini_content = rewriter.rewrite(ini_content, logger, report)
     
-    for idx, (slot_name, moved_filename) in enumerate(matched_pairs):
-        old_path = os.path.join(output_mod_path, moved_filename)
-        if os.path.exists(old_path):
-            temp_filename = f"TEMP_{uuid.uuid4().hex}{os.path.splitext(moved_filename)[1]}"
-            temp_path = os.path.join(output_mod_path, temp_filename)
-            
-            os.rename(old_path, temp_path)
-            # matched_pairs 업데이트
-            matched_pairs[idx] = (slot_name, temp_filename)
-            logger.log(f"임시 변경: {moved_filename} -> {temp_filename}")
+    # 4-2단계: 특정 구문 삭제
+    log_detail(logger, f"  4-2단계: 특정 구문 삭제 중...")
     
-    return matched_pairs, moved_filenames
-
+    # 4-2-1 ~ 4-2-4단계: 섹션 규칙(SECTION_RULES)에 걸린 섹션 삭제
+    # (CS 섹션, filename 없는 섹션, 가짜 IB, Position 서브파일)
+    dropped = report.setdefault("dropped_sections", []) if report is not None else None
+    ini_content, removed_sections = filter_sections(ini_content, logger, dropped=dropped)
 
-def _rename_to_final_files(output_mod_path, matched_pairs, logger):
-    """3-2단계: 임시 문자열을 최종 매칭된 파일명으로 변경"""
-    logger.log("[3-2단계] 임시 파일명을 최종 파일명으로 변경 중...")
+    # 삭제한 섹션 중 참조 제거 대상(filename 없음, 가짜 IB)을 가리키는 줄 제거
+    ini_content = strip_references(ini_content, removed_sections, logger)
     
-    for idx, (slot_name, temp_filename) in enumerate(matched_pairs):
-        ext = os.path.splitext(temp_filename)[1]
-        final_filename = f"{slot_name}{ext}"
-
-        temp_path = os.path.join(output_mod_path, temp_filename)
-        final_path = os.path.join(output_mod_path, final_filename)
-
-        counter = 1
-        base_name, ext = os.path.splitext(final_filename)
-        while os.path.exists(final_path):
-            final_filename = f"{base_name}_{counter}{ext}"
-            final_path = os.path.join(output_mod_path, final_filename)
-            counter += 1
-        
-        os.rename(temp_path, final_path)
-        # matched_pairs 업데이트
-        matched_pairs[idx] = (slot_name, final_filename)
-        logger.log(f"최종 변경: {temp_filename} -> {final_filename}")
+    # 4-3단계: 특정 구문 처리
+    log_detail(logger, f"  4-3단계: 특정 구문 처리 중...")
     
-    return matched_pairs
+    # 4-3-1, 4-3-3단계: 조건식의 !=, >=, <= 를 각각
+    # (A > B || A < B), (A > B || A == B), (A < B || A == B) 형태로 교체
+    ini_content, _ = rewrite_conditions(ini_content, logger)
 
+    # 4-3-2단계: 'key = ' 로 시작하는 줄에서 값 내부의 '=' 문자를 '+'로 교체
+    ini_content = _replace_key_equals_in_value(ini_content, logger)
+    return ini_content
 
-def _step_4_1_1_prepare_and_tempize(ini_content, matched_pairs, moved_filenames, logger):
-    """4-1-1단계: 매칭한 파일명을 임시 문자열로 바꾸고
-    Resource 섹션과의 매칭을 수집하여 Resource 헤더용 임시 토큰을 생성한다.
-    반환: (ini_content, temp_strings, resource_section_mappings, resource_temp_tokens)
-    """
-    temp_strings = {}
 
-    # 섹션 범위 파싱: 섹션명과 시작/끝 라인 인덱스 수집
-    lines = ini_content.split('\n')
-    sections = []  # list of (section_name, start_idx, end_idx)
-    current_name = None
-    current_start = None
-    for i, line in enumerate(lines):
-        s = line.strip()
-        if s.startswith('[') and s.endswith(']'):
-            if current_name is not None:
-                sections.append((current_name, current_start, i))
-            current_name = s[1:-1].strip()
-            current_start = i + 1
-    if current_name is not None:
-        sections.append((current_name, current_start, len(lines)))
-
-    # Resource 섹션명 -> 최종 Resource명 매핑 수집
-    resource_section_mappings = {}  # original_section_name -> Resource{final_name_no_ext}
-    for idx, (slot_name, final_filename) in enumerate(matched_pairs):
-        moved_filename = moved_filenames[idx]
-        moved_name_no_ext = os.path.splitext(moved_filename)[0]
-        final_name_no_ext = os.path.splitext(final_filename)[0]
-
-        # 섹션 내부에 moved_name_no_ext가 있으면 그 섹션이 Resource로 시작하는지 확인
-        for sec_name, start, end in sections:
-            if not sec_name.startswith('Resource'):
-                continue
-            # 섹션 내부의 filename= 라인만 검사하여 정확히 매칭 (부분 문자열 매칭 방지)
-            section_lines = lines[start:end]
-            for ln in section_lines:
-                m = re.match(r'(?i)\s*filename\s*=\s*(.*)', ln)
-                if not m:
-                    continue
-                val = m.group(1).strip()
-                if (val.startswith('"') and val.endswith('"')) or (val.startswith("'") and val.endswith("'")):
-                    val = val[1:-1]
-                base_name = os.path.splitext(os.path.basename(val))[0]
-                if base_name == moved_name_no_ext:
-                    # final_filename의 확장자가 .ib이면 섹션명 끝에 'IB'를 붙인다
-                    _, final_ext = os.path.splitext(final_filename)
-                    if final_ext.lower() == '.ib':
-                        resource_name = f"Resource{final_name_no_ext}IB"
-                    else:
-                        resource_name = f"Resource{final_name_no_ext}"
-                    resource_section_mappings[sec_name] = resource_name
-                    logger.log(f"    Resource 섹션 매핑 발견: {sec_name} -> {resource_name} (filename={val})")
-                    break
-
-    # 중복 최종 Resource명을 가진 원본 섹션들이 있을 수 있으므로 중복 처리
-    # final_resource -> [orig_sec1, orig_sec2, ...]
-    final_to_orig = {}
-    for orig_sec, final_res in resource_section_mappings.items():
-        final_to_orig.setdefault(final_res, []).append(orig_sec)
-
-    # 중복된 경우 두번째 이후 섹션은 제거 대상으로 표시 (참조는 첫 번째로 통일)
-    resource_sections_to_drop = []
-    for final_res, orig_list in final_to_orig.items():
-        if len(orig_list) > 1:
-            # keep first, drop others
-            to_drop = orig_list[1:]
-            resource_sections_to_drop.extend(to_drop)
-            logger.log(f"    중복 Resource 발견: {final_res} <- {orig_list} (추가 섹션 제거 예정: {to_drop})")
-
-    # Resource 섹션 헤더를 임시 토큰으로 교체하기 위한 맵 생성
-    resource_temp_tokens = {}
-    for orig_sec in resource_section_mappings.keys():
-        resource_temp_tokens[orig_sec] = f"TEMP_RESOURCE_{uuid.uuid4().hex}"
-
-    # Resource 헤더들을 먼저 임시 토큰으로 교체 (헤더 라인만 교체)
-    if resource_temp_tokens:
-        for orig_sec, temp_token in resource_temp_tokens.items():
-            # 문자열 단순 교체로 변경
-            ini_content = ini_content.replace(f'[{orig_sec}]', f'[{temp_token}]')
-            logger.log(f"    Resource 헤더 임시화: {orig_sec} -> {temp_token}")
-
-            # 또한 ini 전체에서 'key = value' 형태에서 value로 orig_sec가 사용된 경우
-            # 임시 토큰으로 바꿔 둔다. 따옴표가 있을 경우 보존한다.
-            val_pat = re.compile(r'(^\s*[^=\n]+\s*=\s*)(["\']?)%s(\2)(?=\s*$)' % re.escape(orig_sec), flags=re.IGNORECASE | re.MULTILINE)
-
-            def _val_repl(m, tt=temp_token):
-                quote = m.group(2) or ''
-                return m.group(1) + quote + tt + quote
-
-            ini_content = val_pat.sub(_val_repl, ini_content)
-            logger.log(f"    Resource 참조(값) 임시화 적용: {orig_sec} -> {temp_token}")
-
-    # 이제 파일명(확장자 없는 형태)을 임시 문자열로 교체
-    for idx, (slot_name, final_filename) in enumerate(matched_pairs):
-        moved_filename = moved_filenames[idx]
-        moved_name_no_ext = os.path.splitext(moved_filename)[0]
-        final_name_no_ext = os.path.splitext(final_filename)[0]
-
-        temp_str = f"TEMP_INI_{uuid.uuid4().hex}"
-        temp_strings[temp_str] = final_name_no_ext
-
-        logger.log(f"    임시 교체: {moved_name_no_ext} -> {temp_str}")
-        ini_content = ini_content.replace(moved_name_no_ext, temp_str)
-
-    return ini_content, temp_strings, resource_section_mappings, resource_temp_tokens, resource_sections_to_drop
-
-
-def _step_4_1_2_apply_final_replacements(ini_content, temp_strings, resource_section_mappings, resource_temp_tokens, resource_sections_to_drop, logger):
-    """4-1-2단계: 임시 문자열을 최종 파일명으로 교체하고
-    Resource 헤더용 임시 토큰을 최종 Resource명으로 교체한다.
-    반환: ini_content
-    """
-    # 임시 문자열 -> 최종 파일명으로 교체
-    for temp_str, final_name_no_ext in temp_strings.items():
-        logger.log(f"    최종 교체: {temp_str} -> {final_name_no_ext}")
-        ini_content = ini_content.replace(temp_str, final_name_no_ext)
-
-    # Resource 토큰이 있으면 임시 토큰 -> 최종 Resource명으로 교체
-    if resource_section_mappings and resource_section_mappings.keys():
-        for orig_sec, temp_token in resource_temp_tokens.items():
-            final_resource = resource_section_mappings.get(orig_sec)
-            if not final_resource:
-                continue
-
-            # 만약 이 orig_sec가 제거 대상이면 섹션 전체를 삭제하고
-            # 섹션 참조(값)에 대해서는 final_resource로 치환한다.
-            if orig_sec in (resource_sections_to_drop or []):
-                # remove section range for the temp token
-                pattern = rf'\[{re.escape(temp_token)}\].*?(?=\n\[|\Z)'
-                ini_content = re.sub(pattern, '', ini_content, flags=re.DOTALL)
-                logger.log(f"    중복된 섹션 제거 (임시토큰): {orig_sec} -> 제거됨")
-
-                # 값(참조)으로 사용된 경우에는 final_resource로 치환 (따옴표 보존)
-                val_pat = re.compile(r'(["\']?)%s(\1)' % re.escape(temp_token))
-
-                def _val_repl_drop(m, fr=final_resource):
-                    quote = m.group(1) or ''
-                    return quote + fr + quote
-
-                ini_content = val_pat.sub(_val_repl_drop, ini_content)
-                logger.log(f"    중복 Resource 참조 치환: {temp_token} -> {final_resource}")
-                continue
-
-            # 정상적인 경우: 헤더 토큰을 최종 Resource명으로 바꿈
-            ini_content = ini_content.replace(f'[{temp_token}]', f'[{final_resource}]')
-            logger.log(f"    Resource명 변경: {orig_sec} -> {final_resource}")
-
-            # value로 사용되던 temp_token도 final_resource로 치환 (따옴표 보존)
-            val_pat = re.compile(r'(["\']?)%s(\1)' % re.escape(temp_token))
-
-            def _val_repl2(m, fr=final_resource):
-                quote = m.group(1) or ''
-                return quote + fr + quote
-
-            ini_content = val_pat.sub(_val_repl2, ini_content)
-            logger.log(f"    Resource 참조(값) 치환: {temp_token} -> {final_resource}")
+class _BufferedLogger:
+    """작업 프로세스의 로그를 (레벨, 메시지)로 모아 두었다가 INI 순서대로 한꺼번에 출력"""
 
-    return ini_content
+    def __init__(self):
+        self.lines = []
 
+    def log(self, msg, level=INFO):
+        self.lines.append((level, msg))
 
-def _update_ini_file_contents(output_mod_path, ini_files, matched_pairs, moved_filenames, logger):
-    """4단계: ini 파일 내용 변경"""
-    logger.log("[4단계] ini 파일 내용 변경 중...")
-    
-    for new_ini_filename in ini_files:
-        ini_path = os.path.join(output_mod_path, new_ini_filename)
-        
-        logger.log(f"  처리 중: {new_ini_filename}")
-        with open(ini_path, 'r', encoding='utf-8', errors='ignore') as f:
-            ini_content = f.read()
-        
-        # 4-1-1단계: 매칭한 문자열 -> 임시 문자열로 교체
-        ini_content, temp_strings, resource_section_mappings, resource_temp_tokens, resource_sections_to_drop = _step_4_1_1_prepare_and_tempize(
-            ini_content, matched_pairs, moved_filenames, logger
-        )
-
-        # 4-1-2단계: 임시 문자열 -> 최종 문자열로 교체
-        ini_content = _step_4_1_2_apply_final_replacements(
-            ini_content, temp_strings, resource_section_mappings, resource_temp_tokens, resource_sections_to_drop, logger
-        )
-        
-        # 4-2단계: 특정 구문 삭제
-        logger.log(f"  4-2단계: 특정 구문 삭제 중...")
-        
-        # 4-2-1단계: Resource로 시작하고 CS로 끝나는 섹션 삭제 (붕스 대응)
-        ini_content = _remove_resource_cs_sections(ini_content, logger)
-        
-        # 4-2-2단계: Resource로 시작하는데 filename=이 없는 섹션 삭제 및 참조 제거 (copy vb 대응)
-        ini_content = _remove_resource_sections_without_filename(ini_content, logger)
-        
-        # 4-2-3단계: Resource로 시작하고 format=이 있지만 filename 확장자가 .ib가 아닌 섹션 삭제 및 참조 제거
-        ini_content = _remove_resource_sections_fake_ib_file(ini_content, logger)
-        
-        # 4-2-4단계: Position의 서브파일들(예: Position.Boobs.buf)인 경우 섹션 삭제 (slider 모드 대응)
-        ini_content = _remove_resource_sections_position_subfiles(ini_content, logger)
-        
-        # 4-3단계: 특정 구문 처리
-        logger.log(f"  4-3단계: 특정 구문 처리 중...")
-        
-        # 4-3-1단계: != 조건문을 (A > B || A < B) 형태로 교체
-        ini_content = _replace_not_equal_conditions(ini_content, logger)
+    def detail(self, msg):
+        self.lines.append((DETAIL, msg))
 
-        # 4-3-2단계: 'key = ' 로 시작하는 줄에서 값 내부의 '=' 문자를 '+'로 교체
-        ini_content = _replace_key_equals_in_value(ini_content, logger)
 
-        # 4-3-3단계: >=, <= 조건문을 각각 (A > B || A == B), (A < B || A == B) 형태로 교체
-        ini_content = _replace_ge_le_conditions(ini_content, logger)
+# 작업 프로세스마다 한 번 만드는 IniRewriter (_init_transform_worker)
+_worker_rewriter = None
 
-        with open(ini_path, 'w', encoding='utf-8') as f:
-            f.write(ini_content)
-        
-        logger.log(f"  완료: {new_ini_filename}")
 
+def _init_transform_worker(matched_pairs, moved_filenames):
+    global _worker_rewriter
+    _worker_rewriter = IniRewriter(matched_pairs, moved_filenames)
 
-def _remove_resource_cs_sections(ini_content, logger):
-    """4-2-1단계: Resource로 시작하고 CS로 끝나는 섹션 삭제"""
-    sections_to_remove = []
-    lines = ini_content.split('\n')
-    
-    for i, line in enumerate(lines):
-        line_stripped = line.strip()
-        if line_stripped.startswith('[') and line_stripped.endswith(']'):
-            section_name = line_stripped[1:-1].strip()
-            if section_name.startswith('Resource') and section_name.endswith('CS'):
-                sections_to_remove.append(section_name)
-                logger.log(f"    삭제할 섹션 발견: {section_name}")
-    
-    # 섹션 삭제
-    for section_name in sections_to_remove:
-        pattern = rf'\[{re.escape(section_name)}\].*?(?=\n\[|\Z)'
-        ini_content = re.sub(pattern, '', ini_content, flags=re.DOTALL)
-    
-    return ini_content
 
+def _transform_ini_job(ini_content):
+    """작업 프로세스: 4-1 ~ 4-3단계 -> (텍스트, 로그 줄, report)"""
+    buffer = _BufferedLogger()
+    report = {}
+    ini_content = _transform_ini(ini_content, _worker_rewriter, buffer, report)
+    return ini_content, buffer.lines, report
 
-def _replace_not_equal_conditions(ini_content, logger):
-    """4-3-1단계: != 조건문을 (A > B || A < B) 형태로 교체"""
-    # A != B 패턴 찾기 (양쪽에 공백이 있을 수 있음)
-    # 패턴: 단어/숫자/변수 != 단어/숫자/변수
-    pattern = r'(\S+)\s*!=\s*(\S+)'
-    
-    def replace_func(match):
-        left = match.group(1)
-        right = match.group(2)
-        replacement = f"({left} > {right} || {left} < {right})"
-        logger.log(f"    교체: {match.group(0)} -> {replacement}")
-        return replacement
-    
-    original_content = ini_content
-    ini_content = re.sub(pattern, replace_func, ini_content)
-    
-    replaced_count = len(re.findall(pattern, original_content))
-    if replaced_count > 0:
-        logger.log(f"    != 조건문 {replaced_count}개 교체 완료")
-    
-    return ini_content
 
+def _transform_workers(workers, count):
+    """실제 작업 프로세스 수 (workers가 0/None이면 CPU 수, INI가 적으면 1)"""
+    if not workers:
+        workers = os.cpu_count() or 1
+    if count < PARALLEL_MIN_INIS:
+        return 1
+    return max(1, min(workers, count))
 
-def _replace_ge_le_conditions(ini_content, logger):
-    """4-3-3단계: >=, <= 조건문을 각각
-    (A > B || A == B), (A < B || A == B) 형태로 교체"""
-    # 원본 내용 보관
-    original_content = ini_content
 
-    # >= 패턴 처리
-    pattern_ge = r'(\S+)\s*>=\s*(\S+)'
+def _transform_inis(ini_jobs, matched_pairs, moved_filenames, logger, workers=1):
+    """여러 INI의 4-1 ~ 4-3단계 -> [(텍스트, report)] (ini_jobs 순서)
 
-    def _repl_ge(m):
-        left = m.group(1)
-        right = m.group(2)
-        replacement = f"({left} > {right} || {left} == {right})"
-        logger.log(f"    교체: {m.group(0)} -> {replacement}")
-        return replacement
+    ini_jobs: [(INI 이름, 텍스트)]
+    workers > 1이면 프로세스 풀에서 INI별로 나눠 변환하고, 각 INI의 로그는 모아 두었다가
+    INI 순서대로 출력한다 (결과와 로그 순서는 순차 처리와 같음).
+    프로세스 풀을 쓸 수 없으면 순차 처리로 대신한다.
+    """
+    workers = _transform_workers(workers, len(ini_jobs))
+    if workers > 1:
+        try:
+            results = []
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_transform_worker,
+                initargs=(matched_pairs, moved_filenames),
+            ) as pool:
+                logger.log(f"  INI {len(ini_jobs)}개를 프로세스 {workers}개로 변환")
+                texts = [ini_content for _, ini_content in ini_jobs]
+                for (ini_name, _), (ini_content, lines, report) in zip(ini_jobs, pool.map(_transform_ini_job, texts)):
+                    logger.log(f"  처리 중: {ini_name}")
+                    for level, line in lines:
+                        if level == DETAIL:
+                            log_detail(logger, line)
+                        else:
+                            logger.log(line)
+                    results.append((ini_content, report))
+            return results
+        except (OSError, BrokenProcessPool) as e:
+            logger.log(f"  병렬 변환을 쓸 수 없어 순차 처리: {e}")
 
-    ini_content = re.sub(pattern_ge, _repl_ge, ini_content)
-    ge_count = len(re.findall(pattern_ge, original_content))
-    if ge_count > 0:
-        logger.log(f"    >= 조건문 {ge_count}개 교체 완료")
+    rewriter = IniRewriter(matched_pairs, moved_filenames)
+    results = []
+    for ini_name, ini_content in ini_jobs:
+        logger.log(f"  처리 중: {ini_name}")
+        report = {}
+        results.append((_transform_ini(ini_content, rewriter, logger, report), report))
+    return results
 
-    # <= 패턴 처리 (>= 치환 후의 내용에서 검사)
-    original_after_ge = ini_content
-    pattern_le = r'(\S+)\s*<=\s*(\S+)'
 
-    def _repl_le(m):
-        left = m.group(1)
-        right = m.group(2)
-        replacement = f"({left} < {right} || {left} == {right})"
-        logger.log(f"    교체: {m.group(0)} -> {replacement}")
-        return replacement
+def _update_ini_file_contents(output_mod_path, ini_files, matched_pairs, moved_filenames, logger, encodings=None, workers=1):
+    """4단계: ini 파일 내용 변경
 
-    ini_content = re.sub(pattern_le, _repl_le, ini_content)
-    le_count = len(re.findall(pattern_le, original_after_ge))
-    if le_count > 0:
-        logger.log(f"    <= 조건문 {le_count}개 교체 완료")
+    workers: INI 변환 프로세스 수 (1이면 순차, 0이면 CPU 수, _transform_inis 참고)
+    """
+    log_stage(logger, "[4단계] ini 파일 내용 변경 중...")
+    encodings = encodings or {}
 
-    return ini_content
+    ini_jobs = []
+    ini_encodings = []
+    for new_ini_filename in ini_files:
+        ini_path = os.path.join(output_mod_path, new_ini_filename)
+        ini_content, encoding = _read_ini(ini_path, encodings.get(new_ini_filename))
+        ini_jobs.append((new_ini_filename, ini_content))
+        ini_encodings.append(encoding)
+
+    results = _transform_inis(ini_jobs, matched_pairs, moved_filenames, logger, workers)
+    for (new_ini_filename, _), encoding, (ini_content, _) in zip(ini_jobs, ini_encodings, results):
+        _write_ini(os.path.join(output_mod_path, new_ini_filename), ini_content, encoding, logger)
+        logger.log(f"  완료: {new_ini_filename}")
 
 
 def _replace_key_equals_in_value(ini_content, logger):
     """4-3-2단계: 'key =' 로 시작하는 줄에서 값 내부의 '=' 문자를 '+'로 교체"""
-    logger.log("  4-3-2단계: key 값 내부의 '=' -> '+' 변경 검사 중...")
+    log_detail(logger, "  4-3-2단계: key 값 내부의 '=' -> '+' 변경 검사 중...")
 
     pattern = re.compile(r'(^\s*key\s*=\s*)(.*)$', flags=re.IGNORECASE | re.MULTILINE)
 
@@ -616,7 +370,7 @@ def _replace_key_equals_in_value(ini_content, logger):
         val = m.group(2)
         if '=' in val:
             new_val = val.replace('=', '+')
-            logger.log(f"    key 라인 값 변경: {val} -> {new_val}")
+            log_detail(logger, f"    key 라인 값 변경: {val} -> {new_val}")
             return prefix + new_val
         return m.group(0)
 
@@ -624,217 +378,318 @@ def _replace_key_equals_in_value(ini_content, logger):
     return new_content
 
 
-def _remove_resource_sections_without_filename(ini_content, logger):
-    """4-2-2단계: Resource로 시작하는데 filename=이 없는 섹션 삭제 및 참조 제거"""
-    sections_to_remove = []
-    lines = ini_content.split('\n')
-    
-    i = 0
-    while i < len(lines):
-        line_stripped = lines[i].strip()
-        
-        # 섹션 시작 찾기
-        if line_stripped.startswith('[') and line_stripped.endswith(']'):
-            section_name = line_stripped[1:-1].strip()
-            
-            if section_name.startswith('Resource'):
-                # 다음 섹션까지 확인
-                j = i + 1
-                has_filename = False
-                
-                while j < len(lines):
-                    next_line = lines[j].strip()
-                    
-                    # 다음 섹션 시작
-                    if next_line.startswith('[') and next_line.endswith(']'):
-                        break
-                    
-                    # filename= 구문 확인
-                    if next_line.lower().startswith('filename'):
-                        has_filename = True
-                        break
-                    
-                    j += 1
-                
-                if not has_filename:
-                    sections_to_remove.append(section_name)
-                    logger.log(f"    filename 없는 섹션 발견: {section_name}")
-        
-        i += 1
-    
-    # 섹션 삭제
-    for section_name in sections_to_remove:
-        pattern = rf'\[{re.escape(section_name)}\].*?(?=\n\[|\Z)'
-        ini_content = re.sub(pattern, '', ini_content, flags=re.DOTALL)
-    
-    # 참조 제거 (해당 섹션 이름을 포함하는 줄 삭제)
-    for section_name in sections_to_remove:
-        lines = ini_content.split('\n')
-        filtered_lines = []
-        
-        for line in lines:
-            # 섹션 헤더가 아니면서 섹션 이름을 포함하는 줄 제거
-            line_stripped = line.strip()
-            if not (line_stripped.startswith('[') and line_stripped.endswith(']')):
-                if section_name in line:
-                    logger.log(f"    참조 제거: {line.strip()}")
-                    continue
-            
-            filtered_lines.append(line)
-        
-        ini_content = '\n'.join(filtered_lines)
-    
-    return ini_content
+def _matcher_scan(matcher, mod_folder_path):
+    """매처가 같은 모드 폴더를 불러온 상태면 그 스캔 결과와 INI 텍스트 -> (ScanResult, {경로: 텍스트})"""
+    mod_root = getattr(matcher, "mod_root", None)
+    if not mod_root or path_key(os.path.abspath(mod_root)) != path_key(os.path.abspath(mod_folder_path)):
+        return None, {}
+    scan = ScanResult(
+        files=list(matcher.mod_files),
+        buckets=matcher.mod_buckets,
+        stats=matcher.mod_stats,
+        manifest=matcher.mod_manifest or {},
+    )
+    return scan, dict(matcher.ini_contents)
 
 
-def _remove_resource_sections_fake_ib_file(ini_content, logger):
-    """4-2-3단계: Resource로 시작하고 format=이 있지만 filename=의 확장자가 .ib가 아닌 섹션 삭제"""
-    lines = ini_content.split('\n')
-    to_remove_ranges = []  # list of (start_idx, end_idx)
-    sections_to_remove = []
-
-    i = 0
-    while i < len(lines):
-        line_stripped = lines[i].strip()
-        if line_stripped.startswith('[') and line_stripped.endswith(']'):
-            section_name = line_stripped[1:-1].strip()
-            if section_name.startswith('Resource'):
-                # find next section start
-                j = i + 1
-                has_format = False
-                filename_value = None
-
-                while j < len(lines):
-                    next_line = lines[j].strip()
-                    if next_line.startswith('[') and next_line.endswith(']'):
-                        break
-
-                    # check format=
-                    if re.match(r'(?i)format\s*=\s*', next_line):
-                        has_format = True
-
-                    # check filename=
-                    m = re.match(r'(?i)filename\s*=\s*(.*)', next_line)
-                    if m:
-                        val = m.group(1).strip()
-                        # remove surrounding quotes if any
-                        if (val.startswith('"') and val.endswith('"')) or (val.startswith("'") and val.endswith("'")):
-                            val = val[1:-1]
-                        filename_value = val
-                        # keep scanning to get format presence too
-
-                    j += 1
-
-                # if format exists and filename present but ext != .ib -> remove
-                if has_format and filename_value:
-                    _, ext = os.path.splitext(filename_value)
-                    if ext.lower() != '.ib':
-                        to_remove_ranges.append((i, j))
-                        sections_to_remove.append(section_name)
-                        logger.log(f"    format 있으나 .ib 아님으로 삭제 대상: {section_name} (filename={filename_value})")
-
-                i = j
-                continue
-
-        i += 1
-
-    if not to_remove_ranges:
-        return ini_content
-
-    # remove section ranges
-    remove_idx = set()
-    for start, end in to_remove_ranges:
-        for k in range(start, end):
-            remove_idx.add(k)
-
-    filtered_lines = [ln for idx, ln in enumerate(lines) if idx not in remove_idx]
-
-    ini_content = '\n'.join(filtered_lines)
-
-    # 참조 제거 (해당 섹션 이름을 포함하는 줄 삭제, 섹션 헤더는 이미 제거됨)
-    if sections_to_remove:
-        lines = ini_content.split('\n')
-        final_lines = []
-        for line in lines:
-            line_stripped = line.strip()
-            # 섹션 헤더가 아니고, 섹션 이름을 포함하면 제거
-            if not (line_stripped.startswith('[') and line_stripped.endswith(']')):
-                skip = False
-                for sec in sections_to_remove:
-                    if sec in line:
-                        logger.log(f"    참조 제거: {line_stripped}")
-                        skip = True
-                        break
-                if skip:
-                    continue
-            final_lines.append(line)
-
-        ini_content = '\n'.join(final_lines)
+_STAGING_RESULTS = {"copy": "copied", "link": "linked", "skip": "skipped"}
 
-    return ini_content
 
+def _plan_export(
+    asset_folder_path,
+    mod_folder_path,
+    component_slot_panel,
+    output_root,
+    logger,
+    ini_encodings,
+    staging_mode,
+    staging_rules,
+    workers=1,
+    from_disk=False,
+):
+    """디스크에 쓰지 않고 내보내기 결과를 계산 (미리보기와 증분 내보내기가 함께 사용)
+
+    INI 텍스트는 매처가 읽어 둔 것을 쓰고, 없는 INI만 원본 모드 폴더에서 읽는다.
+    from_disk: 매처가 불러온 뒤 바뀐 파일도 반영하도록 모드 폴더를 다시 스캔하고
+      모든 INI를 디스크에서 읽음 (실제로 쓰는 증분 내보내기용, 매처의 manifest만 재사용)
+    """
+    matcher = getattr(getattr(component_slot_panel, "controller", None), "matcher", None)
+    matched_pairs, ib_slots = _collect_matched_pairs(asset_folder_path, component_slot_panel, logger)
 
-def _remove_resource_sections_position_subfiles(ini_content, logger):
-    """4-2-4단계: Resource의 filename이 Position의 서브파일일 경우 섹션 삭제
+    mod_folder_name = os.path.basename(os.path.normpath(mod_folder_path))
+    output_mod_path = os.path.join(output_root, mod_folder_name)
 
-    목적: slider 모드 대응
-    - filename 값의 basename이 'Position.xxx' 형태(예: Position.Boobs, Position.Butt)를 가질
-      경우 해당 Resource 섹션 전체만 삭제한다. (참조 제거는 수행하지 않음)
+    # 1단계: 복사할 파일
+    require_folder(mod_folder_path)
+    scan, ini_texts = _matcher_scan(matcher, mod_folder_path)
+    if from_disk:
+        scan = scan_directory(mod_folder_path, scan.manifest if scan is not None else None)
+        ini_texts = {}
+    elif scan is None:
+        scan = scan_directory(mod_folder_path)
+    source_encodings = dict(ini_encodings or {})
+    for ini_rel in scan.buckets.get("ini", []):
+        if ini_rel not in ini_texts:
+            ini_texts[ini_rel], source_encodings[ini_rel] = _read_ini(
+                os.path.join(mod_folder_path, ini_rel), source_encodings.get(ini_rel)
+            )
+    if staging_mode == "referenced":
+        required = [matched_file for _, matched_file in matched_pairs]
+        scan, actions = plan_staging(mod_folder_path, required, staging_rules, scan, ini_texts)
+    else:
+        actions = {rel_path: "copy" for rel_path in scan.files}
+    report = StagingReport()
+    for rel_path in scan.files:
+        report.add(_STAGING_RESULTS[actions[rel_path]], scan.stats.get(rel_path, (0, 0))[0])
+    logger.log(f"    복사 계획: {report.summary()}")
+
+    # 2-1 ~ 3-2단계: 복사될 파일 목록 위에서 이동/이름 변경 계산
+    staged = [rel_path for rel_path in scan.files if actions[rel_path] != "skip"]
+    view = DirectoryView(staged, scan.manifest.get("dirs", {}))
+    plan = plan_renames(output_mod_path, matched_pairs, ib_slots, logger, view=view)
+
+    # 2-2, 4단계: INI 텍스트 변환
+    moved_pairs = [(slot_name, moved) for (slot_name, _), moved in zip(matched_pairs, plan.moved_filenames)]
+    lookup = _build_path_lookup(moved_pairs, plan.original_paths)
+    result = {
+        "output_mod_path": output_mod_path,
+        "staging": actions,
+        "staging_report": report,
+        "renames": [(move.src, move.dst, move.copy) for move in plan.moves],
+        "matched_pairs": plan.matched_pairs,
+        "resource_sections": {},
+        "dropped_sections": {},
+        "inis": {},
+        "encodings": _ini_encodings_for(plan.ini_files, plan.ini_origins, source_encodings),
+        "diffs": {},
+    }
+    ini_jobs = [
+        (new_ini_filename, _rewrite_ini_paths(ini_texts[ini_origin], output_mod_path, ini_origin, lookup)[0])
+        for new_ini_filename, ini_origin in zip(plan.ini_files, plan.ini_origins)
+    ]
+    transformed = _transform_inis(ini_jobs, plan.matched_pairs, plan.moved_filenames, logger, workers)
+    for new_ini_filename, ini_origin, (ini_content, ini_report) in zip(plan.ini_files, plan.ini_origins, transformed):
+        original = ini_texts[ini_origin]
+        result["inis"][new_ini_filename] = ini_content
+        result["diffs"][new_ini_filename] = "".join(difflib.unified_diff(
+            original.splitlines(True),
+            ini_content.splitlines(True),
+            f"a/{ini_origin}",
+            f"b/{new_ini_filename}",
+        ))
+        result["resource_sections"][new_ini_filename] = ini_report.get("resource_sections", {})
+        result["dropped_sections"][new_ini_filename] = ini_report.get("dropped_sections", [])
+
+    return result
+
+
+def _preview_export(*args):
+    """generate_ini(dry_run=True): 파일을 만들거나 바꾸지 않고 _plan_export 결과만 돌려줌"""
+    logger = args[4]
+    log_stage(logger, "[미리보기] 파일을 만들거나 바꾸지 않고 내보내기 계획 계산 중...")
+    result = _plan_export(*args)
+    logger.log(
+        f"[미리보기] 완료: 이름 변경 {len(result['renames'])}개, INI {len(result['inis'])}개 "
+        f"(출력 경로: {result['output_mod_path']})"
+    )
+    return result
+
+
+def preview_lines(plan):
+    """generate_ini(dry_run=True) 결과 -> 표시할 줄 목록 (복사 요약, 이름 변경, INI별 삭제 섹션 수와 diff)"""
+    lines = [f"[미리보기] 복사: {plan['staging_report'].summary()}"]
+    for src, dst, is_copy in plan["renames"]:
+        lines.append(f"  {'복사' if is_copy else '이름 변경'}: {src} -> {dst}")
+    for ini_name, diff in plan["diffs"].items():
+        lines.append(f"  {ini_name}: 삭제 섹션 {len(plan['dropped_sections'].get(ini_name, []))}개")
+        lines.extend(f"    {line}" for line in diff.splitlines())
+    return lines
+
+
+def _incremental_options(asset_folder_path, mod_folder_path, staging_mode, staging_rules, staging_hardlinks):
+    """이 값 중 하나라도 지난 내보내기와 다르면 출력 폴더를 처음부터 다시 만든다"""
+    return {
+        "asset_folder": os.path.abspath(asset_folder_path),
+        "mod_folder": os.path.abspath(mod_folder_path),
+        "staging_mode": staging_mode,
+        "staging_rules": None if staging_rules is None else [list(rule) for rule in staging_rules],
+        "staging_hardlinks": bool(staging_hardlinks),
+    }
+
+
+def _export_incremental(
+    asset_folder_path,
+    mod_folder_path,
+    component_slot_panel,
+    output_root,
+    logger,
+    ini_encodings,
+    staging_mode,
+    staging_rules,
+    staging_hardlinks,
+    workers=1,
+):
+    """generate_ini(incremental=True): 결과를 메모리에서 계산한 뒤 지난 출력과 다른 파일만 반영
+
+    - 원본과 출력이 지난 내보내기 그대로인 파일은 두고, 나머지만 다시 스테이징
+    - 더 이상 나오지 않는 파일은 출력 폴더에서 삭제
+    - INI는 내용이 바뀌었거나 출력 파일이 손댄 흔적이 있을 때만 다시 씀
     """
-    lines = ini_content.split('\n')
-    to_remove_ranges = []  # list of (start_idx, end_idx)
-
-    i = 0
-    while i < len(lines):
-        line_stripped = lines[i].strip()
-        if line_stripped.startswith('[') and line_stripped.endswith(']'):
-            section_name = line_stripped[1:-1].strip()
-            if section_name.startswith('Resource'):
-                # scan until next section
-                j = i + 1
-                filename_value = None
-
-                while j < len(lines):
-                    next_line = lines[j].strip()
-                    if next_line.startswith('[') and next_line.endswith(']'):
-                        break
-
-                    # filename=을 찾더라도 섹션의 끝까지 계속 스캔한다.
-                    # (기존에는 filename을 찾으면 그 자리에서 멈춰 섹션의 나머지 라인이 남아버리는 문제가 있었음)
-                    m = re.match(r'(?i)filename\s*=\s*(.*)', next_line)
-                    if m:
-                        val = m.group(1).strip()
-                        if (val.startswith('"') and val.endswith('"')) or (val.startswith("'") and val.endswith("'")):
-                            val = val[1:-1]
-                        filename_value = val
-
-                    j += 1
-
-                if filename_value:
-                    base = os.path.splitext(os.path.basename(filename_value))[0]
-                    base_l = base.lower()
-                    if re.search(r'position\.', base_l) and not base_l.endswith('position'):
-                        to_remove_ranges.append((i, j))
-                        logger.log(f"    Position 서브파일로 인해 삭제 대상: {section_name} (filename={filename_value}, base={base})")
-
-                i = j
-                continue
-
-        i += 1
-
-    if not to_remove_ranges:
-        return ini_content
-
-    # 섹션 삭제
-    remove_idx = set()
-    for start, end in to_remove_ranges:
-        for k in range(start, end):
-            remove_idx.add(k)
-
-    filtered_lines = [ln for idx, ln in enumerate(lines) if idx not in remove_idx]
-    ini_content = '\n'.join(filtered_lines)
+    log_stage(logger, "[증분] 원본 모드 폴더를 다시 읽어 내보내기 결과 계산 중...")
+    plan = _plan_export(
+        asset_folder_path,
+        mod_folder_path,
+        component_slot_panel,
+        output_root,
+        logger,
+        ini_encodings,
+        staging_mode,
+        staging_rules,
+        workers,
+        from_disk=True,
+    )
+    output_mod_path = plan["output_mod_path"]
+    mod_folder_name = os.path.basename(os.path.normpath(mod_folder_path))
+    options = _incremental_options(asset_folder_path, mod_folder_path, staging_mode, staging_rules, staging_hardlinks)
+
+    log_stage(logger, "[증분] 지난 내보내기와 비교하여 바뀐 파일만 반영 중...")
+    previous = load_manifest(output_root, mod_folder_name, options)
+    if previous is None:
+        if os.path.exists(output_mod_path):
+            logger.log("    지난 내보내기 목록이 없거나 설정이 달라 출력 폴더를 새로 만듭니다.")
+            shutil.rmtree(output_mod_path)
+        previous = {}
+    os.makedirs(output_mod_path, exist_ok=True)
+    prev_files = previous.get("files", {})
+    prev_inis = previous.get("inis", {})
+    prev_slots = dict(previous.get("slots", []))
+    changed_slots = sum(1 for slot, value in plan["matched_pairs"] if prev_slots.get(slot) != value)
+
+    # 출력 파일 -> (원본 모드 기준 경로, 스테이징 동작)
+    renamed = {path_key(src): dst for src, dst, copy in plan["renames"] if not copy}
+    desired = {}
+    for rel_path, action in plan["staging"].items():
+        if action == "skip" or bucket_of(rel_path) == "ini":
+            continue
+        desired[renamed.get(path_key(rel_path), rel_path).replace("\\", "/")] = (rel_path, action)
+    for src, dst, copy in plan["renames"]:
+        if copy:
+            desired[dst] = (src, plan["staging"].get(src, "copy"))
+    keep_keys = {path_key(rel_path) for rel_path in desired} | {path_key(name) for name in plan["inis"]}
+
+    # 더 이상 나오지 않는 파일 삭제
+    deleted = 0
+    for root, _, files in os.walk(output_mod_path):
+        for name in files:
+            rel_path = os.path.relpath(os.path.join(root, name), output_mod_path)
+            if path_key(rel_path) not in keep_keys:
+                os.remove(os.path.join(root, name))
+                deleted += 1
+
+    kept = restaged = 0
+    files_manifest = {}
+    for out_rel, (src_rel, action) in desired.items():
+        src_path = os.path.join(mod_folder_path, src_rel)
+        dst_path = os.path.join(output_mod_path, out_rel)
+        source_stat = file_stat(src_path)
+        if source_stat is None:
+            logger.log(f"    원본 파일 없음(건너뜀): {src_rel}")
+            continue
+        entry = prev_files.get(out_rel)
+        if (
+            entry
+            and entry.get("source") == src_rel
+            and entry.get("source_stat") == source_stat
+            and entry.get("stat") == file_stat(dst_path)
+        ):
+            kept += 1
+        else:
+            if os.path.lexists(dst_path):
+                os.remove(dst_path)
+            os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+            stage_file(src_path, dst_path, action, staging_hardlinks)
+            restaged += 1
+        files_manifest[out_rel] = {"source": src_rel, "source_stat": source_stat, "stat": file_stat(dst_path)}
+
+    written = 0
+    inis_manifest = {}
+    for ini_name, ini_content in plan["inis"].items():
+        ini_path = os.path.join(output_mod_path, ini_name)
+        digest = text_digest(ini_content)
+        entry = prev_inis.get(ini_name)
+        if not (entry and entry.get("digest") == digest and entry.get("stat") == file_stat(ini_path)):
+            _write_ini(ini_path, ini_content, plan["encodings"].get(ini_name), logger)
+            written += 1
+        inis_manifest[ini_name] = {"digest": digest, "stat": file_stat(ini_path)}
+
+    save_manifest(output_root, mod_folder_name, {
+        "options": options,
+        "slots": [list(pair) for pair in plan["matched_pairs"]],
+        "files": files_manifest,
+        "inis": inis_manifest,
+    })
+    logger.log(
+        f"    바뀐 슬롯 {changed_slots}개: 파일 유지 {kept}개, 다시 스테이징 {restaged}개, 삭제 {deleted}개, "
+        f"INI 다시 씀 {written}개 / 그대로 {len(plan['inis']) - written}개"
+    )
+
+    log_stage(logger, "[5단계] 완료!")
+    logger.log(f"출력 경로: {output_mod_path}")
+    logger.log(f"처리된 파일 수: {len(plan['matched_pairs'])}개")
+    return output_mod_path
 
-    return ini_content
+
+def _export_full(
+    asset_folder_path,
+    mod_folder_path,
+    component_slot_panel,
+    output_root,
+    logger,
+    ini_encodings,
+    staging_mode,
+    staging_rules,
+    staging_hardlinks,
+    workers=1,
+):
+    """generate_ini 기본 흐름: 출력 폴더를 새로 만들어 1 ~ 5단계 수행"""
+    # 2단계: 매칭된 파일 수집 (1단계 복사 범위를 정하려고 먼저 수집)
+    matched_pairs, ib_slots = _collect_matched_pairs(asset_folder_path, component_slot_panel, logger)
+
+    # 1단계: 원본 모드파일을 output 폴더로 복사
+    output_mod_path = _copy_mod_folder(
+        mod_folder_path,
+        output_root,
+        logger,
+        [matched_file for _, matched_file in matched_pairs],
+        staging_mode,
+        staging_rules,
+        staging_hardlinks,
+    )
+    # 출력 폴더를 새로 만들었으므로 지난 증분 내보내기 목록은 맞지 않음
+    discard_manifest(output_root, os.path.basename(os.path.normpath(mod_folder_path)))
+    
+    # 2-1 ~ 3-2단계: 이동/이름 변경을 메모리에서 계산한 뒤 파일당 한 번씩 적용
+    plan = plan_renames(output_mod_path, matched_pairs, ib_slots, logger)
+    apply_plan(output_mod_path, plan, logger)
+    ini_files = plan.ini_files
+    moved_filenames = plan.moved_filenames
+    encodings = _ini_encodings_for(ini_files, plan.ini_origins, ini_encodings)
+
+    # 2-2단계: ini 파일의 filename = 경로를 최상위로 옮긴 이름으로 수정
+    moved_pairs = [(slot_name, moved) for (slot_name, _), moved in zip(matched_pairs, moved_filenames)]
+    _update_ini_file_paths(output_mod_path, ini_files, moved_pairs, plan.original_paths, logger, encodings, plan.ini_origins)
+    matched_pairs = plan.matched_pairs
+    
+    # 4단계: ini 파일 내용 변경
+    log_stage(logger, "[4단계] ini 파일 내용 변경 중...")
+    _update_ini_file_contents(output_mod_path, ini_files, matched_pairs, moved_filenames, logger, encodings, workers)
+    
+    # 5단계: 완료
+    log_stage(logger, "[5단계] 완료!")
+    logger.log(f"출력 경로: {output_mod_path}")
+    logger.log(f"처리된 파일 수: {len(matched_pairs)}개")
+    
+    return output_mod_path
 
 
 def generate_ini(
@@ -843,6 +698,13 @@ def generate_ini(
     component_slot_panel,
     output_root="output",
     logger=None,
+    ini_encodings=None,
+    staging_mode=DEFAULT_STAGING_MODE,
+    staging_rules=None,
+    staging_hardlinks=False,
+    dry_run=False,
+    incremental=False,
+    ini_workers=1,
 ):
     """
     모드 파일과 매칭 정보를 바탕으로 최종 ini 파일을 생성합니다.
@@ -855,42 +717,48 @@ def generate_ini(
     3. 파일명 변경
     3-1. 매칭할 파일명들을 임시 문자열로 변경
     3-2. 임시 문자열들을 제대로 매칭된 파일명으로 변경
+    (2-1 ~ 3-2는 app.rename_plan에서 메모리로 계산한 뒤 파일당 한 번씩 적용하며,
+     2-2의 INI 경로 수정은 그 다음에 수행)
     4. ini 변경
-    4-1-1. 매칭한 문자열을 임시 문자열로 변경
-    4-1-2. 임시 문자열을 매칭된 문자열로 변경
+    4-1. 매칭한 파일명과 Resource 섹션명을 최종 이름으로 변경 (한 번에 치환)
     4-2. 특정 구문 삭제
     4-3. 특정 구문 처리
     5. 완료
+
+    ini_encodings: 모드 기준 INI 경로 -> 인코딩 (생략하면 매처가 읽을 때 감지한 값 사용)
+    staging_mode, staging_rules: 1단계 복사 범위 ('full' 또는 'referenced', app.staging 참고)
+    staging_hardlinks: 고치지 않는 파일을 하드링크로 스테이징 (출력 폴더를 곧 지우는 작업 공간일 때)
+    dry_run: True면 디스크에 아무것도 쓰지 않고 계획(dict)을 반환
+      output_mod_path, staging({모드 기준 경로: copy/link/skip}), staging_report,
+      renames([(원래 경로, 최종 이름, 복사 여부)]), matched_pairs,
+      resource_sections({INI: {원래 섹션: 최종 섹션}}), dropped_sections({INI: [(섹션, 이유)]}),
+      inis({INI: 변환된 텍스트}), encodings({INI: 저장할 인코딩}), diffs({INI: unified diff})
+    incremental: True면 지난 출력 폴더를 재사용하여 바뀐 파일만 다시 복사하고 바뀐 INI만 다시 씀
+      (지난 결과 목록은 output_root/.export_manifests에 저장, app.export_manifest 참고)
+    ini_workers: 4단계 INI 변환 프로세스 수 (1이면 순차, 0이면 CPU 수)
+    logger: 단계별 로거(app.pipeline_log.PipelineLogger)가 아니면 info 레벨로 감싸서
+      개별 치환/이동 같은 상세 로그는 단계마다 줄 수만 알림
     """
-    
-    # 1단계: 원본 모드파일을 output 폴더로 복사
-    output_mod_path = _copy_mod_folder(mod_folder_path, output_root, logger)
-    
-    # 2단계: 매칭된 파일 수집
-    matched_pairs, ib_slots = _collect_matched_pairs(asset_folder_path, component_slot_panel, logger)
-    
-    # 2-1단계: 파일들을 최상위 폴더로 이동
-    matched_pairs, ini_files, original_paths = _move_files_to_top(output_mod_path, matched_pairs, ib_slots, logger)
-    
-    # 2-2단계: ini 파일의 filename = 경로 수정
-    _update_ini_file_paths(output_mod_path, ini_files, matched_pairs, original_paths, logger)
-    
-    # 3단계: 파일명 변경
-    logger.log("[3단계] 파일명 변경 중...")
-    
-    # 3-1단계: 임시 파일명으로 변경
-    matched_pairs, moved_filenames = _rename_to_temp_files(output_mod_path, matched_pairs, logger)
-    
-    # 3-2단계: 최종 파일명으로 변경
-    matched_pairs = _rename_to_final_files(output_mod_path, matched_pairs, logger)
-    
-    # 4단계: ini 파일 내용 변경
-    logger.log("[4단계] ini 파일 내용 변경 중...")
-    _update_ini_file_contents(output_mod_path, ini_files, matched_pairs, moved_filenames, logger)
-    
-    # 5단계: 완료
-    logger.log("[5단계] 완료!")
-    logger.log(f"출력 경로: {output_mod_path}")
-    logger.log(f"처리된 파일 수: {len(matched_pairs)}개")
-    
-    return output_mod_path
+    if ini_encodings is None:
+        matcher = getattr(getattr(component_slot_panel, "controller", None), "matcher", None)
+        ini_encodings = getattr(matcher, "ini_encodings", None)
+
+    logger = logger if isinstance(logger, PipelineLogger) else PipelineLogger(logger)
+    args = (
+        asset_folder_path,
+        mod_folder_path,
+        component_slot_panel,
+        output_root,
+        logger,
+        ini_encodings,
+        staging_mode,
+        staging_rules,
+    )
+    try:
+        if dry_run:
+            return _preview_export(*args, ini_workers)
+        if incremental:
+            return _export_incremental(*args, staging_hardlinks, ini_workers)
+        return _export_full(*args, staging_hardlinks, ini_workers)
+    finally:
+        logger.flush()
@@ -0,0 +1,231 @@
+"""INI 이름 치환 엔진 (4-1단계)
+
+매칭한 파일명과 Resource 섹션명을 INI 한 개당 한 번의 왼쪽→오른쪽 훑기로 바꿉니다.
+예전의 두 단계 방식(임시 문자열로 바꾼 뒤 최종 이름으로 바꾸기)과 결과가 같도록
+다음 우선순위를 그대로 따릅니다.
+1. Resource 섹션 헤더 `[원래 섹션명]` (대소문자 구분, 줄 어디에 있든)
+2. 'key = 원래 섹션명' 줄의 값 (대소문자 무시, 따옴표 보존)
+3. 나머지 구간에서 파일명(확장자 제외) -> 최종 파일명 (matched_pairs 순서가 우선)
+
+파일명끼리 겹칠 수 있으면(한 이름이 다른 이름을 포함하거나 앞뒤가 겹침)
+우선순위가 높은 이름부터 남은 구간을 나눠 가며 찾고, 겹칠 수 없으면
+전체 이름을 하나로 묶은 정규식 한 번으로 찾습니다.
+중복으로 제거할 Resource 섹션은 헤더부터 다음 섹션 직전까지 삭제하고,
+그 섹션을 가리키던 값은 남은 섹션 이름으로 바꿉니다.
+"""
+
+import os
+import re
+
+from app.pipeline_log import log_detail
+
+# 제거할 섹션 헤더 자리 표시 (INI 텍스트에 나올 수 없는 문자 사용)
+_DROP_MARK = "\x00{}\x00"
+
+_FILENAME_LINE = re.compile(r'(?i)\s*filename\s*=\s*(.*)')
+
+
+def _parse_sections(lines):
+    """[(섹션명, 본문 시작 줄, 끝 줄)]"""
+    sections = []
+    current_name = None
+    current_start = None
+    for i, line in enumerate(lines):
+        s = line.strip()
+        if s.startswith('[') and s.endswith(']'):
+            if current_name is not None:
+                sections.append((current_name, current_start, i))
+            current_name = s[1:-1].strip()
+            current_start = i + 1
+    if current_name is not None:
+        sections.append((current_name, current_start, len(lines)))
+    return sections
+
+
+def collect_resource_mappings(ini_content, matched_pairs, moved_filenames, logger):
+    """filename이 매칭 파일인 Resource 섹션 -> 최종 Resource명, 중복으로 제거할 섹션 목록
+
+    반환: (resource_section_mappings, resource_sections_to_drop)
+    """
+    lines = ini_content.split('\n')
+    sections = [s for s in _parse_sections(lines) if s[0].startswith('Resource')]
+
+    # 섹션마다 filename 값의 파일명(확장자 제외)을 한 번만 구함
+    section_basenames = []
+    for sec_name, start, end in sections:
+        names = []
+        for ln in lines[start:end]:
+            m = _FILENAME_LINE.match(ln)
+            if not m:
+                continue
+            val = m.group(1).strip()
+            if (val.startswith('"') and val.endswith('"')) or (val.startswith("'") and val.endswith("'")):
+                val = val[1:-1]
+            names.append((os.path.splitext(os.path.basename(val))[0], val))
+        section_basenames.append((sec_name, names))
+
+    resource_section_mappings = {}
+    for idx, (slot_name, final_filename) in enumerate(matched_pairs):
+        moved_name_no_ext = os.path.splitext(moved_filenames[idx])[0]
+        final_name_no_ext, final_ext = os.path.splitext(final_filename)
+        # final_filename의 확장자가 .ib이면 섹션명 끝에 'IB'를 붙인다
+        if final_ext.lower() == '.ib':
+            resource_name = f"Resource{final_name_no_ext}IB"
+        else:
+            resource_name = f"Resource{final_name_no_ext}"
+
+        for sec_name, names in section_basenames:
+            for base_name, val in names:
+                if base_name == moved_name_no_ext:
+                    resource_section_mappings[sec_name] = resource_name
+                    log_detail(logger, f"    Resource 섹션 매핑 발견: {sec_name} -> {resource_name} (filename={val})")
+                    break
+
+    # 같은 최종 Resource명을 가진 섹션이 여럿이면 첫 번째만 남기고 나머지는 제거 (참조는 첫 번째로 통일)
+    final_to_orig = {}
+    for orig_sec, final_res in resource_section_mappings.items():
+        final_to_orig.setdefault(final_res, []).append(orig_sec)
+
+    resource_sections_to_drop = []
+    for final_res, orig_list in final_to_orig.items():
+        if len(orig_list) > 1:
+            to_drop = orig_list[1:]
+            resource_sections_to_drop.extend(to_drop)
+            log_detail(logger, f"    중복 Resource 발견: {final_res} <- {orig_list} (추가 섹션 제거 예정: {to_drop})")
+
+    return resource_section_mappings, resource_sections_to_drop
+
+
+def _names_overlap(names):
+    """서로 다른 두 이름이 어떤 텍스트에서든 겹쳐 나타날 수 있는지"""
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            if a in b or b in a:
+                return True
+            for x, y in ((a, b), (b, a)):
+                for k in range(1, min(len(x), len(y))):
+                    if x.endswith(y[:k]):
+                        return True
+    return False
+
+
+class IniRewriter:
+    """한 번의 내보내기에서 쓰는 치환 규칙 (INI마다 rewrite 호출)"""
+
+    def __init__(self, matched_pairs, moved_filenames):
+        # 파일명 -> 최종 파일명 (같은 파일명이 여러 번 나오면 처음 것이 우선)
+        self.renames = {}
+        for idx, (slot_name, final_filename) in enumerate(matched_pairs):
+            moved_name_no_ext = os.path.splitext(moved_filenames[idx])[0]
+            if moved_name_no_ext and moved_name_no_ext not in self.renames:
+                self.renames[moved_name_no_ext] = os.path.splitext(final_filename)[0]
+        self.matched_pairs = matched_pairs
+        self.moved_filenames = moved_filenames
+
+        names = list(self.renames)
+        self._overlapping = _names_overlap(names)
+        self._name_pattern = None
+        if names and not self._overlapping:
+            # 겹칠 수 없는 이름들은 어떤 순서로 묶어도 결과가 같다
+            self._name_pattern = re.compile("|".join(re.escape(n) for n in names))
+
+    def rewrite(self, ini_content, logger, report=None):
+        """INI 텍스트 하나를 치환한 결과 반환
+
+        report: dict를 주면 Resource 섹션 매핑(resource_sections)과
+        중복으로 제거한 섹션(dropped_sections)을 기록
+        """
+        mappings, to_drop = collect_resource_mappings(
+            ini_content, self.matched_pairs, self.moved_filenames, logger
+        )
+        drop = set(to_drop)
+        if report is not None:
+            report["resource_sections"] = dict(mappings)
+            report.setdefault("dropped_sections", []).extend(
+                (orig_sec, "중복 Resource") for orig_sec in to_drop
+            )
+
+        # 1) Resource 헤더, 2) 'key = 섹션명' 값
+        protected = []  # (시작, 끝, 바꿀 문자열)
+        if mappings:
+            header_repl = {}
+            for n, (orig_sec, final_res) in enumerate(mappings.items()):
+                if orig_sec in drop:
+                    header_repl[f"[{orig_sec}]"] = "[" + _DROP_MARK.format(n) + "]"
+                else:
+                    header_repl[f"[{orig_sec}]"] = f"[{final_res}]"
+            header_pat = re.compile("|".join(re.escape(h) for h in header_repl))
+            for m in header_pat.finditer(ini_content):
+                protected.append((m.start(), m.end(), header_repl[m.group(0)]))
+
+            # 대소문자만 다른 섹션명이 여럿이면 먼저 나온 섹션이 우선
+            by_lower = {}
+            for orig_sec, final_res in mappings.items():
+                by_lower.setdefault(orig_sec.lower(), final_res)
+            value_pat = re.compile(
+                r'(^\s*[^=\n]+\s*=\s*)(["\']?)(%s)(\2)(?=\s*$)'
+                % "|".join(re.escape(s) for s in mappings),
+                flags=re.IGNORECASE | re.MULTILINE,
+            )
+            for m in value_pat.finditer(ini_content):
+                protected.append((m.start(3), m.end(3), by_lower[m.group(3).lower()]))
+            protected.sort()
+
+        # 3) 남은 구간의 파일명
+        gaps = []
+        pos = 0
+        for start, end, _ in protected:
+            gaps.append((pos, start))
+            pos = end
+        gaps.append((pos, len(ini_content)))
+        edits = protected + self._find_names(ini_content, gaps)
+        edits.sort()
+
+        parts = []
+        pos = 0
+        for start, end, repl in edits:
+            parts.append(ini_content[pos:start])
+            parts.append(repl)
+            pos = end
+        parts.append(ini_content[pos:])
+        ini_content = "".join(parts)
+
+        for n, (orig_sec, final_res) in enumerate(mappings.items()):
+            if orig_sec in drop:
+                mark = re.escape(_DROP_MARK.format(n))
+                ini_content = re.sub(rf'\[{mark}\].*?(?=\n\[|\Z)', '', ini_content, flags=re.DOTALL)
+                log_detail(logger, f"    중복된 섹션 제거: {orig_sec} (참조는 {final_res}로 변경)")
+            else:
+                log_detail(logger, f"    Resource명 변경: {orig_sec} -> {final_res}")
+
+        return ini_content
+
+    def _find_names(self, text, gaps):
+        """구간별 파일명 위치 -> [(시작, 끝, 최종 파일명)]"""
+        edits = []
+        if not self.renames:
+            return edits
+
+        if self._name_pattern is not None:
+            for gap_start, gap_end in gaps:
+                for m in self._name_pattern.finditer(text, gap_start, gap_end):
+                    edits.append((m.start(), m.end(), self.renames[m.group(0)]))
+            return edits
+
+        # 겹칠 수 있는 이름이 있으면 우선순위대로 남은 구간을 나눠 가며 찾는다
+        for name, final_name in self.renames.items():
+            next_gaps = []
+            for gap_start, gap_end in gaps:
+                pos = gap_start
+                while True:
+                    found = text.find(name, pos, gap_end)
+                    if found < 0:
+                        break
+                    edits.append((found, found + len(name), final_name))
+                    if found > pos:
+                        next_gaps.append((pos, found))
+                    pos = found + len(name)
+                if pos < gap_end:
+                    next_gaps.append((pos, gap_end))
+            gaps = next_gaps
+        return edits
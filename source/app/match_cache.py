@@ -0,0 +1,62 @@
+"""모드 매칭 결과 디스크 캐시
+
+모드 폴더마다 JSON 파일 하나에 다음을 저장합니다.
+- manifest: 폴더별 스캔 목록 (다음 스캔 때 바뀌지 않은 폴더는 다시 나열하지 않음)
+- fingerprint: 스캔한 파일 경로/크기/수정 시각으로 만든 폴더 지문
+- inis: INI별 (크기, 수정 시각, 내용 digest, INI 인덱스)
+- rows: load_tree_from_mod 결과
+
+지문이 같으면 rows를 그대로 쓰고, 다르면 바뀐 INI만 다시 파싱합니다.
+"""
+
+import hashlib
+import json
+import os
+
+CACHE_VERSION = 3
+
+
+def folder_fingerprint(entries):
+    """파일 경로/크기/수정 시각으로 만든 폴더 지문"""
+    h = hashlib.sha1()
+    for rel_path, size, mtime in sorted(entries):
+        h.update(f"{rel_path}\0{size}\0{mtime}\n".encode("utf-8", "surrogatepass"))
+    return h.hexdigest()
+
+
+def content_digest(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+class MatchCache:
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _path_for(self, folder_path):
+        key = os.path.normcase(os.path.abspath(folder_path))
+        name = hashlib.sha1(key.encode("utf-8", "surrogatepass")).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def load(self, folder_path):
+        """저장된 캐시 항목 (없거나 형식이 다르면 None)"""
+        path = self._path_for(folder_path)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return None
+        return data
+
+    def save(self, folder_path, data):
+        """임시 파일에 쓴 뒤 교체하여 저장 (중간에 실패해도 기존 캐시 유지)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path_for(folder_path)
+        tmp_path = path + ".tmp"
+        payload = dict(data)
+        payload["version"] = CACHE_VERSION
+        payload["folder"] = os.path.abspath(folder_path)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
@@ -1,70 +1,395 @@
 import os
 import json
+import copy
 import configparser
-import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from app.file_manager import scan_folder
+from app.background import CancelToken, LatestTaskRunner
+from app.folder_watcher import DEFAULT_INTERVAL, FolderWatcher
+from app.file_manager import (
+    bucket_of,
+    scan_directory,
+    build_path_table,
+    resolve_declared_path,
+    read_text,
+)
+from app.ini_index import build_ini_index, index_from_dict, index_to_dict
+from app.match_cache import MatchCache, content_digest, folder_fingerprint
+from app.pipeline_log import log_detail
+from app.size_matcher import propose_by_size
+
+
+# 모드 불러오기 작업이 끝난 뒤 UI 스레드에서 매처에 반영하는 상태
+MOD_STATE_ATTRS = (
+    "mod_files",
+    "mod_root",
+    "mod_path_table",
+    "mod_stats",
+    "mod_buckets",
+    "mod_manifest",
+    "mod_fingerprint",
+    "mod_cache_entry",
+    "mod_resource_files",
+    "mod_rows",
+    "_rows_fingerprint",
+    "ini_contents",
+    "ini_indexes",
+    "ini_digests",
+    "ini_encodings",
+)
+
+# INI 동시 읽기 스레드 수
+INI_READ_WORKERS = 8
+
+# 변경 로그에 파일 이름까지 보여 줄 최대 개수
+DELTA_LOG_NAMES = 5
+
+
+def _scan_delta_message(scan):
+    """이전 스캔과 비교한 변경 내역 로그 문구"""
+    return (
+        f"변경 감지: 추가 {len(scan.added)}개, 삭제 {len(scan.removed)}개, "
+        f"수정 {len(scan.changed)}개"
+    )
+
+
+def _scan_delta_names(scan):
+    """변경 파일이 적으면 이름까지 나열한 로그 문구 목록"""
+    lines = []
+    for label, names in (("추가", scan.added), ("삭제", scan.removed), ("수정", scan.changed)):
+        if names and len(names) <= DELTA_LOG_NAMES:
+            lines.append(f"  {label}: {', '.join(names)}")
+    return lines
+
+
+class _WorkerUI:
+    """작업 스레드용 UI 대리자: 로그만 UI 스레드로 넘기고 위젯에는 접근하지 않는다"""
+
+    def __init__(self, ui, token):
+        self._ui = ui
+        self._token = token
+        self.config = getattr(ui, "config", None)
+
+    def log(self, msg):
+        self._token.post(self._ui.log, msg)
+
+    def detail(self, msg):
+        self._token.post(getattr(self._ui, "detail", self._ui.log), msg)
 
 
 class ComponentMatcherApp:
     def __init__(self, ui):
         self.ui = ui
         self.asset_files = []
+        self.asset_folder = None
         self.mod_files = []
         self.components = []
-
+        self.ini_contents = {}
+        self.ini_indexes = {}
+        self.mod_root = None
+        self.mod_path_table = None
+        self.ini_digests = {}
+        self.ini_encodings = {}
+        self.mod_stats = {}
+        self.mod_buckets = {}
+        self.mod_manifest = None
+        self.asset_manifest = None
+        self.asset_stats = {}
+        self.size_proposals = {}
+        self.mod_fingerprint = None
+        self.mod_cache_entry = None
+        self.mod_rows = []
+        self._rows_fingerprint = None
+        self.mod_resource_files = []
+        self._cancel_token = None
+        self._runners = {}
+        self._requested = {}
+        self.watcher = None
+
+    # ---------- 폴더 선택 (백그라운드 불러오기) ----------
     def select_asset_folder_from_path(self, folder):
-        # 경로 정규화 및 스캔
-        self.asset_files = scan_folder(folder)
+        """에셋 폴더 스캔과 hash.json 읽기는 작업 스레드에서, 화면 갱신은 UI 스레드에서"""
+        self._requested["asset"] = folder
+        self._run_in_background(
+            "asset",
+            lambda token: self._load_asset_folder(folder, token),
+            self._apply_asset_folder,
+        )
+
+    def select_mod_folder_from_path(self, folder):
+        """모드 폴더 스캔/INI 읽기/매칭은 작업 스레드에서, 목록 갱신은 UI 스레드에서"""
+        self._requested["mod"] = folder
+        self._run_in_background(
+            "mod",
+            lambda token: self._load_mod_folder(folder, token),
+            self._apply_mod_folder,
+        )
+
+    def _run_in_background(self, kind, work, on_done):
+        call_in_ui = getattr(self.ui, "call_in_ui", None)
+        if not callable(call_in_ui):
+            # UI 스레드 전달 수단이 없으면 (예: 테스트) 그 자리에서 실행
+            on_done(work(CancelToken()))
+            return
+
+        runner = self._runners.get(kind)
+        if runner is None:
+            runner = LatestTaskRunner(
+                kind, call_in_ui, getattr(self.ui, "set_status", None)
+            )
+            self._runners[kind] = runner
+        runner.submit(work, on_done, self._on_background_error)
+
+    def _on_background_error(self, e):
+        self.ui.log(f"[오류] 폴더 불러오기 실패: {e}")
+
+    def _load_asset_folder(self, folder, token):
+        """작업 스레드: 에셋 폴더 스캔 및 hash.json 읽기"""
+        token.progress(f"에셋 스캔 중: {Path(folder).name}", force=True)
+        # 같은 에셋 폴더를 다시 고르면 이전 스캔 목록(메모리)을 재사용
+        manifest = self.asset_manifest if folder == self.asset_folder else None
+        scan = scan_directory(folder, manifest, token.check)
+        token.check()
+        messages = []
+        if manifest is not None and scan.has_changes:
+            messages.append(_scan_delta_message(scan))
+        components = self._read_components_from_hash_json(folder, messages.append)
+        return folder, scan, components, messages
+
+    def _apply_asset_folder(self, result):
+        """UI 스레드: 에셋 불러오기 결과 반영"""
+        folder, scan, components, messages = result
+        self.asset_files = scan.files
+        self.asset_folder = folder
+        self.asset_manifest = scan.manifest
+        self.asset_stats = scan.stats
         display = Path(folder).as_posix()
         self.ui.path_selector.asset_path_var.set(display)
         self.ui.log(f"[에셋 폴더 선택] {display}")
         self.ui.log(f"불러온 파일: {len(self.asset_files)}개")
-        self.load_components_from_hash_json(folder)
+        for msg in messages:
+            self.ui.log(msg)
+        self.components = components
+        try:
+            self.ui.display_components(self.components, self.mod_files or [])
+        except Exception:
+            pass
+        self._watch("asset", folder, self.asset_manifest)
+        self._update_size_proposals()
+        self._set_status("")
 
-    def select_mod_folder_from_path(self, folder):
-        # 경로 정규화 및 스캔
-        self.mod_files = scan_folder(folder)
+    def _load_mod_folder(self, folder, token):
+        """작업 스레드: 모드 폴더 스캔, INI 읽기, 매칭
+
+        매처의 얕은 복사본에서 기존 흐름을 그대로 실행하고 결과 상태만 돌려준다.
+        (취소되거나 실패해도 현재 화면에 쓰이는 상태는 바뀌지 않음)
+        """
+        worker = self._make_worker(token)
+        token.progress(f"모드 스캔 중: {Path(folder).name}", force=True)
+        worker._load_mod_cache(folder)
+        scan = worker._scan_mod_folder(folder, token.check)
+        worker.mod_root = str(Path(folder))
+        worker.mod_path_table = build_path_table(worker.mod_files)
         display = Path(folder).as_posix()
+        worker.ui.log(f"[모드 폴더 선택] {display}")
+        worker.ui.log(f"불러온 파일: {len(worker.mod_files)}개")
+        if worker.mod_manifest is not None and scan.has_changes:
+            worker.ui.log(_scan_delta_message(scan))
+        worker.mod_manifest = scan.manifest
+
+        rows = worker.load_tree_from_mod(sorted(set(worker.mod_files)))
+        state = {name: getattr(worker, name) for name in MOD_STATE_ATTRS}
+        return display, state, rows
+
+    def _make_worker(self, token):
+        """작업 스레드용 매처 얕은 복사본 (로그는 token을 거쳐 UI 스레드로)"""
+        worker = copy.copy(self)
+        worker.ui = _WorkerUI(self.ui, token)
+        worker._cancel_token = token
+        worker._runners = {}
+        worker.watcher = None
+        return worker
+
+    def _apply_mod_folder(self, result):
+        """UI 스레드: 모드 불러오기 결과 반영"""
+        display, state, rows = result
+        for name, value in state.items():
+            setattr(self, name, value)
         self.ui.path_selector.mod_path_var.set(display)
-        self.ui.log(f"[모드 폴더 선택] {display}")
-        self.ui.log(f"불러온 파일: {len(self.mod_files)}개")
+        self._watch("mod", self.mod_root, self.mod_manifest)
+        self._update_size_proposals()
 
         # 모드 파일 목록만 갱신
         try:
-            self.ui.file_panel.set_file_list(self.mod_files)
+            self.ui.file_panel.set_file_list(self.mod_files, rows)
         except Exception:
             # 예외가 발생하면 기존 동작처럼 display_components로 폴백
             try:
                 self.ui.display_components(self.components, self.mod_files)
             except Exception:
                 pass
+        self._set_status("")
+
+    # ---------- 폴더 감시 ----------
+    def set_watching(self, enabled):
+        """현재 에셋/모드 폴더 감시 켜기/끄기 (config: watch_interval 초 간격 폴링)"""
+        call_in_ui = getattr(self.ui, "call_in_ui", None)
+        if not enabled or not callable(call_in_ui):
+            if self.watcher:
+                self.watcher.stop()
+                self.watcher = None
+            return
+
+        if self.watcher is None:
+            config = getattr(self.ui, "config", None) or {}
+            self.watcher = FolderWatcher(
+                call_in_ui,
+                self._on_folder_changed,
+                config.get("watch_interval", DEFAULT_INTERVAL),
+                self._on_watch_error,
+            )
+            if self.asset_folder:
+                self.watcher.watch("asset", self.asset_folder, self.asset_manifest)
+            if self.mod_root:
+                self.watcher.watch("mod", self.mod_root, self.mod_manifest)
+        self.watcher.start()
+
+    def _watch(self, kind, folder, manifest):
+        if self.watcher and folder:
+            self.watcher.watch(kind, folder, manifest)
+
+    def _on_watch_error(self, kind, folder, e):
+        self.ui.log(f"[폴더 감시] 스캔 실패: {folder} -> {e}")
+
+    def _on_folder_changed(self, kind, folder, scan):
+        """UI 스레드: 감시 중인 폴더에서 변경이 감지됨"""
+        # 그 사이 다른 폴더를 불러오기 시작했으면 무시 (새 불러오기를 취소하지 않도록)
+        requested = self._requested.get(kind)
+        if requested is not None and os.path.normcase(
+            os.path.abspath(requested)
+        ) != os.path.normcase(os.path.abspath(folder)):
+            return
+
+        if kind == "mod":
+            self._run_in_background(
+                "mod",
+                lambda token: self._refresh_mod_folder(folder, scan, token),
+                self._apply_mod_refresh,
+            )
+            return
 
-    def load_components_from_hash_json(self, folder):
+        if "hash.json" in scan.added + scan.changed + scan.removed:
+            self._run_in_background(
+                "asset",
+                lambda token: self._refresh_asset_folder(folder, scan),
+                self._apply_asset_refresh,
+            )
+        else:
+            self._apply_asset_refresh((folder, scan, None, []))
+
+    def _refresh_mod_folder(self, folder, scan, token):
+        """작업 스레드: 감시로 받은 스캔 결과를 반영하고 바뀐 INI만 다시 읽어 매칭"""
+        worker = self._make_worker(token)
+        worker._use_scan(scan)
+        worker.mod_manifest = scan.manifest
+        worker.mod_root = str(Path(folder))
+        worker.mod_path_table = build_path_table(worker.mod_files)
+        display = Path(folder).as_posix()
+        worker.ui.log(f"[모드 폴더 변경] {display}")
+        worker.ui.log(_scan_delta_message(scan))
+        for line in _scan_delta_names(scan):
+            worker.ui.log(line)
+
+        rows = worker.load_tree_from_mod(sorted(set(worker.mod_files)))
+        state = {name: getattr(worker, name) for name in MOD_STATE_ATTRS}
+        return display, state, rows
+
+    def _apply_mod_refresh(self, result):
+        """UI 스레드: 변경 반영 (선택/스크롤 위치는 유지)"""
+        display, state, rows = result
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._watch("mod", self.mod_root, self.mod_manifest)
+        panel = self.ui.file_panel
+        update = getattr(panel, "update_file_list", None) or panel.set_file_list
+        try:
+            update(self.mod_files, rows)
+        except Exception as e:
+            self.ui.log(f"[오류] 모드 파일 목록 갱신 실패: {e}")
+        self._update_size_proposals()
+        self._set_status("")
+
+    def _refresh_asset_folder(self, folder, scan):
+        """작업 스레드: hash.json이 바뀌었으면 컴포넌트를 다시 읽는다"""
+        messages = []
+        components = self._read_components_from_hash_json(folder, messages.append)
+        return folder, scan, components, messages
+
+    def _apply_asset_refresh(self, result):
+        folder, scan, components, messages = result
+        self.asset_files = scan.files
+        self.asset_manifest = scan.manifest
+        self.asset_stats = scan.stats
+        self._watch("asset", folder, scan.manifest)
+        self.ui.log(f"[에셋 폴더 변경] {Path(folder).as_posix()}")
+        self.ui.log(_scan_delta_message(scan))
+        for msg in messages:
+            self.ui.log(msg)
+        # 컴포넌트 구성이 실제로 바뀐 경우에만 슬롯 패널을 다시 그림 (할당 값이 초기화되므로)
+        if components is not None and components != self.components:
+            self.components = components
+            self.ui.log("hash.json 변경: 컴포넌트 목록을 다시 불러옵니다.")
+            try:
+                self.ui.display_components(self.components, self.mod_files or [])
+            except Exception:
+                pass
+        self._update_size_proposals()
+
+    def _update_size_proposals(self):
+        """크기 기반 보조 매칭 제안 갱신 (파일 크기만 비교하므로 폴더가 바뀔 때마다 실행)"""
+        if not self.components or not self.asset_folder or not self.mod_stats:
+            self.size_proposals = {}
+            return
+        asset_name = os.path.basename(os.path.normpath(self.asset_folder))
+        try:
+            self.size_proposals = propose_by_size(
+                self.components, asset_name, self.asset_stats, self.mod_stats, self.mod_rows
+            )
+        except Exception as e:
+            self.size_proposals = {}
+            self.ui.log(f"[오류] 크기 기반 매칭 실패: {e}")
+            return
+        if self.size_proposals:
+            self.ui.log(f"크기 기반 매칭 후보: 슬롯 {len(self.size_proposals)}개")
+
+    def _set_status(self, text):
+        set_status = getattr(self.ui, "set_status", None)
+        if callable(set_status):
+            set_status(text)
+
+    def _check_cancelled(self, progress=None):
+        """작업 스레드에서 실행 중이면 취소 여부 확인 및 진행 상황 전달"""
+        token = self._cancel_token
+        if token is None:
+            return
+        token.check()
+        if progress:
+            token.progress(progress)
+
+    def _read_components_from_hash_json(self, folder, log):
+        """hash.json을 읽어 컴포넌트 목록 반환 (없거나 실패하면 빈 목록)"""
         try:
             path = os.path.join(folder, "hash.json")
             if not os.path.isfile(path):
-                self.ui.log("에셋 폴더에 hash.json이 없습니다.")
-                # 컴포넌트 초기화
-                self.components = []
-                try:
-                    self.ui.display_components(self.components, self.mod_files)
-                except Exception:
-                    pass
-                return
+                log("에셋 폴더에 hash.json이 없습니다.")
+                return []
 
             try:
                 with open(path, encoding="utf-8") as f:
                     data = json.load(f)
             except json.JSONDecodeError as e:
-                self.ui.log(f"hash.json 파싱 실패: {e}")
-                # 컴포넌트 초기화
-                self.components = []
-                try:
-                    self.ui.display_components(self.components, self.mod_files)
-                except Exception:
-                    pass
-                return
+                log(f"hash.json 파싱 실패: {e}")
+                return []
 
             components = []
             for entry in data:
@@ -84,218 +409,265 @@ class ComponentMatcherApp:
                 for i, label in enumerate(classifications):
                     variants[label] = {"IB": entry.get("ib")}
 
-                components.append(
-                    {"name": name, "shared": shared, "variants": variants}
-                )
+                component = {"name": name, "shared": shared, "variants": variants}
+                # 파트별 시작 인덱스 (자동 채우기에서 IB 구분에 사용)
+                object_indexes = entry.get("object_indexes") or []
+                if len(object_indexes) == len(classifications):
+                    component["first_indexes"] = dict(zip(classifications, object_indexes))
+                components.append(component)
 
-            self.components = components
-            self.ui.display_components(self.components, self.mod_files)
+            return components
         except Exception as e:
             import traceback
-            self.ui.log(f"[오류] 컴포넌트 로딩 실패: {e}\n{traceback.format_exc()}")
-            # 오류 시 UI 초기화
-            try:
-                self.components = []
-                self.ui.display_components(self.components, self.mod_files or [])
-            except Exception:
-                pass
+            log(f"[오류] 컴포넌트 로딩 실패: {e}\n{traceback.format_exc()}")
+            return []
+
+    def load_components_from_hash_json(self, folder):
+        self.components = self._read_components_from_hash_json(folder, self.ui.log)
+        try:
+            self.ui.display_components(self.components, self.mod_files or [])
+        except Exception:
+            pass
 
     def load_tree_from_mod(self, mod_files):
-        # INI 파일만 필터링하여 캐시
-        ini_files = [f for f in mod_files if f.lower().endswith(".ini")]
+        # 스캔 때 나눈 분류에서 INI 파일만 꺼내어 캐시
+        ini_files = self._bucket_files(mod_files, "ini")
         # INI 없으면 빈 결과 반환
         if not ini_files:
             if mod_files:
                 self.ui.log("모드 폴더에 .ini 파일이 없습니다.")
+            self.ini_contents = {}
+            self.ini_indexes = {}
+            self.ini_digests = {}
+            self.ini_encodings = {}
+            self.mod_resource_files = []
+            self.mod_rows = []
+            self._rows_fingerprint = None
             return []
 
-        mod_root = str(Path(self.ui.path_selector.mod_path_var.get()))
-        self.ini_contents = {}
+        mod_root = self.mod_root or str(Path(self.ui.path_selector.mod_path_var.get()))
+
+        # 폴더 지문이 그대로면 이전 결과(메모리 또는 디스크 캐시)를 사용
+        if self._fingerprint_matches(mod_files):
+            if self._rows_fingerprint == self.mod_fingerprint:
+                return list(self.mod_rows)
+            rows = self._restore_from_cache(mod_files)
+            if rows is not None:
+                self.ui.log(
+                    f"캐시에서 불러옴: INI {len(self.ini_indexes)}개, 항목 {len(rows)}개"
+                )
+                return rows
+
         self.ui.log(f"모드 루트: {mod_root} — INI 파일 {len(ini_files)}개 읽기 시작")
 
         # INI 파일을 읽어 캐시 (실패만 로그), 완료 후 개수만 간단히 로그
         self._cache_ini_files(mod_root, ini_files)
 
         # 2. 리소스(.ib/.buf) 목록 생성
-        self.mod_resource_files = [
-            f for f in mod_files if f.lower().endswith((".ib", ".buf", ".assets"))
-        ]
+        self.mod_resource_files = self._bucket_files(mod_files, "ib", "buf", "assets")
         self.ui.log(f"모드 리소스(.ib/.buf) 발견: {len(self.mod_resource_files)}개")
 
-        # 3. 패턴 생성: filename/section/kv
-        filename_pattern = re.compile(
-            r'^\s*filename\s*=\s*(?:"(?P<dq>[^"]+)"|\'(?P<sq>[^\']+)\'|(?P<noq>\S+))',
-            re.IGNORECASE | re.MULTILINE,
-        )
-        section_pattern = re.compile(r"^\s*\[(?P<section>[^\]]+)\]", re.MULTILINE)
-        kv_pattern = re.compile(
-            r'^\s*(?P<key>[^=;\s]+)\s*=\s*(?:"(?P<dq>[^\"]+)"|\'(?P<sq>[^\']+)\'|(?P<noq>\S+))',
-            re.IGNORECASE | re.MULTILINE,
-        )
+        # 3. 스캔 때 만든 경로 표로 filename 선언을 파일에 연결
+        # (선언마다 INI 위치 기준으로 한 번만 풀어서 조회)
+        path_table = self.mod_path_table or build_path_table(mod_files)
+        found = {file_rel: [] for file_rel in self.mod_resource_files}
+        seen = {file_rel: set() for file_rel in self.mod_resource_files}
+        for ini_rel, index in self.ini_indexes.items():
+            self._check_cancelled()
+            for declared, section_idx in index.declarations:
+                key = resolve_declared_path(mod_root, ini_rel, declared)
+                file_rel = path_table.get(key)
+                if file_rel not in found:
+                    continue
+                for comp, hval in index.components_for(section_idx):
+                    if comp not in seen[file_rel]:
+                        seen[file_rel].add(comp)
+                        found[file_rel].append((comp, hval, file_rel))
 
         rows = []
-
         for file_rel in self.mod_resource_files:
-            aggregated = set()
-            checked_sections = set()
-            for ini_rel, text in self.ini_contents.items():
-                comps, secs = self._find_components_in_ini_for_file(
-                    ini_rel,
-                    text,
-                    file_rel,
-                    filename_pattern,
-                    section_pattern,
-                    kv_pattern,
-                )
-                for comp, hval, section_name in comps:
-                    if (comp, file_rel) not in aggregated:
-                        aggregated.add((comp, file_rel))
-                        rows.append((comp, hval, file_rel))
-                for s in secs:
-                    checked_sections.add((ini_rel, s or ""))
+            rows.extend(found[file_rel])
 
-        return rows
+        if self._fingerprint_matches(mod_files):
+            self._save_mod_cache(rows)
 
-    def ini_filename_points_to(self, ini_rel, ini_declared_path, file_rel):
-        """INI의 경로가 대상 파일을 가리키는지 비교"""
-        try:
-            mod_root = str(Path(self.ui.path_selector.mod_path_var.get()))
-        except Exception:
-            mod_root = ""
-
-        # ini 기준으로 선언된 경로 -> 절대
-        try:
-            ini_abs = (
-                os.path.normpath(os.path.join(mod_root, ini_rel))
-                if mod_root
-                else os.path.normpath(ini_rel)
-            )
-            ini_dir = os.path.dirname(ini_abs)
-            ini_decl_abs = os.path.normpath(os.path.join(ini_dir, ini_declared_path))
-        except Exception:
-            return False
-
-        # 비교 대상 파일 절대 경로
-        try:
-            file_abs = (
-                os.path.normpath(os.path.join(mod_root, file_rel))
-                if mod_root
-                else os.path.normpath(file_rel)
-            )
-        except Exception:
-            return False
+        return rows
 
-        # 윈도우는 대소문자 구분하지 않으므로 os.path.normcase로 정규화
-        try:
-            a = os.path.normcase(os.path.abspath(ini_decl_abs))
-            b = os.path.normcase(os.path.abspath(file_abs))
-        except Exception:
-            a = os.path.normcase(ini_decl_abs)
-            b = os.path.normcase(file_abs)
+    def resource_first_indexes(self):
+        """리소스 파일 -> {컴포넌트: {match_first_index, ...}}
 
-        return a == b
+        load_tree_from_mod와 같은 방식으로 filename 선언을 파일에 연결하고,
+        그 리소스를 참조하는 섹션의 match_first_index를 모은다.
+        """
+        mod_root = self.mod_root
+        path_table = self.mod_path_table
+        if not mod_root or path_table is None:
+            return {}
+        result = {}
+        for ini_rel, index in self.ini_indexes.items():
+            for declared, section_idx in index.declarations:
+                file_rel = path_table.get(resolve_declared_path(mod_root, ini_rel, declared))
+                if file_rel is None:
+                    continue
+                for comp, first_index in index.first_indexes_for(section_idx):
+                    result.setdefault(file_rel, {}).setdefault(comp, set()).add(first_index)
+        return result
 
     def _cache_ini_files(self, mod_root, ini_files):
-        """INI 읽기 및 캐시"""
+        """INI 읽기 및 캐시 (읽으면서 INI 인덱스도 함께 생성)
+
+        - 디스크 캐시에 같은 크기/수정 시각의 INI가 있으면 읽지 않고 저장된 인덱스를 사용
+          (이 경우 해당 INI는 ini_contents에 들어가지 않음)
+        - 나머지는 스레드 풀에서 동시에 바이트로 읽고 인코딩을 감지하여 디코딩
+        - 감지한 인코딩은 ini_encodings에 기록 (내보내기 때 같은 인코딩으로 다시 씀)
+        """
         self.ini_contents = {}
+        self.ini_indexes = {}
+        self.ini_digests = {}
+        self.ini_encodings = {}
+        cached_inis = (self.mod_cache_entry or {}).get("inis", {})
+        reused = 0
+
+        to_read = []
         for ini_rel in ini_files:
-            ini_path = os.path.join(mod_root, ini_rel)
+            prev = cached_inis.get(ini_rel)
+            stat = self.mod_stats.get(ini_rel)
+            if prev and stat and [prev["size"], prev["mtime"]] == list(stat):
+                self.ini_indexes[ini_rel] = index_from_dict(prev["index"])
+                self.ini_digests[ini_rel] = prev["digest"]
+                self.ini_encodings[ini_rel] = prev.get("encoding", "utf-8")
+                reused += 1
+            else:
+                to_read.append(ini_rel)
+
+        def _read(ini_rel):
             try:
-                with open(ini_path, encoding="utf-8") as f:
-                    text = f.read()
+                return read_text(os.path.join(mod_root, ini_rel)), None
             except Exception as e:
-                self.ui.log(f"INI 읽기 실패: {ini_rel} -> {e}")
-                continue
+                return None, e
+
+        workers = max(1, min(INI_READ_WORKERS, len(to_read)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_read, to_read)
+            for done, (ini_rel, (loaded, error)) in enumerate(zip(to_read, results)):
+                self._check_cancelled(f"INI 읽는 중: {done}/{len(to_read)}")
+                if error is not None:
+                    self.ui.log(f"INI 읽기 실패: {ini_rel} -> {error}")
+                    continue
 
-            self.ini_contents[ini_rel] = text
+                text, encoding, data = loaded
+                if encoding not in ("utf-8", "utf-8-sig"):
+                    log_detail(self.ui, f"INI 인코딩 감지: {ini_rel} -> {encoding}")
+
+                digest = content_digest(data)
+                prev = cached_inis.get(ini_rel)
+                self.ini_contents[ini_rel] = text
+                self.ini_digests[ini_rel] = digest
+                self.ini_encodings[ini_rel] = encoding
+                if prev and prev.get("digest") == digest:
+                    self.ini_indexes[ini_rel] = index_from_dict(prev["index"])
+                    reused += 1
+                else:
+                    self.ini_indexes[ini_rel] = build_ini_index(text)
+
+        # INI 순서는 파일 목록 순서를 따른다 (매칭 결과 순서 유지)
+        self.ini_indexes = {
+            ini_rel: self.ini_indexes[ini_rel]
+            for ini_rel in ini_files
+            if ini_rel in self.ini_indexes
+        }
+
+        self.ui.log(
+            f"INI 읽기 완료: {len(self.ini_indexes)}개 캐시됨 (변경 없음 {reused}개 재사용)"
+        )
 
-        self.ui.log(f"INI 읽기 완료: {len(self.ini_contents)}개 캐시됨")
+    # ---------- 디스크 캐시 ----------
+    def _match_cache(self):
+        config = getattr(self.ui, "config", None) or {}
+        return MatchCache(config.get("cache_folder") or os.path.abspath("cache"))
 
-    def _get_section_at_pos(self, text, pos):
-        """pos 위치의 섹션명과 범위 반환"""
-        section_pattern = re.compile(r"^\s*\[(?P<section>[^\]]+)\]", re.MULTILINE)
-        starts = [(m.start(), m.group("section")) for m in section_pattern.finditer(text)]
-        if not starts:
-            return None, 0, len(text)
+    def _load_mod_cache(self, folder):
+        """저장된 캐시 항목과 이전 스캔 목록(manifest)을 불러온다"""
+        try:
+            self.mod_cache_entry = self._match_cache().load(folder)
+        except Exception:
+            self.mod_cache_entry = None
+        self.mod_manifest = (self.mod_cache_entry or {}).get("manifest")
 
-        sec_idx = None
-        for i, (spos, name) in enumerate(starts):
-            if spos <= pos:
-                sec_idx = i
-            else:
-                break
+    def _scan_mod_folder(self, folder, check_cancelled=None):
+        """이전 manifest 기준으로 증분 스캔하고 파일 목록/폴더 지문을 갱신
 
-        if sec_idx is None:
-            return None, 0, len(text)
+        (mod_manifest 교체는 호출한 쪽에서 변경 내역을 확인한 뒤에 한다)
+        """
+        scan = scan_directory(folder, self.mod_manifest, check_cancelled)
+        self._use_scan(scan)
+        return scan
+
+    def _use_scan(self, scan):
+        """스캔 결과로 파일 목록/분류/크기·수정 시각/폴더 지문 갱신"""
+        self.mod_files = scan.files
+        self.mod_buckets = scan.buckets
+        self.mod_stats = scan.stats
+        self.mod_fingerprint = folder_fingerprint(
+            [(rel, size, mtime) for rel, (size, mtime) in scan.stats.items()]
+        )
 
-        sec_start = starts[sec_idx][0]
-        sec_name = starts[sec_idx][1]
-        sec_end = len(text) if sec_idx + 1 >= len(starts) else starts[sec_idx + 1][0]
-        return sec_name, sec_start, sec_end
+    def _bucket_files(self, mod_files, *buckets):
+        """스캔 분류(mod_buckets)에서 파일 목록을 꺼냄 (정렬, 분류가 없으면 확장자로 나눔)"""
+        if self.mod_buckets:
+            return sorted(f for bucket in buckets for f in self.mod_buckets.get(bucket, ()))
+        return [f for f in mod_files if bucket_of(f) in buckets]
 
-    def _find_components_in_ini_for_file(
-        self, ini_rel, text, file_rel, filename_pattern, section_pattern, kv_pattern
-    ):
-        """INI에서 파일에 매핑되는 컴포넌트를 검색
+    def _fingerprint_matches(self, mod_files):
+        return bool(self.mod_fingerprint) and set(mod_files) == set(self.mod_stats)
 
-        반환: ([(component, hash, section)], checked_sections)
-        """
-        found = []
-        checked_sections = set()
+    def _restore_from_cache(self, mod_files):
+        entry = self.mod_cache_entry
+        if not entry or entry.get("fingerprint") != self.mod_fingerprint:
+            return None
+        try:
+            self.ini_indexes = {
+                ini_rel: index_from_dict(item["index"])
+                for ini_rel, item in entry["inis"].items()
+            }
+            self.ini_digests = {
+                ini_rel: item["digest"] for ini_rel, item in entry["inis"].items()
+            }
+            self.ini_encodings = {
+                ini_rel: item.get("encoding", "utf-8")
+                for ini_rel, item in entry["inis"].items()
+            }
+            rows = [tuple(row) for row in entry["rows"]]
+        except (KeyError, TypeError, IndexError):
+            return None
 
-        for m in filename_pattern.finditer(text):
-            declared = m.group("dq") or m.group("sq") or m.group("noq")
-            try:
-                if not self.ini_filename_points_to(ini_rel, declared, file_rel):
-                    continue
-            except Exception:
-                continue
-
-            # filename 선언이 속한 섹션
-            section_name, _, _ = self._get_section_at_pos(text, m.start())
-            checked_sections.add(section_name or "")
-
-            if section_name:
-                target = section_name.strip()
-                # 'key = 섹션명' 형태를 전체 INI에서 검색
-                for kv in kv_pattern.finditer(text):
-                    key = kv.group("key")
-                    value = (kv.group("dq") or kv.group("sq") or kv.group("noq") or "").strip()
-                    if value != target:
-                        continue
-
-                    k = key.lower()
-                    comp = None
-                    if k == "ib":
-                        comp = "IB"
-                    elif k == "vb0":
-                        comp = "Position"
-                    elif k == "vb2":
-                        comp = "Blend"
-                    elif k == "vb1":
-                        comp = "Texcoord"
-
-                    if comp:
-                        # 컴포넌트 선언이 있는 섹션에서 hash 추출
-                        kv_pos = kv.start()
-                        comp_section_name, comp_sec_start, comp_sec_end = self._get_section_at_pos(text, kv_pos)
-                        comp_section_text = text[comp_sec_start:comp_sec_end]
-
-                        hval = ""
-                        for hkv in kv_pattern.finditer(comp_section_text):
-                            hkey = hkv.group("key").lower()
-                            if hkey == "hash":
-                                hval = hkv.group("dq") or hkv.group("sq") or hkv.group("noq") or ""
-                                break
-
-                        found.append((comp, hval, comp_section_name))
-
-        # 동일 컴포넌트 중복 제거
-        unique = []
-        seen = set()
-        for comp, hval, sec in found:
-            if comp not in seen:
-                seen.add(comp)
-                unique.append((comp, hval, sec))
-
-        return unique, checked_sections
+        self.ini_contents = {}
+        self.mod_resource_files = self._bucket_files(mod_files, "ib", "buf", "assets")
+        self.mod_rows = rows
+        self._rows_fingerprint = self.mod_fingerprint
+        return list(rows)
+
+    def _save_mod_cache(self, rows):
+        self.mod_rows = rows
+        self._rows_fingerprint = self.mod_fingerprint
+        entry = {
+            "fingerprint": self.mod_fingerprint,
+            "manifest": self.mod_manifest,
+            "inis": {
+                ini_rel: {
+                    "size": self.mod_stats[ini_rel][0],
+                    "mtime": self.mod_stats[ini_rel][1],
+                    "digest": self.ini_digests.get(ini_rel, ""),
+                    "encoding": self.ini_encodings.get(ini_rel, "utf-8"),
+                    "index": index_to_dict(index),
+                }
+                for ini_rel, index in self.ini_indexes.items()
+                if ini_rel in self.mod_stats
+            },
+            "rows": [list(row) for row in rows],
+        }
+        try:
+            self._match_cache().save(self.mod_root, entry)
+            self.mod_cache_entry = entry
+        except Exception as e:
+            self.ui.log(f"매칭 캐시 저장 실패: {e}")
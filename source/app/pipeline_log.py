@@ -0,0 +1,175 @@
+"""단계별 로거 (내보내기, 엵툵 실행, 매처가 함께 사용)
+
+큰 모드는 치환 한 번, 삭제한 줄 하나마다 로그가 나와 화면 로그가 실제 작업보다 오래 걸립니다.
+- 레벨: detail(개별 치환/이동), info(단계 요약), warning
+- sink(화면 등)에는 level 이상만 보내고, log_file에는 모든 레벨을 시각과 함께 기록
+- 단계는 내보내기 과정이 stage("[4단계] ...")로 직접 시작하고 flush하면 끝남. 단계별 줄 수를 세고,
+  단계가 바뀌거나 flush할 때 그 단계에서 sink로 보내지 않은 줄 수를 한 줄로 알림
+- 단계 안에서 sink로 보내는 detail/info 줄은 stage_limit개까지 (넘는 줄은 log_file에만 남김).
+  warning과 단계 밖의 로그(매처, export_vb 출력 등)는 줄이지 않고, log_file이 없으면 제한하지 않음
+"""
+
+import os
+import threading
+from datetime import datetime
+
+DETAIL = 10
+INFO = 20
+WARNING = 30
+LEVELS = {"detail": DETAIL, "info": INFO, "warning": WARNING}
+_LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+DEFAULT_STAGE_LIMIT = 500
+
+
+def log_detail(logger, msg):
+    """상세 로그 (단계별 로거가 아닌 logger면 일반 로그로)"""
+    detail = getattr(logger, "detail", None)
+    if detail is not None:
+        detail(msg)
+    else:
+        logger.log(msg)
+
+
+def log_stage(logger, msg):
+    """단계 시작 로그 (단계별 로거가 아닌 logger면 일반 로그로)"""
+    stage = getattr(logger, "stage", None)
+    if callable(stage):
+        stage(msg)
+    else:
+        logger.log(msg)
+
+
+def _level_value(level):
+    if isinstance(level, int):
+        return level
+    return LEVELS.get(str(level).lower(), INFO)
+
+
+class PipelineLogger:
+    """단계별 로거
+
+    sink: 로그를 받을 대상 (.log가 있는 객체 또는 함수, 없으면 print)
+    level: sink로 보낼 최소 레벨 ("detail", "info", "warning" 또는 DETAIL/INFO/WARNING)
+    log_file: 모든 레벨을 기록할 파일 경로 (선택, 이어 쓰기)
+    stage_limit: 한 단계에서 sink로 보낼 최대 detail/info 줄 수 (0이거나 log_file이 없으면 제한 없음)
+    """
+
+    def __init__(self, sink=None, level="info", log_file=None, stage_limit=DEFAULT_STAGE_LIMIT):
+        self.sink = sink
+        self.level = _level_value(level)
+        self.log_file = log_file or None
+        self.stage_limit = stage_limit
+        self.current_stage = None
+        self.counters = {}  # 단계 -> {레벨명: 줄 수}
+        self._shown = 0
+        self._hidden = 0
+        self._limited = 0
+        self._file = None
+        self._lock = threading.RLock()
+
+    def log(self, msg, level=INFO):
+        msg = str(msg)
+        with self._lock:
+            counts = self.counters.setdefault(self.current_stage, {})
+            name = _LEVEL_NAMES.get(level, "info")
+            counts[name] = counts.get(name, 0) + 1
+            self._write_file(level, msg)
+            if level < self.level:
+                self._hidden += 1
+                return
+            if level < WARNING and self._limit_reached():
+                self._limited += 1
+                return
+            self._shown += 1
+        self._emit(msg)
+
+    def stage(self, msg):
+        """새 단계 시작 ("[4단계] ..."처럼 '[이름]'으로 시작하면 그 이름을 단계 이름으로)"""
+        msg = str(msg)
+        with self._lock:
+            self._begin_stage(msg.split("]", 1)[0] + "]" if msg.startswith("[") else msg)
+            self.log(msg)
+
+    def detail(self, msg):
+        self.log(msg, DETAIL)
+
+    def warning(self, msg):
+        self.log(msg, WARNING)
+
+    def flush(self):
+        """현재 단계를 끝내고 그 단계에서 sink로 보내지 않은 줄 수를 알림"""
+        with self._lock:
+            note = self._stage_note()
+            self.current_stage = None
+            self._shown = self._hidden = self._limited = 0
+            if self._file is not None:
+                self._file.flush()
+        if note:
+            self._emit(note)
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _begin_stage(self, stage):
+        note = self._stage_note()
+        self.current_stage = stage
+        self._shown = self._hidden = self._limited = 0
+        if note:
+            self._emit(note)
+
+    def _limit_reached(self):
+        # 단계 밖이거나 넘는 줄을 남길 log_file이 없으면 줄이지 않음
+        if self.current_stage is None or not self.stage_limit or not self.log_file:
+            return False
+        return self._shown >= self.stage_limit
+
+    def _stage_note(self):
+        parts = []
+        if self._hidden:
+            parts.append(f"상세 로그 {self._hidden}줄")
+        if self._limited:
+            parts.append(f"단계당 {self.stage_limit}줄 제한으로 {self._limited}줄")
+        if not parts:
+            return None
+        where = f", 전체 로그: {self.log_file}" if self.log_file else ""
+        return f"    ({', '.join(parts)} 생략{where})"
+
+    def _write_file(self, level, msg):
+        if not self.log_file:
+            return
+        try:
+            if self._file is None:
+                folder = os.path.dirname(os.path.abspath(self.log_file))
+                os.makedirs(folder, exist_ok=True)
+                self._file = open(self.log_file, "a", encoding="utf-8")
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self._file.write(f"[{timestamp}] {_LEVEL_NAMES.get(level, 'info'):7} {msg}\n")
+        except OSError:
+            # 로그 파일을 쓸 수 없으면 파일 기록만 끔
+            self.log_file = None
+
+    def _emit(self, msg):
+        try:
+            if self.sink is None:
+                print(msg)
+            elif hasattr(self.sink, "log"):
+                self.sink.log(msg)
+            else:
+                self.sink(msg)
+        except Exception:
+            try:
+                print(msg)
+            except Exception:
+                pass
@@ -0,0 +1,255 @@
+"""파일 이동/이름 변경 계획 (2-1 ~ 3-2단계)
+
+출력 폴더를 한 번만 훑어 메모리에 (최상위 이름, 전체 파일) 목록을 만들고,
+예전 단계별 동작(최상위로 이동, IB 확장자 변경, .assets 확장자 교체, INI 이동,
+임시 이름을 거친 최종 이름 변경)을 그 목록 위에서 그대로 흉내 내어 파일마다 최종 이름을 정합니다.
+이름 충돌 검사도 목록에서만 하므로 실제 파일 시스템 작업은 파일당 이름 변경 한 번입니다.
+- 최종 이름이 아직 다른 파일 자리이면 그 파일이 먼저 옮겨진 뒤에 옮김
+- 서로 자리를 바꾸는 순환이 있을 때만 임시 이름을 한 번 더 거침
+- 같은 파일을 여러 슬롯에 할당하면 첫 슬롯은 이름 변경, 나머지는 복사
+"""
+
+import os
+import shutil
+import uuid
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from app.pipeline_log import log_detail, log_stage
+
+
+def _key(rel_path):
+    return os.path.normcase(os.path.normpath(rel_path))
+
+
+def _has_sep(path):
+    return '/' in path or '\\' in path
+
+
+def _walk_order(rel_path):
+    """os.walk(위에서 아래로)처럼 폴더의 파일을 하위 폴더보다 먼저, 이름순으로"""
+    parts = rel_path.replace('\\', '/').split('/')
+    return [(1, part.lower()) for part in parts[:-1]] + [(0, parts[-1].lower())]
+
+
+class DirectoryView:
+    """출력 폴더의 메모리 사본 (os.path.exists와 같은 대소문자 규칙)
+
+    files/dirs: 출력 폴더 기준 파일/폴더 경로 (디스크를 읽지 않고 미리보기할 때는 예상 목록)
+    """
+
+    def __init__(self, files, dirs=()):
+        self.paths = {_key(rel_path) for rel_path in files}
+        self.paths |= {_key(rel_dir) for rel_dir in dirs if rel_dir}
+        self.ini_files = sorted(
+            (rel_path for rel_path in files if rel_path.lower().endswith('.ini')),
+            key=_walk_order,
+        )
+
+    @classmethod
+    def from_disk(cls, root_path):
+        files = []
+        dirs = []
+        for r, d, fs in os.walk(root_path):
+            rel_dir = os.path.relpath(r, root_path)
+            dirs.extend(os.path.join(rel_dir, name) for name in d)
+            files.extend(os.path.relpath(os.path.join(r, f), root_path) for f in fs)
+        return cls(files, dirs)
+
+    def exists(self, rel_path):
+        return _key(rel_path) in self.paths
+
+    def move(self, src, dst):
+        self.paths.discard(_key(src))
+        self.paths.add(_key(dst))
+
+    def remove(self, rel_path):
+        self.paths.discard(_key(rel_path))
+
+    def add(self, rel_path):
+        self.paths.add(_key(rel_path))
+
+    def unique_name(self, base, ext):
+        """최상위에서 쓰이지 않은 이름 (base.ext, base_1.ext, ...)"""
+        name = f"{base}{ext}"
+        counter = 1
+        while self.exists(name):
+            name = f"{base}_{counter}{ext}"
+            counter += 1
+        return name
+
+
+@dataclass
+class FileMove:
+    src: str  # 출력 폴더 기준 원래 경로
+    dst: str  # 최상위 최종 이름
+    copy: bool = False  # 같은 파일을 다른 슬롯에도 할당한 경우 (dst로 복사)
+
+
+@dataclass
+class RenamePlan:
+    matched_pairs: List[Tuple[str, str]] = field(default_factory=list)  # (슬롯, 최종 파일명)
+    moved_filenames: List[str] = field(default_factory=list)  # 최상위로 옮긴 뒤(임시 이름 전) 파일명
+    original_paths: List[str] = field(default_factory=list)
+    ini_files: List[str] = field(default_factory=list)
+    ini_origins: List[str] = field(default_factory=list)
+    moves: List[FileMove] = field(default_factory=list)
+
+
+def _plan_move_to_top(view, matched_file, is_ib, logger):
+    """2-1단계: 서브폴더 파일은 최상위로, IB 슬롯이면 확장자를 .ib로 -> (원래 경로, 옮긴 이름)"""
+    # 경우1: 서브폴더에 있던 파일을 최상위로 이동
+    if view.exists(matched_file) and _has_sep(matched_file):
+        base, ext = os.path.splitext(os.path.basename(matched_file))
+        desired_ext = '.ib' if is_ib else ext
+        filename = view.unique_name(base, desired_ext)
+        view.move(matched_file, filename)
+        if is_ib and ext.lower() != '.ib':
+            log_detail(logger, f"이동 및 확장자 변경(IB): {matched_file} -> {filename}")
+        else:
+            log_detail(logger, f"이동: {matched_file} -> {filename}")
+        return matched_file, filename
+
+    # 경우2: 이미 최상위에 있는 파일
+    moved = os.path.basename(matched_file)
+    base, ext = os.path.splitext(moved)
+    if is_ib and ext.lower() != '.ib' and view.exists(moved):
+        filename = view.unique_name(base, '.ib')
+        view.move(moved, filename)
+        log_detail(logger, f"확장자 변경(IB): {moved} -> {filename}")
+        return moved, filename
+    return (moved if view.exists(moved) else None), moved
+
+
+def _plan_assets(view, slot_name, filename, is_ib, logger):
+    """.assets 파일을 슬롯 유형에 맞게 확장자 교체 (IB -> .ib, Blend/Position/Texcoord -> .buf)"""
+    if not filename or not filename.lower().endswith('.assets'):
+        return filename
+    base = os.path.splitext(filename)[0]
+    if is_ib:
+        new_ext = '.ib'
+    elif any(x in slot_name for x in ("Blend", "Position", "Texcoord")):
+        new_ext = '.buf'
+    else:
+        logger.log(f"    .assets 보류 (슬롯 미확인): {slot_name} -> {filename}")
+        return filename
+    if not view.exists(filename):
+        logger.log(f"    파일 없음(.assets 처리 건너뜀): {filename}")
+        return filename
+    final_name = view.unique_name(base, new_ext)
+    view.move(filename, final_name)
+    log_detail(logger, f"    .assets -> {new_ext} 교체: {filename} -> {final_name}")
+    return final_name
+
+
+def plan_renames(output_mod_path, matched_pairs, ib_slots, logger, view=None):
+    """2-1 ~ 3-2단계의 이동/이름 변경을 계산만 함 (파일 시스템은 읽기만) -> RenamePlan
+
+    view: 출력 폴더 목록 (생략하면 output_mod_path를 읽어서 만듦)
+    """
+    if view is None:
+        view = DirectoryView.from_disk(output_mod_path)
+    plan = RenamePlan()
+    plan.ini_files = list(view.ini_files)
+    plan.ini_origins = list(view.ini_files)
+    plan.original_paths = [matched_file for _, matched_file in matched_pairs]
+
+    # 2-1단계: 매칭 파일을 최상위로 (같은 파일이 다시 나오면 처음 옮긴 이름을 공유)
+    log_stage(logger, "[2-1단계] 매칭된 파일과 ini 파일을 최상위 폴더로 이동 계산 중...")
+    sources = []  # 슬롯별 (원래 경로 또는 None, 처음 할당된 슬롯인지)
+    moved_names = []
+    first_by_source = {}
+    for slot_name, matched_file in matched_pairs:
+        is_ib = slot_name in ib_slots
+        source_key = _key(matched_file)
+        if source_key in first_by_source:
+            idx = first_by_source[source_key]
+            sources.append((sources[idx][0], False))
+            moved_names.append(moved_names[idx])
+            log_detail(logger, f"    같은 파일을 다른 슬롯에도 할당(복사 예정): {matched_file} -> {slot_name}")
+            continue
+        src, filename = _plan_move_to_top(view, matched_file, is_ib, logger)
+        filename = _plan_assets(view, slot_name, filename, is_ib, logger)
+        first_by_source[source_key] = len(sources)
+        sources.append((src, True))
+        moved_names.append(filename)
+    plan.moved_filenames = list(moved_names)
+
+    # INI 파일 이동 (기존 동작 유지)
+    for idx, ini_file in enumerate(plan.ini_files):
+        if _has_sep(ini_file):
+            base_name, ext = os.path.splitext(os.path.basename(ini_file))
+            filename = view.unique_name(base_name, ext)
+            view.move(ini_file, filename)
+            plan.ini_files[idx] = filename
+            plan.moves.append(FileMove(ini_file, filename))
+            log_detail(logger, f"이동: {ini_file} -> {filename}")
+
+    # 3-1단계: 매칭 파일이 임시 이름으로 비켜난 상태
+    for (src, first), moved in zip(sources, moved_names):
+        if src is not None and first:
+            view.remove(moved)
+
+    # 3-2단계: 최종 이름 = 슬롯 이름 + 확장자 (이미 있으면 _1, _2 ...)
+    log_stage(logger, "[3단계] 최종 파일명 계산 중...")
+    for (slot_name, _), (src, first), moved in zip(matched_pairs, sources, moved_names):
+        ext = os.path.splitext(moved)[1]
+        if not first and slot_name in ib_slots:
+            ext = '.ib'
+        final_filename = view.unique_name(slot_name, ext)
+        view.add(final_filename)
+        plan.matched_pairs.append((slot_name, final_filename))
+        if src is None:
+            logger.log(f"    파일 없음(이름 변경 건너뜀): {moved} -> {final_filename}")
+            continue
+        plan.moves.append(FileMove(src, final_filename, copy=not first))
+        log_detail(logger, f"최종 변경: {moved} -> {final_filename}")
+
+    return plan
+
+
+def apply_plan(output_mod_path, plan, logger):
+    """계획한 이름 변경을 적용 (파일당 한 번, 순환일 때만 임시 이름 사용) -> 실제 작업 수"""
+    renames = [move for move in plan.moves if not move.copy and move.src != move.dst]
+    copies = [move for move in plan.moves if move.copy]
+    first_dst = {}  # 원래 경로 -> 이름 변경 후 경로 (복사 원본)
+    for move in plan.moves:
+        if not move.copy:
+            first_dst[_key(move.src)] = move.dst
+
+    pending = {_key(move.src): move for move in renames}
+    ops = 0
+    temps = 0
+    while pending:
+        progressed = False
+        for src_key, move in list(pending.items()):
+            dst_key = _key(move.dst)
+            # 대소문자만 바꾸는 경우(윈도우)는 자기 자신 자리이므로 바로 변경
+            if dst_key in pending and dst_key != src_key:
+                continue
+            os.rename(os.path.join(output_mod_path, move.src), os.path.join(output_mod_path, move.dst))
+            del pending[src_key]
+            ops += 1
+            progressed = True
+        if progressed:
+            continue
+        # 자리 바꾸기 순환: 하나를 임시 이름으로 비켜 둔다
+        src_key, move = next(iter(pending.items()))
+        temp_name = f"TEMP_{uuid.uuid4().hex}{os.path.splitext(move.src)[1]}"
+        os.rename(os.path.join(output_mod_path, move.src), os.path.join(output_mod_path, temp_name))
+        del pending[src_key]
+        pending[_key(temp_name)] = FileMove(temp_name, move.dst)
+        ops += 1
+        temps += 1
+
+    for move in copies:
+        src = first_dst.get(_key(move.src), move.src)
+        shutil.copy2(os.path.join(output_mod_path, src), os.path.join(output_mod_path, move.dst))
+        ops += 1
+
+    logger.log(
+        f"    파일 작업 {ops}회 (이름 변경 {len(renames)}개, 복사 {len(copies)}개"
+        + (f", 순환 임시 이름 {temps}개" if temps else "")
+        + ")"
+    )
+    return ops
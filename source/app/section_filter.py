@@ -0,0 +1,163 @@
+"""섹션 필터 (4-2단계)
+
+INI를 한 번만 (헤더, 본문 줄) 블록으로 나눈 뒤 규칙 목록을 차례로 적용해
+남길 섹션과 삭제할 섹션을 정합니다. 섹션마다 처음으로 걸린 규칙 하나만 적용되며,
+삭제된 섹션 이름은 규칙의 strip_references 설정에 따라 참조 제거 대상으로 모읍니다.
+새 규칙은 SECTION_RULES에 추가하면 됩니다 (규칙 수가 늘어도 INI는 한 번만 훑음).
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from app.pipeline_log import log_detail
+
+_FILENAME_VALUE = re.compile(r'(?i)filename\s*=\s*(.*)')
+_FORMAT_LINE = re.compile(r'(?i)format\s*=\s*')
+_POSITION_SUBFILE = re.compile(r'position\.')
+
+
+@dataclass
+class SectionBlock:
+    name: Optional[str]  # 첫 헤더 이전 부분은 None
+    lines: List[str] = field(default_factory=list)  # 헤더 줄 포함
+
+    @property
+    def body(self):
+        return self.lines[1:] if self.name is not None else self.lines
+
+    @property
+    def is_resource(self):
+        return self.name is not None and self.name.startswith('Resource')
+
+    def has_filename_line(self):
+        return any(ln.strip().lower().startswith('filename') for ln in self.body)
+
+    def has_format(self):
+        return any(_FORMAT_LINE.match(ln.strip()) for ln in self.body)
+
+    def filename_value(self):
+        """마지막 filename = 값 (따옴표 제거), 없으면 None"""
+        value = None
+        for ln in self.body:
+            m = _FILENAME_VALUE.match(ln.strip())
+            if m:
+                val = m.group(1).strip()
+                if (val.startswith('"') and val.endswith('"')) or (val.startswith("'") and val.endswith("'")):
+                    val = val[1:-1]
+                value = val
+        return value
+
+
+@dataclass
+class SectionRule:
+    label: str
+    drops: Callable[[SectionBlock], bool]
+    strip_references: bool = False
+
+
+def _is_cs_resource(block):
+    # 붕스 대응
+    return block.is_resource and block.name.endswith('CS')
+
+
+def _has_no_filename(block):
+    # copy vb 대응
+    return block.is_resource and not block.has_filename_line()
+
+
+def _is_fake_ib(block):
+    if not block.is_resource or not block.has_format():
+        return False
+    value = block.filename_value()
+    return bool(value) and os.path.splitext(value)[1].lower() != '.ib'
+
+
+def _is_position_subfile(block):
+    # slider 모드 대응 (예: Position.Boobs.buf)
+    if not block.is_resource:
+        return False
+    value = block.filename_value()
+    if not value:
+        return False
+    base_l = os.path.splitext(os.path.basename(value))[0].lower()
+    return bool(_POSITION_SUBFILE.search(base_l)) and not base_l.endswith('position')
+
+
+SECTION_RULES = [
+    # 4-2-1: Resource로 시작하고 CS로 끝나는 섹션
+    SectionRule("CS 섹션", _is_cs_resource),
+    # 4-2-2: Resource로 시작하는데 filename=이 없는 섹션 (참조도 제거)
+    SectionRule("filename 없는 섹션", _has_no_filename, strip_references=True),
+    # 4-2-3: format=이 있지만 filename 확장자가 .ib가 아닌 섹션 (참조도 제거)
+    SectionRule("format 있으나 .ib 아님", _is_fake_ib, strip_references=True),
+    # 4-2-4: filename이 Position의 서브파일인 섹션
+    SectionRule("Position 서브파일", _is_position_subfile),
+]
+
+
+def parse_blocks(ini_content):
+    """INI -> [SectionBlock] (헤더 줄: 앞뒤 공백 제거 후 [ ]로 감싼 줄)"""
+    blocks = [SectionBlock(None)]
+    for line in ini_content.split('\n'):
+        s = line.strip()
+        if s.startswith('[') and s.endswith(']'):
+            blocks.append(SectionBlock(s[1:-1].strip(), [line]))
+        else:
+            blocks[-1].lines.append(line)
+    return blocks
+
+
+def filter_sections(ini_content, logger, rules=None, dropped=None):
+    """규칙에 걸린 섹션을 통째로(헤더~다음 헤더 직전) 삭제
+
+    dropped: 리스트를 주면 삭제한 섹션을 (섹션명, 규칙 이름)으로 추가
+    반환: (ini_content, 참조를 제거할 섹션 이름 목록)
+    """
+    rules = SECTION_RULES if rules is None else rules
+    kept = []
+    strip_names = []
+    for block in parse_blocks(ini_content):
+        rule = None
+        if block.name is not None:
+            rule = next((r for r in rules if r.drops(block)), None)
+        if rule is None:
+            kept.extend(block.lines)
+            continue
+        log_detail(logger, f"    섹션 삭제 ({rule.label}): {block.name}")
+        if dropped is not None:
+            dropped.append((block.name, rule.label))
+        if rule.strip_references and block.name not in strip_names:
+            strip_names.append(block.name)
+    return '\n'.join(kept), strip_names
+
+
+def _reference_pattern(section_names):
+    """삭제한 섹션 이름 전체를 한 번에 찾는 정규식 (이름이 토큰 단위로 쓰인 곳만)
+
+    3DMigoto는 섹션 이름을 대소문자 구분 없이 찾으므로 IGNORECASE로 맞추고,
+    긴 이름을 먼저 두어 한 이름이 다른 이름의 앞부분인 경우에도 전체가 잡히게 한다.
+    앞뒤가 영문/숫자/_/. 인 곳(예: ResourceBodyIB 안의 ResourceBody)은 참조로 보지 않는다.
+    """
+    names = sorted(set(section_names), key=len, reverse=True)
+    return re.compile(
+        r'(?<![\w.])(?:%s)(?![\w.])' % "|".join(re.escape(n) for n in names),
+        flags=re.IGNORECASE,
+    )
+
+
+def strip_references(ini_content, section_names, logger):
+    """삭제한 섹션 이름을 참조하는 줄 제거 (섹션 헤더 줄은 제외)"""
+    if not section_names:
+        return ini_content
+    pattern = _reference_pattern(section_names)
+    kept = []
+    for line in ini_content.split('\n'):
+        line_stripped = line.strip()
+        if not (line_stripped.startswith('[') and line_stripped.endswith(']')):
+            if pattern.search(line):
+                log_detail(logger, f"    참조 제거: {line_stripped}")
+                continue
+        kept.append(line)
+    return '\n'.join(kept)
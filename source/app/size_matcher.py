@@ -0,0 +1,156 @@
+"""크기 기반 보조 매칭
+
+게임 버전이 바뀌어 INI 해시가 hash.json과 맞지 않을 때 쓰는 보조 매처입니다.
+파일 내용은 읽지 않고 os.stat 크기만 사용합니다.
+- 에셋 버퍼 이름: 슬롯 이름({에셋}{컴포넌트}{키}.buf, IB는 {에셋}{컴포넌트}{파트}.ib)
+- Position/Blend/Texcoord는 같은 정점 수를 공유하므로 세 파일 크기의 비율이
+  stride 비율과 같다 -> 에셋 크기 비율과 같은 비율의 모드 .buf 묶음을 후보로 삼음
+- IB는 삼각형 단위(R32 3개 = 12바이트, R16 3개 = 6바이트)로 나눠떨어지는
+  에셋 IB와 크기(인덱스 수)가 같은 모드 .ib를 후보로 삼음
+- 후보가 여럿이면 모드 INI 매칭 결과(슬롯 종류 일치)와 크기 차이로 순위를 정하고,
+  1등이 하나로 정해지지 않으면 제안하지 않음
+"""
+
+import math
+import os
+
+VB_KEYS = ("Position", "Blend", "Texcoord")
+IB_KEY = "IB"
+
+# 인덱스 버퍼 삼각형 하나의 바이트 수 (R32_UINT, R16_UINT)
+IB_TRIANGLE_BYTES = (12, 6)
+
+
+def slot_stem(asset_name, comp_name, key, variant=None):
+    """내보내기 때 쓰는 슬롯 이름 (ini_modifier._collect_matched_pairs와 같은 규칙)"""
+    if key.lower() == "ib":
+        return f"{asset_name}{comp_name}{variant or ''}"
+    return f"{asset_name}{comp_name}{variant or ''}{key}"
+
+
+def _sizes_by_stem(stats, extension):
+    """{파일 이름(확장자 제외, 소문자): 크기}"""
+    result = {}
+    for rel_path, (size, _mtime) in stats.items():
+        stem, ext = os.path.splitext(os.path.basename(rel_path))
+        if ext.lower() == extension:
+            result[stem.lower()] = size
+    return result
+
+
+def _asset_size(asset_sizes, asset_name, comp_name, key, variant=None):
+    """슬롯에 해당하는 에셋 버퍼 크기 (정확한 슬롯 이름, 없으면 유일한 접미사 일치)"""
+    stem = slot_stem(asset_name, comp_name, key, variant).lower()
+    if stem in asset_sizes:
+        return asset_sizes[stem]
+    suffix = slot_stem("", comp_name, key, variant).lower()
+    found = [size for name, size in asset_sizes.items() if name.endswith(suffix)]
+    return found[0] if len(found) == 1 else None
+
+
+def _files_by_size(stats, extension):
+    """{크기: [상대 경로]} (빈 파일 제외)"""
+    result = {}
+    for rel_path, (size, _mtime) in stats.items():
+        if size and rel_path.lower().endswith(extension):
+            result.setdefault(size, []).append(rel_path)
+    return result
+
+
+def _rank(candidates):
+    """(점수, 값) 목록에서 점수가 가장 높은 값이 하나뿐이면 반환"""
+    if not candidates:
+        return None
+    candidates.sort(key=lambda c: c[0], reverse=True)
+    if len(candidates) > 1 and candidates[0][0] == candidates[1][0]:
+        return None
+    return candidates[0][1]
+
+
+def _propose_vertex_buffers(asset_vb, mod_bufs, labels):
+    """에셋 VB 크기 비율과 같은 모드 .buf 묶음 제안 -> {키: 파일}"""
+    keys = [key for key in VB_KEYS if asset_vb.get(key)]
+    if not keys:
+        return {}
+    base_key = keys[0]
+    base_size = asset_vb[base_key]
+
+    candidates = []
+    for size, base_files in mod_bufs.items():
+        # 비교할 비율이 없으면 크기가 같은 파일만
+        if len(keys) == 1 and size != base_size:
+            continue
+        # 모든 키의 크기가 같은 정점 수 비율로 정수가 되어야 함
+        sizes = {}
+        for key in keys:
+            scaled = size * asset_vb[key]
+            if scaled % base_size:
+                break
+            sizes[key] = scaled // base_size
+        else:
+            for base_file in base_files:
+                combos = [{base_key: base_file}]
+                for key in keys[1:]:
+                    files = mod_bufs.get(sizes[key], [])
+                    combos = [
+                        dict(combo, **{key: file_rel})
+                        for combo in combos
+                        for file_rel in files
+                        if file_rel not in combo.values()
+                    ]
+                for combo in combos:
+                    agree = sum(key in labels.get(file_rel, ()) for key, file_rel in combo.items())
+                    distance = abs(math.log(size / base_size))
+                    candidates.append(((agree, -distance), combo))
+    return _rank(candidates) or {}
+
+
+def _propose_index_buffer(asset_size, mod_ibs, labels, taken):
+    """에셋 IB와 크기(인덱스 수)가 같은 모드 .ib 제안"""
+    if not any(asset_size % triangle_bytes == 0 for triangle_bytes in IB_TRIANGLE_BYTES):
+        return None
+    candidates = [
+        (IB_KEY in labels.get(file_rel, ()), file_rel)
+        for file_rel in mod_ibs.get(asset_size, [])
+        if file_rel not in taken
+    ]
+    return _rank(candidates)
+
+
+def propose_by_size(components, asset_name, asset_stats, mod_stats, rows=()):
+    """크기가 맞는 슬롯별 제안 -> {(comp_index, key, variant): 모드 파일}
+
+    asset_stats/mod_stats: {상대 경로: (크기, 수정 시각)} (스캔 결과)
+    rows: load_tree_from_mod 결과 (파일별 슬롯 종류를 순위 결정에만 사용)
+    """
+    asset_bufs = _sizes_by_stem(asset_stats, ".buf")
+    asset_ibs = _sizes_by_stem(asset_stats, ".ib")
+    mod_bufs = _files_by_size(mod_stats, ".buf")
+    mod_ibs = _files_by_size(mod_stats, ".ib")
+    labels = {}
+    for comp, _hash, file_rel in rows:
+        labels.setdefault(file_rel, set()).add(comp)
+
+    proposals = {}
+    for comp_index, comp in enumerate(components):
+        name = comp["name"]
+        asset_vb = {
+            key: _asset_size(asset_bufs, asset_name, name, key)
+            for key in comp.get("shared", {})
+            if key in VB_KEYS
+        }
+        for key, file_rel in _propose_vertex_buffers(asset_vb, mod_bufs, labels).items():
+            proposals[(comp_index, key, None)] = file_rel
+
+        taken = set()
+        for label, variant_data in comp.get("variants", {}).items():
+            if IB_KEY not in variant_data:
+                continue
+            size = _asset_size(asset_ibs, asset_name, name, IB_KEY, label)
+            if not size:
+                continue
+            file_rel = _propose_index_buffer(size, mod_ibs, labels, taken)
+            if file_rel:
+                taken.add(file_rel)
+                proposals[(comp_index, IB_KEY, label)] = file_rel
+    return proposals
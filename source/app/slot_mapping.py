@@ -0,0 +1,131 @@
+"""JSON 슬롯 매핑 (화면 없이 generate_ini를 실행할 때 ComponentSlotPanel 대신 사용)
+
+매핑 파일 형식 (값은 모드 폴더 기준 경로, 비우거나 빼면 매칭 안 함):
+{
+  "컴포넌트명": {
+    "shared": {"Blend": "...", "Position": "...", "Texcoord": "..."},
+    "variants": {"파트명": {"IB": "..."}}
+  }
+}
+에셋 폴더에 hash.json이 있으면 컴포넌트/파트 순서를 화면과 같게 hash.json 순서로 맞추고,
+hash.json에 없는 컴포넌트나 파트는 오류로 봅니다. 없으면 매핑 파일의 순서를 따릅니다.
+"""
+
+import json
+import os
+
+from model.slot_table import SlotTable
+
+SHARED_KEYS = ("Blend", "Position", "Texcoord")
+
+
+class _Value:
+    """tk.StringVar처럼 get()으로 값을 읽는 고정 값"""
+
+    def __init__(self, value):
+        self._value = value or ""
+
+    def get(self):
+        return self._value
+
+
+class _Controller:
+    def __init__(self, components):
+        self.matcher = _Matcher(components)
+
+
+class _Matcher:
+    def __init__(self, components):
+        self.components = components
+
+
+def read_hash_components(asset_folder_path):
+    """hash.json의 [(컴포넌트명, [파트명])] (없으면 None)"""
+    path = os.path.join(asset_folder_path, "hash.json")
+    if not os.path.isfile(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return [
+        (entry.get("component_name", "Unnamed"), list(entry.get("object_classifications") or [""]))
+        for entry in data
+    ]
+
+
+def load_slot_mapping(path):
+    with open(path, encoding="utf-8") as f:
+        mapping = json.load(f)
+    if not isinstance(mapping, dict):
+        raise ValueError("슬롯 매핑은 {컴포넌트명: {...}} 형식이어야 합니다.")
+    return mapping
+
+
+class SlotMapping:
+    """generate_ini가 읽는 슬롯 패널 인터페이스 (slot_table, controller.matcher.components)"""
+
+    def __init__(self, mapping, hash_components=None):
+        if hash_components is None:
+            hash_components = [
+                (name, list((entry or {}).get("variants", {})) or [""]) for name, entry in mapping.items()
+            ]
+        self._check(mapping, hash_components)
+
+        components = [
+            {
+                "name": name,
+                "shared": {key: None for key in SHARED_KEYS},
+                "variants": {label: {"IB": None} for label in labels},
+            }
+            for name, labels in hash_components
+        ]
+        self.slot_table = SlotTable.from_components(components)
+        for comp_index, (name, _) in enumerate(hash_components):
+            entry = mapping.get(name) or {}
+            for key, value in (entry.get("shared") or {}).items():
+                self.slot_table.assign(self.slot_table.slot_id(comp_index, key), value)
+            for label, slots in (entry.get("variants") or {}).items():
+                for key, value in (slots or {}).items():
+                    self.slot_table.assign(self.slot_table.slot_id(comp_index, key, label), value)
+        self.controller = _Controller(components)
+
+    @classmethod
+    def from_files(cls, mapping_path, asset_folder_path):
+        return cls(load_slot_mapping(mapping_path), read_hash_components(asset_folder_path))
+
+    @staticmethod
+    def _check(mapping, hash_components):
+        """hash.json에 없는 컴포넌트/파트, 알 수 없는 슬롯 키가 있으면 ValueError"""
+        known = dict(hash_components)
+        errors = []
+        for name, entry in mapping.items():
+            if name not in known:
+                errors.append(f"알 수 없는 컴포넌트: {name}")
+                continue
+            entry = entry or {}
+            for key in entry.get("shared") or {}:
+                if key not in SHARED_KEYS:
+                    errors.append(f"알 수 없는 공통 슬롯: {name}.{key}")
+            for label, slots in (entry.get("variants") or {}).items():
+                if label not in known[name]:
+                    errors.append(f"알 수 없는 파트: {name}.{label}")
+                for key in slots or {}:
+                    if key != "IB":
+                        errors.append(f"알 수 없는 파트 슬롯: {name}.{label}.{key}")
+        if errors:
+            raise ValueError("슬롯 매핑 오류: " + ", ".join(errors))
+
+    def get_component_values(self):
+        """예전 패널 형식 [{shared: {키: 값}, variants: {파트: {키: 값}}}] (값은 get()으로 읽음)"""
+        table = self.slot_table
+        values = [{"shared": {}, "variants": {}} for _ in table.component_names]
+        for slot_id, value in enumerate(table.assigned):
+            comp_index, key, variant = table.slot_key(slot_id)
+            if variant is None:
+                values[comp_index]["shared"][key] = _Value(value)
+            else:
+                values[comp_index]["variants"].setdefault(variant, {})[key] = _Value(value)
+        return values
+
+    def assigned_files(self):
+        """매핑에 적힌 모드 기준 경로 목록"""
+        return [value for value in self.slot_table.assigned if value]
@@ -0,0 +1,278 @@
+"""모드 폴더 스테이징 (1단계)
+
+내보내기는 INI와 매칭한 버퍼만 고치므로 모드 폴더 전체를 복사할 필요가 없습니다.
+- full: 예전처럼 폴더 전체 복사
+- referenced: INI, 매칭한 파일, INI가 참조하는 파일만 복사
+  INI 참조는 'filename = ' 뿐 아니라 값이 모드 안의 파일을 가리키는 모든 'key = 값' 줄
+  (예: CustomShader의 'ps = shader.hlsl')을 INI 위치 기준으로 풀어서 찾습니다.
+  나머지 파일은 규칙 목록 [glob 패턴, 동작]에서 처음 일치한 동작(skip/link/copy)을 따르고,
+  일치하는 규칙이 없으면 건너뜁니다. 패턴에 '/'가 있으면 모드 기준 경로, 없으면 파일 이름과 비교합니다.
+
+파일을 옮길 때는 가능하면 실제 복사 대신 reflink(copy-on-write), 하드링크를 씁니다.
+- 내용을 고치는 INI는 항상 따로 갖는 사본(reflink 또는 복사)
+- 고치지 않는 파일(버퍼, 텍스처)은 hardlinks가 켜져 있거나 규칙이 link일 때 하드링크
+- 하드링크된 파일에 써야 하면 먼저 break_link로 링크를 끊음
+reflink는 Linux의 FICLONE(btrfs, xfs 등)만 지원합니다. Windows(ReFS 블록 복제 포함)와 macOS에서는
+하드링크를 켜지 않으면 모든 파일을 실제로 복사하므로 복사 시간이 줄지 않습니다.
+"""
+
+import fnmatch
+import os
+import shutil
+from dataclasses import dataclass
+
+from app.file_manager import bucket_of, decode_text, path_key, resolve_declared_path, scan_directory
+
+try:
+    import fcntl
+except ImportError:  # 윈도우
+    fcntl = None
+
+STAGING_MODES = ("full", "referenced")
+STAGING_ACTIONS = ("skip", "link", "copy")
+DEFAULT_STAGING_MODE = "full"
+
+# 참조되지 않은 파일 처리 규칙 (처음 일치한 규칙 적용, 일치 없으면 skip)
+DEFAULT_STAGING_RULES = [
+    ["*.txt", "copy"],
+    ["*.md", "copy"],
+    ["preview*", "copy"],
+]
+
+
+@dataclass
+class StagingReport:
+    copied: int = 0
+    copied_bytes: int = 0
+    cloned: int = 0
+    cloned_bytes: int = 0
+    linked: int = 0
+    linked_bytes: int = 0
+    skipped: int = 0
+    skipped_bytes: int = 0
+
+    def add(self, action, size):
+        setattr(self, action, getattr(self, action) + 1)
+        setattr(self, f"{action}_bytes", getattr(self, f"{action}_bytes") + size)
+
+    def summary(self):
+        return (
+            f"복사 {self.copied}개 ({_format_size(self.copied_bytes)}), "
+            f"reflink {self.cloned}개 ({_format_size(self.cloned_bytes)}), "
+            f"링크 {self.linked}개 ({_format_size(self.linked_bytes)}), "
+            f"건너뜀 {self.skipped}개 ({_format_size(self.skipped_bytes)})"
+        )
+
+
+def _format_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+def rule_action(rel_path, rules, default="skip"):
+    """규칙 목록에서 처음 일치한 동작 (모드 기준 경로는 '/' 구분)"""
+    rel_l = rel_path.replace("\\", "/").lower()
+    name_l = rel_l.rsplit("/", 1)[-1]
+    for pattern, action in rules or ():
+        pattern_l = pattern.replace("\\", "/").lower()
+        target = rel_l if "/" in pattern_l else name_l
+        if fnmatch.fnmatchcase(target, pattern_l):
+            return action if action in STAGING_ACTIONS else default
+    return default
+
+
+def _ini_values(text):
+    """'key = 값' 줄의 값 (따옴표 제거)"""
+    for line in text.split("\n"):
+        s = line.strip()
+        if not s or s[0] in ";[" or "=" not in s:
+            continue
+        value = s.split("=", 1)[1].strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        if value:
+            yield value
+
+
+def referenced_files(folder_path, scan, ini_texts=None):
+    """모드 INI들이 값으로 가리키는 파일 -> {상대 경로}
+
+    ini_texts: 이미 읽어 둔 INI 텍스트 {모드 기준 경로: 텍스트} (없는 INI만 읽음)
+    """
+    table = {path_key(rel_path): rel_path for rel_path in scan.files}
+    found = set()
+    for ini_rel in scan.buckets.get("ini", []):
+        text = (ini_texts or {}).get(ini_rel)
+        if text is None:
+            try:
+                with open(os.path.join(folder_path, ini_rel), "rb") as f:
+                    text, _ = decode_text(f.read())
+            except OSError:
+                continue
+        for value in _ini_values(text):
+            key = resolve_declared_path(folder_path, ini_rel, value.replace("\\", "/"))
+            rel_path = table.get(key) if key else None
+            if rel_path:
+                found.add(rel_path)
+    return found
+
+
+def require_folder(folder_path):
+    """원본 폴더가 없으면 FileNotFoundError
+
+    scan_directory는 읽지 못한 폴더를 빈 폴더로 보므로, 그대로 두면 빈 출력이 성공으로 남는다.
+    """
+    if not os.path.isdir(folder_path):
+        raise FileNotFoundError(f"폴더가 없습니다: {folder_path}")
+
+
+def plan_staging(folder_path, required=(), rules=None, scan=None, ini_texts=None):
+    """referenced 모드의 파일별 동작 -> (스캔 결과, {상대 경로: 동작})
+
+    scan/ini_texts: 매처가 이미 가진 스캔 결과와 INI 텍스트 (미리보기용, 생략하면 읽음)
+    """
+    if scan is None:
+        require_folder(folder_path)
+        scan = scan_directory(folder_path)
+    required_keys = {path_key(rel_path) for rel_path in required if rel_path}
+    keep = set(scan.buckets.get("ini", []))
+    keep |= {rel_path for rel_path in scan.files if path_key(rel_path) in required_keys}
+    keep |= referenced_files(folder_path, scan, ini_texts)
+
+    rules = DEFAULT_STAGING_RULES if rules is None else rules
+    actions = {}
+    for rel_path in scan.files:
+        actions[rel_path] = "copy" if rel_path in keep else rule_action(rel_path, rules)
+    return scan, actions
+
+
+_FICLONE = 0x40049409  # linux/fs.h
+# reflink가 안 되는 (원본 장치, 대상 장치) 조합 (다시 시도하지 않음)
+_reflink_unsupported = set()
+
+
+def _reflink(src, dst):
+    """copy-on-write 복제 (Linux에서 btrfs/xfs 등 FICLONE 지원 파일 시스템만) -> 성공 여부"""
+    if fcntl is None:
+        return False
+    try:
+        devices = (os.stat(src).st_dev, os.stat(os.path.dirname(dst) or ".").st_dev)
+    except OSError:
+        return False
+    if devices in _reflink_unsupported:
+        return False
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+    except OSError:
+        _reflink_unsupported.add(devices)
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def clone_file(src, dst):
+    """내용을 따로 갖는 사본 (reflink, 안 되면 복사) -> 'cloned' 또는 'copied'
+
+    나중에 내용을 고칠 파일(INI)에 사용
+    """
+    if _reflink(src, dst):
+        return "cloned"
+    shutil.copy2(src, dst)
+    return "copied"
+
+
+def link_file(src, dst):
+    """reflink, 하드링크, 복사 순으로 시도 -> 'cloned', 'linked' 또는 'copied'
+
+    내용을 고치지 않는 파일에만 사용 (하드링크는 원본과 내용을 공유)
+    """
+    if _reflink(src, dst):
+        return "cloned"
+    try:
+        os.link(src, dst)
+        return "linked"
+    except OSError:
+        shutil.copy2(src, dst)
+        return "copied"
+
+
+def break_link(path):
+    """하드링크된 파일이면 쓰기 전에 독립된 사본으로 바꿈 (원본이 함께 바뀌지 않게)"""
+    try:
+        if os.stat(path).st_nlink <= 1:
+            return False
+    except OSError:
+        return False
+    tmp_path = f"{path}.staging-tmp"
+    shutil.copy2(path, tmp_path)
+    os.replace(tmp_path, path)
+    return True
+
+
+def stage_file(src, dst, action, hardlinks=False):
+    """파일 하나를 동작(copy/link)에 맞게 스테이징 -> 'cloned', 'linked' 또는 'copied'"""
+    if bucket_of(src) == "ini":
+        # INI는 4단계에서 다시 쓰므로 하드링크하지 않음
+        return clone_file(src, dst)
+    if action == "link" or hardlinks:
+        return link_file(src, dst)
+    return clone_file(src, dst)
+
+
+def _stage_files(src_root, dst_root, scan, actions, hardlinks):
+    """스캔 결과의 파일을 동작별로 스테이징 -> StagingReport"""
+    report = StagingReport()
+    os.makedirs(dst_root)
+    for rel_dir in scan.manifest.get("dirs", {}):
+        if rel_dir:
+            os.makedirs(os.path.join(dst_root, rel_dir), exist_ok=True)
+
+    for rel_path in scan.files:
+        size = scan.stats[rel_path][0]
+        action = actions.get(rel_path, "copy")
+        if action == "skip":
+            report.add("skipped", size)
+            continue
+        result = stage_file(
+            os.path.join(src_root, rel_path), os.path.join(dst_root, rel_path), action, hardlinks
+        )
+        report.add(result, size)
+    return report
+
+
+def stage_mod_folder(mod_folder_path, output_mod_path, required=(), mode=DEFAULT_STAGING_MODE, rules=None, hardlinks=False):
+    """모드 폴더를 output_mod_path로 스테이징 (기존 출력 폴더는 지움) -> StagingReport
+
+    required: referenced 모드에서 반드시 복사할 파일 (매칭한 파일, 모드 기준 경로)
+    hardlinks: 고치지 않는 파일을 하드링크로 둘지 (출력 폴더를 곧 지우는 작업 공간일 때).
+      꺼져 있어도 reflink가 되는 파일 시스템이면 reflink를 쓰며, INI는 항상 따로 복사한다.
+    """
+    require_folder(mod_folder_path)
+    if os.path.exists(output_mod_path):
+        shutil.rmtree(output_mod_path)
+
+    if mode == "referenced":
+        scan, actions = plan_staging(mod_folder_path, required, rules)
+    else:
+        scan = scan_directory(mod_folder_path)
+        actions = {}
+    return _stage_files(mod_folder_path, output_mod_path, scan, actions, hardlinks)
+
+
+def stage_tree(src_root, dst_root, hardlinks=False):
+    """작업 공간용 폴더 사본 (가능하면 reflink, 안 되면 복사) -> StagingReport
+
+    hardlinks: 원본과 내용을 공유하는 하드링크로 둘지. 사본을 쓰는 프로그램이 파일을
+      제자리에서 고치면 원본도 바뀌므로, 읽기만 하는 작업 공간에서만 켠다.
+    """
+    require_folder(src_root)
+    scan = scan_directory(src_root)
+    return _stage_files(src_root, dst_root, scan, {}, hardlinks)
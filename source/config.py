@@ -1,16 +1,49 @@
 import json
 import os
 
+from app.staging import DEFAULT_STAGING_MODE
+
 CONFIG_FILE = "config.json"
 
 DEFAULT_CONFIG = {
     "last_asset_folder": os.path.join(os.getcwd(),"assets"),
     "last_mod_folder": os.path.join(os.getcwd(),"mods"),
-    "output_root": os.path.abspath("output")
+    "output_root": os.path.abspath("output"),
+    "cache_folder": os.path.abspath("cache"),
+    # 에셋/모드 폴더 변경 감시 (폴링 간격: 초)
+    "watch_folders": False,
+    "watch_interval": 1.0,
+    # 내보내기 1단계 복사 범위: "full"(폴더 전체) 또는 "referenced"(INI/매칭/참조 파일과 staging_rules에 맞는 파일만,
+    # 참조되지 않은 나머지 파일은 output에 없음)
+    "staging_mode": DEFAULT_STAGING_MODE,
+    # 참조되지 않은 파일 처리 규칙 [glob 패턴, "skip" | "link" | "copy"] (처음 일치한 규칙, 없으면 skip)
+    "staging_rules": [["*.txt", "copy"], ["*.md", "copy"], ["preview*", "copy"]],
+    # 고치지 않는 파일을 output에 하드링크로 둘지 (원본 모드와 내용 공유)
+    # reflink는 Linux(btrfs, xfs 등)에서만 되므로 Windows에서는 꺼져 있으면 모든 파일을 실제로 복사
+    "staging_hardlinks": False,
+    # export_vb 작업 공간(asset/mods)을 하드링크로 만들지. export_vb.py가 입력 파일을 제자리에서 고치면
+    # 원본 에셋/모드가 함께 바뀌므로 위험을 알고 쓸 때만 켬 (꺼져 있으면 reflink, Windows에서는 복사)
+    "export_vb_hardlinks": False,
+    # 지난 output 폴더를 재사용하여 바뀐 파일만 다시 복사/저장 (목록: output/.export_manifests)
+    "incremental_export": False,
+    # 4단계 INI 변환 프로세스 수 (1: 순차, 0: CPU 수). 프로세스를 띄우는 비용이 커서(특히 Windows)
+    # INI가 많은 모드를 자주 내보낼 때만 늘림
+    "ini_workers": 1,
+    # 로그: 화면에 보낼 최소 레벨("detail" | "info" | "warning"), 모든 레벨을 기록할 파일(빈 값이면 없음),
+    # 내보내기 한 단계에서 화면에 보낼 최대 detail/info 줄 수 (log_file이 있을 때만, 경고는 항상 표시)
+    "log_level": "info",
+    "log_file": "",
+    "log_stage_limit": 500,
+    # 로그 영역에 남길 최근 줄 수, 화면 로그를 그대로 옮겨 적을 파일(빈 값이면 없음)과 교체 크기/보관 개수
+    "log_max_lines": 5000,
+    "log_mirror_file": "",
+    "log_mirror_max_bytes": 1048576,
+    "log_mirror_backups": 3,
 }
 
 
-def load_config():
+def load_config(create=True):
+    """설정 읽기 (create가 False면 설정 파일이 없어도 새로 만들지 않음)"""
     if os.path.exists(CONFIG_FILE):
         with open(CONFIG_FILE, "r", encoding="utf-8") as f:
             user_config = json.load(f)
@@ -18,7 +51,8 @@ def load_config():
             user_config.setdefault(k, v)
         return user_config
     else:
-        save_config(DEFAULT_CONFIG)
+        if create:
+            save_config(DEFAULT_CONFIG)
         return DEFAULT_CONFIG
 
 
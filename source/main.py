@@ -1,9 +1,13 @@
-import tkinter as tk
-from ui.layout import MainLayout
-from app.matcher import ComponentMatcherApp
+import multiprocessing
+import sys
 
 
 def main():
+    # 화면 없이 실행할 때는 tkinter를 불러오지 않도록 여기서 import
+    import tkinter as tk
+    from ui.layout import MainLayout
+    from app.matcher import ComponentMatcherApp
+
     root = tk.Tk()
     root.title("엵툵 사전작업 도우미")
     root.geometry("1000x700")
@@ -16,4 +20,14 @@ def main():
 
 
 if __name__ == "__main__":
+    # INI 병렬 변환, 일괄 내보내기의 작업 프로세스가 실행 파일로 묶였을 때도 시작되도록
+    multiprocessing.freeze_support()
+    if "--headless" in sys.argv[1:]:
+        from app.headless import main as headless_main
+
+        sys.exit(headless_main())
+    if "--batch" in sys.argv[1:]:
+        from app.batch_export import main as batch_main
+
+        sys.exit(batch_main())
     main()
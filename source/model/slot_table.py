@@ -0,0 +1,110 @@
+"""슬롯 표 (위젯 없는 슬롯 모델)
+
+슬롯마다 정수 id(0부터, 화면 표시 순서)를 주고 속성을 같은 길이의 리스트로 둡니다.
+- comp_index, variant(공통 슬롯은 None), key, hash, assigned(할당한 모드 기준 경로, 비었으면 "")
+- index: (comp_index, key, variant) -> 슬롯 id
+화면(ComponentSlotPanel)은 subscribe로 값 변경을 받아 표시만 하고,
+내보내기(_collect_matched_pairs)는 위젯 대신 이 표를 바로 읽습니다.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+SlotKey = Tuple[int, str, Optional[str]]
+
+
+class SlotTable:
+    def __init__(self):
+        self.component_names: List[str] = []
+        self.comp_index: List[int] = []
+        self.variant: List[Optional[str]] = []
+        self.key: List[str] = []
+        self.hash: List[Optional[str]] = []
+        self.assigned: List[str] = []
+        self.is_ib: List[bool] = []
+        # 슬롯 이름에서 에셋 이름 뒤에 붙는 부분 (내보내기마다 다시 만들지 않도록 미리 계산)
+        self.name_suffix: List[str] = []
+        self.index: Dict[SlotKey, int] = {}
+        self._observers: List[Callable[[int, str], None]] = []
+
+    @classmethod
+    def from_components(cls, components):
+        """매처 컴포넌트 목록 [{name, shared: {키: 해시}, variants: {파트: {키: 해시}}}]으로 만듦
+
+        슬롯 순서: 컴포넌트마다 공통 슬롯, 그다음 파트별 슬롯 (화면 표시 순서와 같음)
+        """
+        table = cls()
+        for comp_index, comp in enumerate(components):
+            name = comp["name"]
+            table.component_names.append(name)
+            for key, hash_value in (comp.get("shared") or {}).items():
+                table._add(comp_index, None, key, hash_value, f"{name}{key}", False)
+            for label, slots in (comp.get("variants") or {}).items():
+                for key, hash_value in slots.items():
+                    if key.lower() == "ib":
+                        table._add(comp_index, label, key, hash_value, f"{name}{label or ''}", True)
+                    else:
+                        table._add(comp_index, label, key, hash_value, f"{name}{label or ''}{key}", False)
+        return table
+
+    def _add(self, comp_index, variant, key, hash_value, name_suffix, is_ib):
+        self.index[(comp_index, key, variant)] = len(self.key)
+        self.comp_index.append(comp_index)
+        self.variant.append(variant)
+        self.key.append(key)
+        self.hash.append(hash_value)
+        self.assigned.append("")
+        self.is_ib.append(is_ib)
+        self.name_suffix.append(name_suffix)
+
+    def __len__(self):
+        return len(self.key)
+
+    def slot_id(self, comp_index, key, variant=None):
+        """(comp_index, key, variant) -> 슬롯 id (없으면 None)"""
+        return self.index.get((comp_index, key, variant))
+
+    def slot_key(self, slot_id) -> SlotKey:
+        return self.comp_index[slot_id], self.key[slot_id], self.variant[slot_id]
+
+    def value(self, comp_index, key, variant=None):
+        slot_id = self.slot_id(comp_index, key, variant)
+        return "" if slot_id is None else self.assigned[slot_id]
+
+    def values(self):
+        """(comp_index, key, variant) -> 할당한 값"""
+        return {self.slot_key(slot_id): value for slot_id, value in enumerate(self.assigned)}
+
+    def subscribe(self, callback):
+        """값이 바뀔 때마다 callback(슬롯 id, 새 값) 호출"""
+        self._observers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._observers:
+            self._observers.remove(callback)
+
+    def assign(self, slot_id, value):
+        """슬롯에 값 할당 (비우려면 "") -> 바뀌었는지"""
+        value = value or ""
+        if self.assigned[slot_id] == value:
+            return False
+        self.assigned[slot_id] = value
+        for callback in list(self._observers):
+            callback(slot_id, value)
+        return True
+
+    def assign_many(self, assignments):
+        """[(슬롯 id, 값)] 할당 -> 바뀐 슬롯 수"""
+        return sum(1 for slot_id, value in assignments if self.assign(slot_id, value))
+
+    def matched_pairs(self, asset_name):
+        """할당된 슬롯 -> ([(슬롯 이름, 할당한 파일)], IB 슬롯 이름 집합) (슬롯 id 순서)"""
+        pairs = []
+        ib_slots = set()
+        for slot_id, value in enumerate(self.assigned):
+            if not value:
+                continue
+            slot_name = asset_name + self.name_suffix[slot_id]
+            if self.is_ib[slot_id]:
+                ib_slots.add(slot_name)
+            pairs.append((slot_name, value))
+        return pairs, ib_slots
@@ -1,12 +1,22 @@
 import tkinter as tk
 
+from model.slot_table import SlotTable
+
 
 class ComponentSlotPanel(tk.Frame):
+    """슬롯 표(slot_table)를 표시하는 패널
+
+    슬롯 값은 slot_table이 갖고, 패널은 값이 바뀔 때 알림을 받아 표시만 갱신한다.
+    slot_rows[슬롯 id] = (key_label, hash_label, file_label), slot_vars[슬롯 id] = 표시용 StringVar
+    """
+
     def __init__(self, master, controller):
         super().__init__(master)
         self.controller = controller
         self._tooltip = None
-        self.slot_labels = []
+        self.slot_table = SlotTable()
+        self.slot_rows = []
+        self.slot_vars = []
         self.component_widgets = []
         self.selected_index = None
         self.selected_key = None
@@ -39,6 +49,11 @@ class ComponentSlotPanel(tk.Frame):
     def display_components(self, components, mod_files):
         self.components = components
         self._clear()
+        self.slot_table.unsubscribe(self._on_slot_changed)
+        self.slot_table = SlotTable.from_components(components)
+        self.slot_rows = [None] * len(self.slot_table)
+        self.slot_vars = [None] * len(self.slot_table)
+        self.slot_table.subscribe(self._on_slot_changed)
 
         for comp_index, comp in enumerate(components):
             group_frame = self._create_component_group(comp_index, comp)
@@ -48,7 +63,11 @@ class ComponentSlotPanel(tk.Frame):
         for widget in self.inner_frame.winfo_children():
             widget.destroy()
         self.component_widgets.clear()
-        self.slot_labels.clear()
+        self.slot_rows = []
+        self.slot_vars = []
+        self.selected_index = None
+        self.selected_key = None
+        self.selected_variant = None
 
     def _create_component_group(self, comp_index, comp):
         group_frame = tk.Frame(self.inner_frame)
@@ -197,9 +216,9 @@ class ComponentSlotPanel(tk.Frame):
         row.columnconfigure(2, weight=1)
         row.columnconfigure(3, weight=0)
 
-        self.slot_labels.append(
-            (comp_index, key, variant, key_label, hash_label, file_label)
-        )
+        slot_id = self.slot_table.slot_id(comp_index, key, variant)
+        self.slot_rows[slot_id] = (key_label, hash_label, file_label)
+        self.slot_vars[slot_id] = val
         return val
 
     # ---- tooltip helpers ----
@@ -255,23 +274,25 @@ class ComponentSlotPanel(tk.Frame):
         self.controller.set_selected_slot(comp_index, key, variant)
 
     def set_slot_highlight(self, index, key, selected, variant=None):
-        for i, k, v, key_lbl, hash_lbl, file_lbl in self.slot_labels:
-            if i == index and k == key and v == variant:
-                color = "#add8e6" if selected else "#f0f0f0"
-                key_lbl.configure(bg=color)
-                hash_lbl.configure(bg=color)
-                file_lbl.configure(bg=color)
-                break
+        slot_id = self.slot_table.slot_id(index, key, variant)
+        if slot_id is None or self.slot_rows[slot_id] is None:
+            return
+        color = "#add8e6" if selected else "#f0f0f0"
+        for label in self.slot_rows[slot_id]:
+            label.configure(bg=color)
 
-    def set_slot_value(self, index, key, value, variant=None):
-        widget = None
-        if variant:
-            widget = self.component_widgets[index]["variants"][variant][key]
-        else:
-            widget = self.component_widgets[index]["shared"][key]
+    def _on_slot_changed(self, slot_id, value):
+        """슬롯 표의 값이 바뀌면 표시만 갱신"""
+        var = self.slot_vars[slot_id] if slot_id < len(self.slot_vars) else None
+        if var is not None:
+            var.set(value)
 
-        widget.set(value)
-        label = variant if variant else "공통"
+    def set_slot_value(self, index, key, value, variant=None):
+        slot_id = self.slot_table.slot_id(index, key, variant)
+        if slot_id is None:
+            raise KeyError(f"슬롯 없음: {index}, {key}, {variant}")
+        self.slot_table.assign(slot_id, value)
+        label = variant if variant is not None else "공통"
         comp_name = self.controller.matcher.components[index]["name"]
         if value:
             self.controller.log(f"[할당] {comp_name} ({label}) - {key} ← {value}")
@@ -280,6 +301,16 @@ class ComponentSlotPanel(tk.Frame):
                 f"[비움] {comp_name} ({label}) - {key} 슬롯이 비워졌습니다."
             )
 
+    def set_slot_values(self, assignments):
+        """여러 슬롯을 한 번에 채움 (슬롯마다 로그를 남기지 않음)
+
+        assignments: [(index, key, value, variant)]
+        """
+        self.slot_table.assign_many(
+            (self.slot_table.slot_id(index, key, variant), value)
+            for index, key, value, variant in assignments
+        )
+
     def get_component_values(self):
         return self.component_widgets
 
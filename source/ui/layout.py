@@ -4,18 +4,26 @@ import platform
 import tkinter as tk
 from tkinter import filedialog
 import threading
+import queue
 
 from ui.path_selector import PathSelectorFrame
 from ui.component_slot_panel import ComponentSlotPanel
 from ui.mod_file_panel import ModFileListPanel
 from ui.logger_frame import LoggerFrame
+from ui.preview_window import PreviewWindow
 
 from app import ini_modifier
 from app.auto_fill import auto_fill_components
 from app.export_to_export_vb import run_export_vb
+from app.pipeline_log import PipelineLogger
+from app.staging import DEFAULT_STAGING_MODE
 from config import load_config, save_config
 
 
+# 작업 스레드에서 넘긴 호출을 UI 스레드에서 처리하는 주기(ms)
+UI_QUEUE_POLL_MS = 30
+
+
 class MainLayout:
 
     def __init__(self, root: tk.Misc) -> None:
@@ -24,6 +32,9 @@ class MainLayout:
         self.selected_slot = None
         self.selected_file = None
 
+        # 작업 스레드 -> UI 스레드 호출 전달용 큐
+        self._ui_queue = queue.Queue()
+
         # 설정 초기화
         self.config = load_config()
         asset_folder = self.config.get("last_asset_folder")
@@ -67,8 +78,7 @@ class MainLayout:
         self.auto_fill_btn = tk.Button(
             self.slot_controls, text="자동 채우기", command=self.on_auto_fill
         )
-        # 자동 채우기 버튼 숨김
-        # self.auto_fill_btn.pack(side="left", expand=True, fill="x", padx=5)
+        self.auto_fill_btn.pack(side="left", expand=True, fill="x", padx=5)
 
         # 컴포넌트 슬롯 패널
         self.slot_panel = ComponentSlotPanel(self.left_column, self)
@@ -99,15 +109,47 @@ class MainLayout:
         self.export_button = tk.Button(self.export_frame, text="내보내기", command=self.export)
         self.export_button.pack(side="left", pady=5, padx=(10, 5), fill="x", expand=True)
 
+        # 미리보기 (디스크를 건드리지 않고 내보내기 결과만 계산)
+        self.preview_button = tk.Button(self.export_frame, text="미리보기", command=self.preview_export)
+        self.preview_button.pack(side="left", pady=5, padx=(0, 5))
+
         # 작게 오른쪽에 배치할 '엵툵' 버튼
         self.connect_button = tk.Button(self.export_frame, text="엵툵", width=6, command=self.connect_export_vb)
         self.connect_button.pack(side="right", pady=5, padx=(5, 10))
 
+        # 폴더 감시 (에셋/모드 폴더 변경 시 자동 갱신)
+        self.watch_var = tk.BooleanVar(value=bool(self.config.get("watch_folders")))
+        self.watch_check = tk.Checkbutton(
+            self.export_frame, text="폴더 감시", variable=self.watch_var,
+            command=self.on_watch_toggled,
+        )
+        self.watch_check.pack(side="right", pady=5)
+
         self.export_frame.pack(side="top", fill="x")
 
+        # 불러오기 진행 상황 표시
+        self.status_var = tk.StringVar(value="")
+        self.status_label = tk.Label(
+            self.bottom_frame, textvariable=self.status_var, anchor="w", fg="#555"
+        )
+        self.status_label.pack(side="top", fill="x", padx=10)
+
         # 로그 영역
-        self.logger = LoggerFrame(self.bottom_frame)
+        self.logger = LoggerFrame(
+            self.bottom_frame,
+            max_lines=self.config.get("log_max_lines", 5000),
+            mirror_file=self.config.get("log_mirror_file"),
+            mirror_max_bytes=self.config.get("log_mirror_max_bytes", 1024 * 1024),
+            mirror_backups=self.config.get("log_mirror_backups", 3),
+        )
         self.logger.pack(fill="both", expand=True)
+        # 내보내기, 엵툵 실행, 매처가 함께 쓰는 단계별 로거 (상세 로그는 log_file에만)
+        self.pipeline_log = PipelineLogger(
+            self.logger,
+            level=self.config.get("log_level", "info"),
+            log_file=self.config.get("log_file"),
+            stage_limit=self.config.get("log_stage_limit", 500),
+        )
 
         # 상단 하단 프레임 크기 조절 패인
         self.vertical_pane.add(self.content_frame, stretch="always", minsize=220)
@@ -126,6 +168,9 @@ class MainLayout:
             self.path_selector_mod.update_mod_options()
         self.path_selector = self
 
+        # 작업 스레드에서 넘어온 호출 처리 시작
+        self.root.after(UI_QUEUE_POLL_MS, self._drain_ui_queue)
+
         # 시작 시 config에 저장된 export_vb 경로로 자동 연결 시도
         try:
             evb_path = self.config.get("export_vb_path")
@@ -160,6 +205,20 @@ class MainLayout:
             matcher_method="select_mod_folder_from_path",
         )
 
+        if self.watch_var.get():
+            self.matcher.set_watching(True)
+
+    def on_watch_toggled(self):
+        enabled = bool(self.watch_var.get())
+        self.config["watch_folders"] = enabled
+        try:
+            save_config({"watch_folders": enabled})
+        except Exception as e:
+            self.log(f"설정 저장 실패: {e}")
+        if self.matcher:
+            self.matcher.set_watching(enabled)
+        self.log("폴더 감시 시작" if enabled else "폴더 감시 중지")
+
     def _apply_initial_selection(
         self,
         kind: str,
@@ -197,6 +256,28 @@ class MainLayout:
             except Exception:
                 pass
 
+    def call_in_ui(self, fn, *args):
+        """어느 스레드에서든 호출 가능: fn(*args)를 UI 스레드에서 실행하도록 예약"""
+        self._ui_queue.put((fn, args))
+
+    def _drain_ui_queue(self):
+        try:
+            while True:
+                fn, args = self._ui_queue.get_nowait()
+                try:
+                    fn(*args)
+                except Exception as e:
+                    self.log(f"[오류] UI 갱신 실패: {e}")
+        except queue.Empty:
+            pass
+        self.root.after(UI_QUEUE_POLL_MS, self._drain_ui_queue)
+
+    def set_status(self, text):
+        try:
+            self.status_var.set(text)
+        except Exception:
+            pass
+
     def set_selected_slot(self, index, key, variant=None):
         self.selected_slot = (index, key, variant)
 
@@ -337,7 +418,19 @@ class MainLayout:
             output_root_cfg = self.config.get("output_root", "output")
             # run_export_vb 내부에서 generate_ini를 호출하므로 단순 위임
             try:
-                run_export_vb(export_root, asset_src, mod_src, slot_panel=self.slot_panel, output_root_cfg=output_root_cfg, log_callback=self.log)
+                run_export_vb(
+                    export_root,
+                    asset_src,
+                    mod_src,
+                    slot_panel=self.slot_panel,
+                    output_root_cfg=output_root_cfg,
+                    log_callback=self.log,
+                    logger=self.pipeline_log,
+                    ini_workers=self.config.get("ini_workers", 1),
+                    staging_mode=self.config.get("staging_mode", DEFAULT_STAGING_MODE),
+                    staging_rules=self.config.get("staging_rules"),
+                    hardlinks=self.config.get("export_vb_hardlinks", False),
+                )
             except Exception as e:
                 self.log(f"엵툵 복사/실행 중 오류: {e}")
 
@@ -349,13 +442,10 @@ class MainLayout:
         self.file_panel.set_file_list(mod_files)
 
     def log(self, msg):
-        try:
-            self.logger.log(msg)
-        except Exception:
-            try:
-                print(msg)
-            except Exception:
-                pass
+        self.pipeline_log.log(msg)
+
+    def detail(self, msg):
+        self.pipeline_log.detail(msg)
 
     def on_asset_folder_selected(self, folder):
         if folder:
@@ -383,6 +473,37 @@ class MainLayout:
         if subfolder and self.matcher:
             self.matcher.select_mod_folder_from_path(subfolder)
 
+    def preview_export(self):
+        """내보내기 미리보기: generate_ini(dry_run=True) 결과 요약은 로그로, 전체 내용은 미리보기 창으로 표시"""
+        import traceback
+
+        try:
+            plan = ini_modifier.generate_ini(
+                self.asset_path_var.get(),
+                self.mod_path_var.get(),
+                self.slot_panel,
+                self.config.get("output_root", "output"),
+                self.pipeline_log,
+                staging_mode=self.config.get("staging_mode", DEFAULT_STAGING_MODE),
+                staging_rules=self.config.get("staging_rules"),
+                dry_run=True,
+                ini_workers=self.config.get("ini_workers", 1),
+            )
+        except Exception as e:
+            last = traceback.extract_tb(e.__traceback__)[-1]
+            self.log(f"미리보기 실패: {e}\n  File: {last.filename}, line {last.lineno}, in {last.name}")
+            return
+
+        self.log(f"[미리보기] 복사: {plan['staging_report'].summary()}")
+        for ini_name in plan["diffs"]:
+            self.log(f"  {ini_name}: 삭제 섹션 {len(plan['dropped_sections'].get(ini_name, []))}개")
+        self.log(f"  이름 변경 {len(plan['renames'])}개와 INI 변경 내용은 미리보기 창에 표시합니다.")
+        PreviewWindow(
+            self.root,
+            f"내보내기 미리보기 - {os.path.basename(plan['output_mod_path'])}",
+            ini_modifier.preview_lines(plan),
+        )
+
     def export(self):
         import traceback
 
@@ -391,7 +512,16 @@ class MainLayout:
             mod_path = self.mod_path_var.get()
             output_root = self.config.get("output_root", "output")
             output_path = ini_modifier.generate_ini(
-                asset_path, mod_path, self.slot_panel, output_root, self.logger
+                asset_path,
+                mod_path,
+                self.slot_panel,
+                output_root,
+                self.pipeline_log,
+                staging_mode=self.config.get("staging_mode", DEFAULT_STAGING_MODE),
+                staging_rules=self.config.get("staging_rules"),
+                staging_hardlinks=self.config.get("staging_hardlinks", False),
+                incremental=self.config.get("incremental_export", False),
+                ini_workers=self.config.get("ini_workers", 1),
             )
             self.log("내보내기 완료")
             try:
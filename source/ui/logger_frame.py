@@ -1,18 +1,116 @@
+import logging
+import logging.handlers
+import os
+import queue
 import tkinter as tk
+from collections import deque
 from datetime import datetime
 
+# 큐에 쌓인 로그를 Text 위젯으로 옮기는 주기(ms)와 한 번에 옮길 최대 메시지 수
+LOG_FLUSH_MS = 100
+LOG_BATCH_SIZE = 2000
+# 화면(Text 위젯)에 남길 최근 줄 수
+DEFAULT_MAX_LINES = 5000
+DEFAULT_MIRROR_MAX_BYTES = 1024 * 1024
+DEFAULT_MIRROR_BACKUPS = 3
+
+
+def _open_mirror(path, max_bytes, backups):
+    """로그를 그대로 옮겨 적을 크기 제한 파일 로거 (열 수 없으면 None)"""
+    try:
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8"
+        )
+    except OSError:
+        return None
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    mirror = logging.getLogger(f"{__name__}.{id(handler)}")
+    mirror.propagate = False
+    mirror.setLevel(logging.INFO)
+    mirror.addHandler(handler)
+    return mirror
+
 
 class LoggerFrame(tk.Frame):
-    def __init__(self, master):
+    """로그 영역
+
+    log()는 어느 스레드에서든 호출할 수 있고 메시지를 큐에 넣기만 한다.
+    UI 스레드가 after 타이머로 큐를 비워 한 번의 insert로 붙이며, 최근 max_lines줄만 남긴다.
+    lines: 최근 max_lines줄 (링 버퍼)
+    mirror_file: 주면 모든 줄을 크기 제한 로그 파일에도 기록 (mirror_max_bytes마다 교체, mirror_backups개 보관)
+    """
+
+    def __init__(
+        self,
+        master,
+        max_lines=DEFAULT_MAX_LINES,
+        mirror_file=None,
+        mirror_max_bytes=DEFAULT_MIRROR_MAX_BYTES,
+        mirror_backups=DEFAULT_MIRROR_BACKUPS,
+    ):
         super().__init__(master)
 
         self.text = tk.Text(self, height=10, state="disabled", wrap="none")
         self.text.pack(fill="both", expand=True, padx=10, pady=5)
 
+        self.max_lines = max(1, int(max_lines))
+        self.lines = deque(maxlen=self.max_lines)
+        self._line_count = 0  # Text 위젯에 있는 줄 수
+        self._queue = queue.SimpleQueue()
+        self._mirror = _open_mirror(mirror_file, mirror_max_bytes, mirror_backups) if mirror_file else None
+        self._after_id = self.after(LOG_FLUSH_MS, self._flush)
+
     def log(self, msg):
         timestamp = datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
         full_msg = f"{timestamp} {msg}"
+        self._queue.put(full_msg)
+        if self._mirror is not None:
+            self._mirror.info(full_msg)
+
+    def _flush(self):
+        batch = []
+        try:
+            while len(batch) < LOG_BATCH_SIZE:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        if batch:
+            self._append(batch)
+        self._after_id = self.after(LOG_FLUSH_MS, self._flush)
+
+    def _append(self, batch):
+        lines = []
+        for full_msg in batch:
+            lines.extend(full_msg.split("\n"))
+        self.lines.extend(lines)
+
         self.text.config(state="normal")
-        self.text.insert("end", full_msg + "\n")
+        if len(lines) >= self.max_lines:
+            # 이번 묶음만으로 넘치면 화면을 비우고 마지막 max_lines줄만 표시
+            self.text.delete("1.0", "end")
+            lines = lines[-self.max_lines:]
+            self._line_count = 0
+        self.text.insert("end", "\n".join(lines) + "\n")
+        self._line_count += len(lines)
+        excess = self._line_count - self.max_lines
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self._line_count -= excess
         self.text.see("end")
         self.text.config(state="disabled")
+
+    def destroy(self):
+        if self._after_id is not None:
+            try:
+                self.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+        if self._mirror is not None:
+            for handler in list(self._mirror.handlers):
+                handler.close()
+                self._mirror.removeHandler(handler)
+            self._mirror = None
+        super().destroy()
@@ -131,15 +131,15 @@ class ModFileListPanel(tk.Frame):
         self._sort_column = None
         self._sort_reverse = False
 
-    def set_file_list(self, file_list):
+    def set_file_list(self, file_list, rows=None):
+        """파일 목록 갱신. rows(컴포넌트, 해시, 파일명)를 미리 계산해 넘기면 그대로 사용"""
         # None이 들어올 수 있으므로 안전하게 빈 리스트로 대체
         if file_list is None:
             file_list = []
         self.full_file_list = sorted(set(file_list))
 
-        rows = None
         matcher = getattr(self.controller, "matcher", None)
-        if matcher and hasattr(matcher, "load_tree_from_mod"):
+        if rows is None and matcher and hasattr(matcher, "load_tree_from_mod"):
             try:
                 rows = matcher.load_tree_from_mod(self.full_file_list)
             except Exception:
@@ -150,6 +150,43 @@ class ModFileListPanel(tk.Frame):
         # 기본으로는 현재 정렬 상태를 유지하며 목록 갱신
         self.update_filtered_list()
 
+    def update_file_list(self, file_list, rows):
+        """폴더 감시로 받은 변경 반영: 바뀐 것이 없으면 다시 그리지 않고,
+        다시 그릴 때는 선택한 파일과 스크롤 위치를 유지"""
+        file_list = sorted(set(file_list or []))
+        rows = list(rows or [])
+        if file_list == self.full_file_list and rows == self._rows:
+            return
+
+        selected = None
+        try:
+            sel = self.filename_list.curselection()
+            if sel:
+                selected = self._displayed_rows[sel[0]][2]
+        except Exception:
+            selected = None
+        try:
+            top = self.tree.yview()[0]
+        except Exception:
+            top = None
+
+        self.full_file_list = file_list
+        self._rows = rows
+        self.update_filtered_list()
+
+        if top is not None:
+            self._vsb_cmd("moveto", top)
+        if selected is None:
+            return
+        for idx, (comp, hsh, fname) in enumerate(self._displayed_rows):
+            if fname == selected:
+                try:
+                    self.tree.selection_set(str(idx))
+                    self.filename_list.selection_set(idx)
+                except Exception:
+                    pass
+                break
+
     def update_filtered_list(self, *args):
         keyword = self.filter_var.get().lower()
         for i in self.tree.get_children():
@@ -0,0 +1,35 @@
+import tkinter as tk
+
+
+class PreviewWindow(tk.Toplevel):
+    """내보내기 미리보기 창
+
+    generate_ini(dry_run=True) 결과 전체(이름 변경, INI 변경 내용)를 로그 영역과 따로 보여 주므로
+    로그의 단계당 줄 수 제한이나 최근 줄 수 제한에 잘리지 않는다.
+    """
+
+    def __init__(self, master, title, lines):
+        super().__init__(master)
+        self.title(title)
+        self.geometry("900x600")
+
+        frame = tk.Frame(self)
+        frame.pack(fill="both", expand=True)
+        y_scroll = tk.Scrollbar(frame, orient="vertical")
+        x_scroll = tk.Scrollbar(frame, orient="horizontal")
+        self.text = tk.Text(
+            frame,
+            wrap="none",
+            yscrollcommand=y_scroll.set,
+            xscrollcommand=x_scroll.set,
+        )
+        y_scroll.configure(command=self.text.yview)
+        x_scroll.configure(command=self.text.xview)
+        y_scroll.pack(side="right", fill="y")
+        x_scroll.pack(side="bottom", fill="x")
+        self.text.pack(side="left", fill="both", expand=True)
+
+        self.text.insert("end", "\n".join(lines))
+        self.text.configure(state="disabled")
+
+        tk.Button(self, text="닫기", command=self.destroy).pack(side="bottom", pady=5)